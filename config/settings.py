@@ -59,6 +59,7 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'src.infrastructure.observability.middleware.QueryCountMiddleware',
 ]
 
 ROOT_URLCONF = 'config.urls'
@@ -170,6 +171,104 @@ CORS_ALLOW_CREDENTIALS = True
 ML_MODEL_PATH = os.getenv('ML_MODEL_PATH', 'ml_models/animal_classifier.h5')
 ML_CONFIDENCE_THRESHOLD = float(os.getenv('ML_CONFIDENCE_THRESHOLD', 0.7))
 
+# Inference concurrency (per worker process)
+# 0 = derive from available cores // threads per inference
+INFERENCE_THREADS_PER_CALL = int(os.getenv('INFERENCE_THREADS_PER_CALL', 2))
+INFERENCE_MAX_CONCURRENCY = int(os.getenv('INFERENCE_MAX_CONCURRENCY', 0))
+INFERENCE_QUEUE_TIMEOUT = float(os.getenv('INFERENCE_QUEUE_TIMEOUT', 2.0))
+INFERENCE_RETRY_AFTER = int(os.getenv('INFERENCE_RETRY_AFTER', 1))
+
+# Real-time frames older than this are dropped before decode/inference
+FRAME_DEADLINE_MS = int(os.getenv('FRAME_DEADLINE_MS', 500))
+
+# Temporal voting: a discovery needs MIN_VOTES of the last WINDOW frames to agree
+RECOGNITION_VOTE_WINDOW = int(os.getenv('RECOGNITION_VOTE_WINDOW', 5))
+RECOGNITION_VOTE_MIN_VOTES = int(os.getenv('RECOGNITION_VOTE_MIN_VOTES', 3))
+
+# Write-behind discovery persistence (bulk insert every N discoveries or T seconds)
+DISCOVERY_WRITE_BEHIND = os.getenv('DISCOVERY_WRITE_BEHIND', 'True').lower() == 'true'
+DISCOVERY_FLUSH_BATCH_SIZE = int(os.getenv('DISCOVERY_FLUSH_BATCH_SIZE', 50))
+DISCOVERY_FLUSH_INTERVAL = float(os.getenv('DISCOVERY_FLUSH_INTERVAL', 1.0))
+
+# In-process animal catalog cache. Model signals only invalidate the copy of the
+# process that made the change: with more than one worker process (several
+# Daphne/gunicorn workers, on one node or many) enable CATALOG_CACHE_PUBSUB so
+# they invalidate each other over Redis. Without it the TTL is the only way
+# other workers notice a change, so it defaults to a few seconds
+CATALOG_CACHE_ENABLED = os.getenv('CATALOG_CACHE_ENABLED', 'True').lower() == 'true'
+CATALOG_CACHE_PUBSUB = os.getenv('CATALOG_CACHE_PUBSUB', 'False').lower() == 'true'
+CATALOG_CACHE_TTL = float(os.getenv('CATALOG_CACHE_TTL', 300 if CATALOG_CACHE_PUBSUB else 10))
+CATALOG_CACHE_REDIS_URL = os.getenv('CATALOG_CACHE_REDIS_URL', os.getenv('REDIS_URL', 'redis://localhost:6379/0'))
+
+# Animal search: 'auto' uses PostgreSQL full-text + trigram when migration 0009
+# could install it (unaccent, pg_trgm), otherwise the portable icontains search
+ANIMAL_SEARCH_BACKEND = os.getenv('ANIMAL_SEARCH_BACKEND', 'auto')
+ANIMAL_SEARCH_SIMILARITY = float(os.getenv('ANIMAL_SEARCH_SIMILARITY', 0.3))
+ANIMAL_SEARCH_MAX_RESULTS = int(os.getenv('ANIMAL_SEARCH_MAX_RESULTS', 50))
+
+# Listing endpoints (animals, discoveries): keyset pages of API_PAGE_SIZE items
+# by default, ?limit up to API_MAX_PAGE_SIZE, ?cursor from the previous 'next'
+API_PAGE_SIZE = int(os.getenv('API_PAGE_SIZE', 50))
+API_MAX_PAGE_SIZE = int(os.getenv('API_MAX_PAGE_SIZE', 200))
+
+# Discovery thumbnails are cropped, encoded and uploaded by a background pool
+THUMBNAIL_BACKGROUND = os.getenv('THUMBNAIL_BACKGROUND', 'True').lower() == 'true'
+THUMBNAIL_WORKERS = int(os.getenv('THUMBNAIL_WORKERS', 2))
+THUMBNAIL_MAX_PENDING = int(os.getenv('THUMBNAIL_MAX_PENDING', 64))
+
+# Per-stage frame latencies are always aggregated per worker (get_stats);
+# with this flag they are also attached to every detections message
+PIPELINE_DEBUG_TIMINGS = os.getenv('PIPELINE_DEBUG_TIMINGS', 'False').lower() == 'true'
+
+# Prometheus metrics (/metrics). With several worker processes set
+# PROMETHEUS_MULTIPROC_DIR to an empty directory shared by all of them
+METRICS_ENABLED = os.getenv('METRICS_ENABLED', 'True').lower() == 'true'
+METRICS_FLUSH_INTERVAL = float(os.getenv('METRICS_FLUSH_INTERVAL', 1.0))
+
+# OpenTelemetry tracing (optional opentelemetry-sdk). Exporter: otlp | console | file | memory
+# The sample ratio applies per frame/request; child spans follow the root decision
+TRACING_ENABLED = os.getenv('TRACING_ENABLED', 'False').lower() == 'true'
+TRACING_SAMPLE_RATIO = float(os.getenv('TRACING_SAMPLE_RATIO', 0.01))
+TRACING_EXPORTER = os.getenv('TRACING_EXPORTER', 'otlp')
+TRACING_FILE = os.getenv('TRACING_FILE', 'traces.jsonl')
+TRACING_SERVICE_NAME = os.getenv('TRACING_SERVICE_NAME', 'pokedex')
+
+# Delta detection messages (?detections=delta): pixels a box must move to be
+# resent, and a full keyframe every N messages
+WS_DETECTION_MOVE_TOLERANCE = int(os.getenv('WS_DETECTION_MOVE_TOLERANCE', 8))
+WS_DETECTION_KEYFRAME_INTERVAL = int(os.getenv('WS_DETECTION_KEYFRAME_INTERVAL', 30))
+
+# Inference latency above this target pushes sessions into degraded levels
+INFERENCE_TARGET_LATENCY_MS = float(os.getenv('INFERENCE_TARGET_LATENCY_MS', 250))
+
+# 'local' runs the model in this process; 'remote' uses the standalone
+# inference server (python -m src.infrastructure.ml.inference_server)
+INFERENCE_BACKEND = os.getenv('INFERENCE_BACKEND', 'local')
+INFERENCE_SERVER_ADDRESS = os.getenv('INFERENCE_SERVER_ADDRESS', 'unix:///tmp/pokedex-inference.sock')
+INFERENCE_SERVER_POOL_SIZE = int(os.getenv('INFERENCE_SERVER_POOL_SIZE', 4))
+INFERENCE_SERVER_TIMEOUT = float(os.getenv('INFERENCE_SERVER_TIMEOUT', 5.0))
+# Uploads always travel encoded; arrays already decoded in the web worker
+# (video frames) are re-encoded as JPEG unless this sends the raw pixels
+INFERENCE_SERVER_SEND_DECODED = os.getenv('INFERENCE_SERVER_SEND_DECODED', 'False').lower() == 'true'
+
+# Large JPEGs are decoded at 1/2, 1/4 or 1/8 scale down to this size (0 = full resolution)
+INFERENCE_DECODE_TARGET_SIZE = int(os.getenv('INFERENCE_DECODE_TARGET_SIZE', 640))
+
+# Pooled letterbox/tensor buffers for inference (free buffers kept per shape)
+INFERENCE_BUFFER_POOL = os.getenv('INFERENCE_BUFFER_POOL', 'True').lower() == 'true'
+INFERENCE_BUFFER_POOL_SIZE = int(os.getenv('INFERENCE_BUFFER_POOL_SIZE', 4))
+
+# Upload recognition limits
+RECOGNIZE_MAX_IMAGE_BYTES = int(os.getenv('RECOGNIZE_MAX_IMAGE_BYTES', 10 * 1024 * 1024))
+RECOGNIZE_BATCH_MAX_IMAGES = int(os.getenv('RECOGNIZE_BATCH_MAX_IMAGES', 100))
+RECOGNIZE_BATCH_SIZE = int(os.getenv('RECOGNIZE_BATCH_SIZE', 8))
+# Django's global cap on files per request (all endpoints); the batch parser
+# enforces RECOGNIZE_BATCH_MAX_IMAGES itself, which cannot exceed this one
+DATA_UPLOAD_MAX_NUMBER_FILES = int(os.getenv('DATA_UPLOAD_MAX_NUMBER_FILES', 100))
+RECOGNIZE_VIDEO_MAX_BYTES = int(os.getenv('RECOGNIZE_VIDEO_MAX_BYTES', 200 * 1024 * 1024))
+# Frames analysed per video; longer videos are reported as truncated
+RECOGNIZE_VIDEO_MAX_FRAMES = int(os.getenv('RECOGNIZE_VIDEO_MAX_FRAMES', 600))
+
 # Cache Configuration
 CACHES = {
     'default': {
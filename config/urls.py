@@ -5,7 +5,7 @@ from django.contrib import admin
 from django.urls import path, include
 from django.conf import settings
 from django.conf.urls.static import static
-from src.interfaces.api.views import StartDetectionView
+from src.interfaces.api.views import MetricsView, StartDetectionView
 
 urlpatterns = [
     # Admin
@@ -14,6 +14,9 @@ urlpatterns = [
     # Detection (root level for simplicity)
     path('start-detection/', StartDetectionView.as_view(), name='start-detection-root'),
     
+    # Prometheus metrics
+    path('metrics', MetricsView.as_view(), name='metrics'),
+    
     # API endpoints (Interface Layer)
     path('api/', include('src.interfaces.api.urls')),
     
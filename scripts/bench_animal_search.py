@@ -0,0 +1,125 @@
+"""
+Benchmark - Animal Search
+Run with: python scripts/bench_animal_search.py [--species 50000] [--repeat 20]
+
+Inserta un catálogo sintético en la base de datos configurada (dentro de
+una transacción que se deshace al terminar, salvo --keep) y compara la
+búsqueda ORM (icontains) con la de PostgreSQL (texto completo + trigram)
+cuando la migración 0009 está aplicada. Con SQLite solo mide el ORM.
+"""
+import os
+import sys
+import time
+import random
+import argparse
+import uuid
+
+import django
+
+# Setup Django
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+django.setup()
+
+from django.db import connection, transaction
+
+from src.domain.services import fold_label
+from src.infrastructure.persistence.models import AnimalAliasModel, AnimalModel
+from src.infrastructure.persistence.search import OrmAnimalSearch, PostgresAnimalSearch
+
+_SYLLABLES = ['ba', 'ca', 'da', 'é', 'fo', 'gu', 'lá', 'mi', 'no', 'pé', 'ri', 'sú', 'ta', 'vo', 'zi']
+_WORDS = [
+    'sabana', 'selva', 'nocturno', 'carnívoro', 'migratorio', 'plumaje', 'escamas',
+    'manada', 'costa', 'montaña', 'desierto', 'arrecife', 'colmillos', 'veloz',
+]
+
+QUERIES = {
+    'exact name': 'Elefante',
+    'typo in name': 'elefnte',
+    'accentless': 'leon',
+    'description word': 'nocturno',
+    'two words': 'selva veloz',
+    'no match': 'xyzzy',
+}
+
+
+class _Rollback(Exception):
+    pass
+
+
+def populate(species: int, seed: int = 0) -> None:
+    rng = random.Random(seed)
+    names = {'Elefante', 'León'}
+    while len(names) < species:
+        names.add(''.join(rng.choice(_SYLLABLES) for _ in range(rng.randint(3, 6))).capitalize())
+
+    animals, aliases = [], []
+    for name in sorted(names):
+        animal_id = str(uuid.uuid4())
+        animals.append(AnimalModel(
+            id=animal_id,
+            name=name,
+            scientific_name=f"{name} {rng.choice(_SYLLABLES)}{rng.choice(_SYLLABLES)}",
+            description=' '.join(rng.choice(_WORDS) for _ in range(40)),
+            animal_class='MAMMAL',
+            habitat='',
+            diet='OMNIVORE',
+            conservation_status='LEAST_CONCERN',
+        ))
+        aliases.append(AnimalAliasModel(
+            animal_id=animal_id, alias=name, normalized=fold_label(name), language='es', is_name=True,
+        ))
+    AnimalModel.objects.bulk_create(animals, batch_size=2000)
+    AnimalAliasModel.objects.bulk_create(aliases, batch_size=2000, ignore_conflicts=True)
+    if connection.vendor == 'postgresql':
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE animals')
+            cursor.execute('ANALYZE animal_aliases')
+
+
+def measure(backend, query: str, repeat: int, limit: int):
+    ids = backend.search(query, limit)
+    start = time.perf_counter()
+    for _ in range(repeat):
+        backend.search(query, limit)
+    return (time.perf_counter() - start) / repeat * 1000, ids
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--species', type=int, default=50000)
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--limit', type=int, default=20)
+    parser.add_argument('--keep', action='store_true', help='keep the synthetic rows')
+    args = parser.parse_args()
+
+    backends = [OrmAnimalSearch()]
+    if PostgresAnimalSearch.available():
+        backends.append(PostgresAnimalSearch())
+    else:
+        print(f"PostgreSQL search not available on '{connection.vendor}', measuring the ORM only")
+
+    try:
+        with transaction.atomic():
+            start = time.perf_counter()
+            populate(args.species)
+            print(f"Inserted {args.species} species in {time.perf_counter() - start:.1f} s")
+
+            names = {}
+            print(f"{'query':<18} {'backend':<10} {'ms':>9} {'hits':>5}  top result")
+            for label, query in QUERIES.items():
+                for backend in backends:
+                    elapsed_ms, ids = measure(backend, query, args.repeat, args.limit)
+                    top = ''
+                    if ids:
+                        top = names.setdefault(ids[0], AnimalModel.objects.get(id=ids[0]).name)
+                    print(f"{label:<18} {backend.name:<10} {elapsed_ms:>9.2f} {len(ids):>5}  {top}")
+
+            if not args.keep:
+                raise _Rollback()
+    except _Rollback:
+        print("Synthetic rows rolled back")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,122 @@
+"""
+Benchmark - Pooled vs Unpooled Frame Preprocessing
+Run with: python scripts/bench_buffer_pool.py [--frames 500] [--width 640] [--height 480]
+
+Compara la preparación de tensores para YOLO (letterbox + HWC->CHW +
+float32) con buffers del pool frente a la ruta que asigna arrays nuevos en
+cada frame (equivalente a la de ultralytics). Cada modo corre en su propio
+proceso para medir RSS sin interferencias.
+"""
+import os
+import sys
+import time
+import argparse
+import resource
+import subprocess
+import tracemalloc
+
+import numpy as np
+import cv2
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.infrastructure.ml.buffer_pool import (
+    FrameBufferPool,
+    LETTERBOX_FILL,
+    letterbox_shape,
+    pooled_batch_tensor,
+)
+
+
+def unpooled_tensor(image: np.ndarray, size: int = 640) -> np.ndarray:
+    """Letterbox y tensor con arrays nuevos en cada paso"""
+    height, width = image.shape[:2]
+    canvas_h, canvas_w = letterbox_shape(height, width, size)
+    scale = size / max(height, width)
+    new_w, new_h = round(width * scale), round(height * scale)
+    resized = cv2.resize(image, (new_w, new_h), interpolation=cv2.INTER_LINEAR)
+    top, left = (canvas_h - new_h) // 2, (canvas_w - new_w) // 2
+    canvas = cv2.copyMakeBorder(
+        resized, top, canvas_h - new_h - top, left, canvas_w - new_w - left,
+        cv2.BORDER_CONSTANT, value=(LETTERBOX_FILL,) * 3,
+    )
+    batch = np.stack([canvas])[..., ::-1].transpose(0, 3, 1, 2)
+    tensor = np.ascontiguousarray(batch).astype(np.float32)
+    tensor /= 255.0
+    return tensor
+
+
+def current_rss_mb() -> float:
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 2**20
+    except OSError:
+        return float('nan')
+
+
+def run(mode: str, frames: int, width: int, height: int) -> None:
+    rng = np.random.default_rng(0)
+    images = [rng.integers(0, 255, (height, width, 3), dtype=np.uint8) for _ in range(8)]
+    pool = FrameBufferPool()
+    checksum = 0.0
+
+    def step(image):
+        nonlocal checksum
+        if mode == 'pooled':
+            with pooled_batch_tensor([image], pool) as (tensor, _):
+                checksum += float(tensor[0, 0, 0, 0])
+        else:
+            tensor = unpooled_tensor(image)
+            checksum += float(tensor[0, 0, 0, 0])
+
+    # Calentamiento
+    for image in images:
+        step(image)
+    rss_before = current_rss_mb()
+
+    tracemalloc.start()
+    transient = 0
+    start = time.perf_counter()
+    for index in range(frames):
+        tracemalloc.reset_peak()
+        base, _ = tracemalloc.get_traced_memory()
+        step(images[index % len(images)])
+        _, peak = tracemalloc.get_traced_memory()
+        transient += peak - base
+    elapsed = time.perf_counter() - start
+    tracemalloc.stop()
+
+    stats = pool.stats()
+    print(
+        f"{mode:>9} {elapsed / frames * 1000:>8.2f} {transient / frames / 2**20:>12.2f} "
+        f"{stats['allocated'] if mode == 'pooled' else '-':>10} "
+        f"{current_rss_mb() - rss_before:>9.1f} "
+        f"{resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:>10.1f}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--frames', type=int, default=500)
+    parser.add_argument('--width', type=int, default=640)
+    parser.add_argument('--height', type=int, default=480)
+    parser.add_argument('--mode', choices=['pooled', 'unpooled'])
+    args = parser.parse_args()
+
+    if args.mode:
+        cv2.setNumThreads(1)
+        run(args.mode, args.frames, args.width, args.height)
+        return
+
+    print(f"{args.frames} frames of {args.width}x{args.height}")
+    print(f"{'mode':>9} {'ms/frame':>8} {'alloc MB/fr':>12} {'pool allocs':>10} "
+          f"{'RSS +MB':>9} {'max RSS MB':>10}")
+    for mode in ('unpooled', 'pooled'):
+        subprocess.run([
+            sys.executable, os.path.abspath(__file__), '--mode', mode,
+            '--frames', str(args.frames), '--width', str(args.width), '--height', str(args.height),
+        ], check=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+"""
+Benchmark - Full vs Reduced-Resolution JPEG Decode
+Run with: python scripts/bench_decode.py [--repeat 20] [--target 640]
+
+Genera JPEG sintéticos de varios tamaños y compara cv2.imdecode a
+resolución completa contra decode_image_bytes (IMREAD_REDUCED_COLOR_*).
+"""
+import os
+import sys
+import time
+import argparse
+import statistics
+
+import numpy as np
+import cv2
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.domain.value_objects import probe_image_size
+from src.infrastructure.ml.decoding import decode_image_bytes
+
+SIZES = [
+    (640, 480),
+    (1280, 720),
+    (1920, 1080),
+    (3024, 4032),   # 12 MP (foto de móvil)
+    (4000, 6000),   # 24 MP
+]
+
+
+def make_jpeg(width: int, height: int) -> bytes:
+    """Imagen con gradientes y ruido para que el JPEG no sea trivial"""
+    rng = np.random.default_rng(0)
+    x = np.linspace(0, 255, width, dtype=np.float32)
+    y = np.linspace(0, 255, height, dtype=np.float32)[:, None]
+    image = np.empty((height, width, 3), np.uint8)
+    image[..., 0] = (x + y) / 2
+    image[..., 1] = x[::-1] * 0.5 + y * 0.5
+    image[..., 2] = rng.integers(0, 64, (height, width), dtype=np.uint8) + 96
+    ok, encoded = cv2.imencode('.jpg', image, [cv2.IMWRITE_JPEG_QUALITY, 90])
+    assert ok
+    return encoded.tobytes()
+
+
+def time_call(fn, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--target', type=int, default=640)
+    args = parser.parse_args()
+
+    cv2.setNumThreads(1)
+    print(f"{'input':>11} {'jpeg KB':>8} {'full ms':>8} {'full MB':>8} "
+          f"{'reduced ms':>10} {'decoded':>11} {'MB':>6} {'speedup':>8}")
+
+    for width, height in SIZES:
+        data = make_jpeg(width, height)
+        assert probe_image_size(data) == ("jpeg", width, height)
+        buffer = np.frombuffer(data, np.uint8)
+
+        full = cv2.imdecode(buffer, cv2.IMREAD_COLOR)
+        reduced, _ = decode_image_bytes(data, args.target)
+
+        full_ms = time_call(lambda: cv2.imdecode(buffer, cv2.IMREAD_COLOR), args.repeat)
+        reduced_ms = time_call(lambda: decode_image_bytes(data, args.target), args.repeat)
+
+        print(
+            f"{width:>5}x{height:<5} {len(data) / 1024:>8.0f} {full_ms:>8.1f} "
+            f"{full.nbytes / 2**20:>8.1f} {reduced_ms:>10.1f} "
+            f"{reduced.shape[1]:>5}x{reduced.shape[0]:<5} {reduced.nbytes / 2**20:>6.1f} "
+            f"{full_ms / reduced_ms:>7.1f}x"
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,111 @@
+"""
+Benchmark - Label Resolution
+Run with: python scripts/bench_label_resolution.py [--species 10000] [--lookups 2000]
+
+Compara la resolución etiqueta -> animal de antes (recorrer todos los
+animales y sus alias por cada candidato, y luego la búsqueda parcial) con
+el índice precalculado de AnimalLabelResolver, sobre un catálogo sintético.
+No necesita base de datos.
+"""
+import os
+import sys
+import time
+import random
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.domain.entities import Animal, AnimalClass, ConservationStatus, DietType
+from src.domain.services import MODEL_LABEL_CANDIDATES, AnimalLabelResolver
+
+_SYLLABLES = ['ba', 'ca', 'da', 'é', 'fo', 'gu', 'lá', 'mi', 'no', 'pé', 'ri', 'sú', 'ta', 'vo', 'zi']
+
+
+def synthetic_catalog(species: int, seed: int = 0) -> list:
+    rng = random.Random(seed)
+    names = set()
+    animals = []
+    # Los nombres que el modelo reconoce, al final del catálogo (peor caso del recorrido)
+    known = [candidates[0] for candidates in MODEL_LABEL_CANDIDATES.values()]
+    while len(names) < species - len(known):
+        names.add(''.join(rng.choice(_SYLLABLES) for _ in range(rng.randint(3, 6))).capitalize())
+    for name in sorted(names) + known:
+        animals.append(Animal.create(
+            name=name,
+            scientific_name=f"{name} {name.lower()}",
+            description='',
+            animal_class=AnimalClass.MAMMAL,
+            habitat='',
+            diet=DietType.OMNIVORE,
+            conservation_status=ConservationStatus.LEAST_CONCERN,
+            aliases=(name.upper(), f"{name} común"),
+        ))
+    return animals
+
+
+def legacy_resolve(animals: list, label: str):
+    """The per-request scan RecognizeImageView used to do"""
+    model_label = label.strip()
+    candidates = list(MODEL_LABEL_CANDIDATES.get(model_label.lower(), [])) + [model_label]
+    for c in candidates:
+        for animal in animals:
+            if animal.name.lower() == c.lower():
+                return animal
+        for animal in animals:
+            for alias in animal.aliases:
+                if alias and alias.lower() == c.lower():
+                    return animal
+    for animal in animals:
+        if model_label.lower() in animal.name.lower() or animal.name.lower() in model_label.lower():
+            return animal
+        for alias in animal.aliases:
+            if alias and (model_label.lower() in alias.lower() or alias.lower() in model_label.lower()):
+                return animal
+    return None
+
+
+def timed(fn, labels) -> float:
+    start = time.perf_counter()
+    for label in labels:
+        fn(label)
+    return (time.perf_counter() - start) / len(labels) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--species', type=int, default=10000)
+    parser.add_argument('--lookups', type=int, default=2000)
+    args = parser.parse_args()
+
+    animals = synthetic_catalog(args.species)
+    rng = random.Random(1)
+    # Etiquetas del modelo (casi todo el tráfico), más algunas desconocidas
+    labels = [rng.choice(list(MODEL_LABEL_CANDIDATES)) for _ in range(args.lookups)]
+    labels += ['unicornio'] * max(1, args.lookups // 100)
+
+    start = time.perf_counter()
+    resolver = AnimalLabelResolver(animals)
+    build_ms = (time.perf_counter() - start) * 1000
+
+    legacy_lookups = labels[:max(1, args.lookups // 20)]
+    legacy_us = timed(lambda label: legacy_resolve(animals, label), legacy_lookups)
+    cold = AnimalLabelResolver(animals)
+    first_us = timed(lambda label: cold.resolve(label, partial=True), sorted(set(labels)))
+    indexed_us = timed(lambda label: resolver.resolve(label, partial=True), labels)
+
+    mismatches = sum(
+        1 for label in set(labels)
+        if (legacy_resolve(animals, label) or None) is not resolver.resolve(label, partial=True)
+    )
+
+    print(f"Catalog: {len(animals)} species, {sum(len(a.aliases) for a in animals)} aliases")
+    print(f"{'index build':<28} {build_ms:>12.1f} ms (once per catalog change)")
+    print(f"{'legacy scan':<28} {legacy_us:>12.1f} us/lookup ({len(legacy_lookups)} lookups)")
+    print(f"{'index, first lookup':<28} {first_us:>12.1f} us/lookup")
+    print(f"{'index, memoized':<28} {indexed_us:>12.3f} us/lookup ({len(labels)} lookups)")
+    print(f"{'speedup':<28} {legacy_us / indexed_us:>12.0f}x")
+    print(f"{'mismatches vs legacy':<28} {mismatches:>12}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,121 @@
+"""
+Benchmark - WebSocket Wire Codecs
+Run with: python scripts/bench_ws_codecs.py [--iterations 20000]
+
+Compara JSON, MessagePack y CBOR (los que estén instalados) con mensajes
+representativos del WebSocket de reconocimiento: coste de codificar y
+decodificar y bytes por mensaje.
+"""
+import os
+import sys
+import time
+import random
+import argparse
+
+import django
+
+# Setup Django (el paquete websocket importa el consumer y los modelos)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+django.setup()
+
+from src.interfaces.websocket.codecs import available_codecs
+
+
+def detection(rng: random.Random, track_id: int = None) -> dict:
+    box = {
+        'class': rng.choice(['Dog', 'Cat', 'Bird', 'Horse']),
+        'confidence': rng.random(),
+        'x': rng.uniform(0, 600),
+        'y': rng.uniform(0, 440),
+        'width': rng.uniform(20, 300),
+        'height': rng.uniform(20, 300),
+    }
+    if track_id is not None:
+        box['id'] = track_id
+    return box
+
+
+def sample_messages() -> dict:
+    rng = random.Random(0)
+    animal = {
+        'id': '6f1c2a8e-0d7b-4f0e-9a53-2b1d7c9e4a10',
+        'name': 'Perro doméstico',
+        'scientific_name': 'Canis lupus familiaris',
+        'description': 'Mamífero carnívoro de la familia de los cánidos. ' * 6,
+        'animal_class': 'mammal',
+        'habitat': 'Doméstico, en todo el mundo',
+        'diet': 'omnivore',
+        'conservation_status': 'LC',
+        'fun_facts': ['Su olfato es hasta 100.000 veces más sensible que el humano.'] * 3,
+        'average_lifespan': '10-13 años',
+        'average_weight': '5-40 kg',
+        'average_height': '15-110 cm',
+        'geographic_distribution': 'Mundial',
+        'image_url': None,
+        'sound_url': None,
+        'is_endangered': False,
+    }
+    recognition = {
+        'animal_id': animal['id'],
+        'animal_name': 'Dog',
+        'confidence': 0.9134,
+        'confidence_percentage': '91.3%',
+        'bounding_box': {'x': 120, 'y': 80, 'width': 240, 'height': 200},
+        'timestamp': '2026-10-19T10:15:30.123456',
+    }
+    return {
+        'detections (5 boxes)': {
+            'type': 'detections',
+            'data': {'detections': [detection(rng) for _ in range(5)]},
+        },
+        'detections_delta (2 moved)': {
+            'type': 'detections_delta',
+            'data': {'seq': 42, 'moved': [detection(rng, 1), detection(rng, 2)]},
+        },
+        'recognition (full animal)': {
+            'type': 'recognition',
+            'data': {'recognition': recognition, 'animal': animal},
+        },
+        'frame envelope': {
+            'type': 'frame',
+            'events': [
+                {'type': 'detections', 'data': {'detections': [detection(rng) for _ in range(3)]}},
+                {'type': 'recognition', 'data': {'recognition': recognition, 'animal_id': animal['id']}},
+            ],
+        },
+    }
+
+
+def measure(codec, message: dict, iterations: int):
+    payload = codec.encode(message)
+    start = time.perf_counter()
+    for _ in range(iterations):
+        codec.encode(message)
+    encode_us = (time.perf_counter() - start) / iterations * 1e6
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        codec.decode(payload)
+    decode_us = (time.perf_counter() - start) / iterations * 1e6
+
+    size = len(payload.encode('utf-8') if isinstance(payload, str) else payload)
+    return encode_us, decode_us, size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--iterations', type=int, default=20000)
+    args = parser.parse_args()
+
+    codecs = {name: cls() for name, cls in available_codecs().items()}
+    print(f"Codecs: {', '.join(codecs)} ({args.iterations} iterations)")
+    print(f"{'message':<28} {'codec':<8} {'encode us':>10} {'decode us':>10} {'bytes':>7}")
+    for label, message in sample_messages().items():
+        for name, codec in codecs.items():
+            encode_us, decode_us, size = measure(codec, message, args.iterations)
+            print(f"{label:<28} {name:<8} {encode_us:>10.2f} {decode_us:>10.2f} {size:>7}")
+
+
+if __name__ == '__main__':
+    main()
@@ -14,6 +14,7 @@ os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
 django.setup()
 
 from src.infrastructure.persistence.models import AnimalModel
+from src.infrastructure.persistence import replace_animal_aliases
 import uuid
 
 # OpenRouter configuration
@@ -411,7 +412,6 @@ def seed_animals():
             existing.average_lifespan = animal_data.get('average_lifespan')
             existing.average_weight = animal_data.get('average_weight')
             existing.geographic_distribution = animal_data.get('geographic_distribution')
-            existing.aliases = animal_data.get('aliases', [])
             existing.save()
             animal = existing
             created = False
@@ -430,10 +430,11 @@ def seed_animals():
                 average_lifespan=animal_data.get('average_lifespan'),
                 average_weight=animal_data.get('average_weight'),
                 geographic_distribution=animal_data.get('geographic_distribution'),
-                aliases=animal_data.get('aliases', []),
             )
             created = True
             print(f"  Created: {animal.name}")
+        
+        replace_animal_aliases(animal.id, animal.name, animal_data.get('aliases', []))
     
     print(f"\nTotal animals: {AnimalModel.objects.count()}")
     
@@ -0,0 +1,101 @@
+"""
+Application Service Levels
+Per-session degradation steps applied while the inference tier is overloaded.
+
+Cuando la carga sube, cada sesión baja un escalón a la vez:
+resolución → cadencia → detector cada N frames → solo detecciones
+(sin persistir descubrimientos). Al bajar la carga sube de nuevo.
+"""
+from dataclasses import dataclass
+from enum import IntEnum
+from typing import Optional
+import time
+
+
+class ServiceLevel(IntEnum):
+    """Degradation steps, ordered from best to most degraded"""
+    FULL = 0
+    REDUCED_RESOLUTION = 1
+    REDUCED_CADENCE = 2
+    DETECT_EVERY_N = 3
+    DETECTIONS_ONLY = 4
+
+
+@dataclass(frozen=True)
+class ServiceLevelProfile:
+    """
+    Value Object: Service Level Profile
+    What a session does at a given level. Capture size and frame interval
+    are signalled to the client; the rest is applied server-side.
+    """
+    capture_width: int
+    capture_height: int
+    frame_interval_ms: int
+    detect_every_n: int
+    persist_discoveries: bool
+
+    def to_dict(self) -> dict:
+        return {
+            'capture_width': self.capture_width,
+            'capture_height': self.capture_height,
+            'frame_interval_ms': self.frame_interval_ms,
+            'detect_every_n': self.detect_every_n,
+            'persist_discoveries': self.persist_discoveries,
+        }
+
+
+SERVICE_LEVEL_PROFILES = {
+    ServiceLevel.FULL: ServiceLevelProfile(640, 480, 200, 1, True),
+    ServiceLevel.REDUCED_RESOLUTION: ServiceLevelProfile(480, 360, 200, 1, True),
+    ServiceLevel.REDUCED_CADENCE: ServiceLevelProfile(480, 360, 400, 1, True),
+    ServiceLevel.DETECT_EVERY_N: ServiceLevelProfile(320, 240, 400, 3, True),
+    ServiceLevel.DETECTIONS_ONLY: ServiceLevelProfile(320, 240, 500, 3, False),
+}
+
+
+class SessionServiceLevel:
+    """
+    Per-session service level.
+    Moves one step at a time toward the load-derived target, waiting
+    `min_dwell` seconds between steps so sessions don't oscillate.
+    """
+
+    def __init__(self, min_dwell: float = 2.0):
+        self._level = ServiceLevel.FULL
+        self._min_dwell = min_dwell
+        self._changed_at = 0.0
+        self._frame_counter = 0
+
+    @property
+    def level(self) -> ServiceLevel:
+        return self._level
+
+    @property
+    def profile(self) -> ServiceLevelProfile:
+        return SERVICE_LEVEL_PROFILES[self._level]
+
+    def update(self, target: ServiceLevel, now: Optional[float] = None) -> bool:
+        """
+        Step toward the target level.
+        Returns True if the level changed (the client must be told).
+        """
+        now = time.monotonic() if now is None else now
+        if target == self._level or now - self._changed_at < self._min_dwell:
+            return False
+
+        step = 1 if target > self._level else -1
+        self._level = ServiceLevel(self._level + step)
+        self._changed_at = now
+        return True
+
+    def should_run_detector(self) -> bool:
+        """Count a frame and tell whether the detector runs on it"""
+        run = self._frame_counter % self.profile.detect_every_n == 0
+        self._frame_counter += 1
+        return run
+
+    def to_dict(self) -> dict:
+        return {
+            'level': self._level.name,
+            **self.profile.to_dict(),
+        }
@@ -0,0 +1,104 @@
+"""
+Application Frame Scheduling
+Deadline bookkeeping for real-time camera frames.
+
+Un frame que espera más que su presupuesto (≈500 ms) antes de la inferencia
+ya no sirve: el usuario movió la cámara. Cada frame lleva su instante de
+origen y un deadline por sesión para poder descartarlo antes de gastar CPU.
+"""
+from collections import deque
+from dataclasses import dataclass
+from typing import Optional
+import time
+
+# Client clocks are only trusted when their reported age is plausible
+MAX_CLIENT_AGE_MS = 10_000
+
+
+@dataclass(frozen=True)
+class FrameTicket:
+    """
+    Value Object: Frame Ticket
+    A received frame plus its origin time and processing deadline
+    (both on the server's monotonic clock).
+    """
+    data: str
+    received_at: float
+    origin: float
+    deadline: float
+    captured_at_ms: Optional[float] = None
+
+    @classmethod
+    def create(
+        cls,
+        data: str,
+        deadline_ms: float,
+        received_at: Optional[float] = None,
+        captured_at_ms: Optional[float] = None,
+    ) -> 'FrameTicket':
+        """
+        Build a ticket from a server receive time and an optional client
+        capture timestamp (epoch milliseconds).
+        """
+        received_at = time.monotonic() if received_at is None else received_at
+        origin = received_at
+
+        if captured_at_ms is not None:
+            client_age_ms = time.time() * 1000 - captured_at_ms
+            if 0 <= client_age_ms <= MAX_CLIENT_AGE_MS:
+                origin = received_at - client_age_ms / 1000
+
+        return cls(
+            data=data,
+            received_at=received_at,
+            origin=origin,
+            deadline=origin + deadline_ms / 1000,
+            captured_at_ms=captured_at_ms,
+        )
+
+    def age_ms(self, now: Optional[float] = None) -> float:
+        """Milliseconds elapsed since the frame was captured"""
+        now = time.monotonic() if now is None else now
+        return (now - self.origin) * 1000
+
+    def is_stale(self, now: Optional[float] = None) -> bool:
+        """Check if the frame's deadline has already passed"""
+        now = time.monotonic() if now is None else now
+        return now > self.deadline
+
+
+class FrameAgeStats:
+    """
+    Per-session frame accounting: processed/dropped counts and a bounded
+    window of frame ages for percentile reporting.
+    """
+
+    def __init__(self, window: int = 512):
+        self.processed = 0
+        self.dropped_stale = 0
+        self._ages = deque(maxlen=window)
+
+    def record_processed(self, age_ms: float) -> None:
+        self.processed += 1
+        self._ages.append(age_ms)
+
+    def record_dropped(self, age_ms: float) -> None:
+        self.dropped_stale += 1
+        self._ages.append(age_ms)
+
+    def percentile(self, pct: float) -> Optional[float]:
+        """Nearest-rank percentile of recent frame ages"""
+        if not self._ages:
+            return None
+        ordered = sorted(self._ages)
+        index = min(len(ordered) - 1, max(0, int(round(pct / 100 * len(ordered))) - 1))
+        return ordered[index]
+
+    def to_dict(self) -> dict:
+        return {
+            'processed': self.processed,
+            'dropped_stale': self.dropped_stale,
+            'age_ms_p50': self.percentile(50),
+            'age_ms_p90': self.percentile(90),
+            'age_ms_p99': self.percentile(99),
+        }
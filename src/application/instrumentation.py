@@ -0,0 +1,244 @@
+"""
+Application Instrumentation
+Per-stage latency timers for the frame pipeline.
+
+Cada frame lleva un FrameTimings con la duración de cada etapa (medida con
+time.perf_counter). El frame en curso se guarda en un ContextVar, así los
+adaptadores (decodificación, inferencia) registran sus etapas sin cambiar
+las firmas de los puertos; sync_to_async copia el contexto al hilo. Al
+terminar el frame, las duraciones se acumulan en histogramas por proceso.
+
+Las mismas etapas pueden abrir spans de trazas: la infraestructura registra
+una fábrica con set_span_factory() y sin ella span() no cuesta nada.
+"""
+import bisect
+import inspect
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from typing import Callable, ContextManager, Dict, Iterator, Optional
+
+# Etapas conocidas, en el orden del pipeline
+STAGES = (
+    'parse',        # decodificar el mensaje WebSocket (JSON/msgpack)
+    'decode',       # base64 + JPEG -> píxeles
+    'preprocess',   # letterbox / tensor
+    'inference',    # llamada al modelo
+    'postprocess',  # salida del modelo -> RecognitionResult
+    'catalog',      # búsqueda del animal en el catálogo
+    'persistence',  # guardar el descubrimiento
+    'storage',      # miniatura síncrona (sin pipeline en segundo plano)
+    'notify',       # envío al cliente
+)
+
+# Límites superiores de los buckets (ms), estilo Prometheus
+LATENCY_BUCKETS_MS = (
+    0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000,
+)
+
+
+class FrameTimings:
+    """Stage durations (ms) of one frame; repeated stages accumulate"""
+
+    __slots__ = ('stages', 'started')
+
+    def __init__(self):
+        self.stages: Dict[str, float] = {}
+        self.started = time.perf_counter()
+
+    def add(self, stage: str, elapsed_ms: float) -> None:
+        self.stages[stage] = self.stages.get(stage, 0.0) + elapsed_ms
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, (time.perf_counter() - start) * 1000)
+
+    def total_ms(self) -> float:
+        return (time.perf_counter() - self.started) * 1000
+
+    def to_dict(self) -> dict:
+        timings = {name: round(ms, 2) for name, ms in self.stages.items()}
+        timings['total'] = round(self.total_ms(), 2)
+        return timings
+
+
+_current_timings: ContextVar[Optional[FrameTimings]] = ContextVar('frame_timings', default=None)
+
+# (name, attributes) -> context manager que abre un span; None = sin trazas
+_span_factory: Optional[Callable[[str, dict], ContextManager]] = None
+
+
+def set_span_factory(factory: Optional[Callable[[str, dict], ContextManager]]) -> None:
+    """Register the tracer used by span() and stage() (None disables spans)"""
+    global _span_factory
+    _span_factory = factory
+
+
+def span(name: str, **attributes) -> ContextManager:
+    """Open a trace span when a span factory is registered"""
+    factory = _span_factory
+    if factory is None:
+        return nullcontext()
+    return factory(name, attributes)
+
+
+def current_timings() -> Optional[FrameTimings]:
+    """Timings of the frame being processed in this context, if any"""
+    return _current_timings.get()
+
+
+@contextmanager
+def frame_timings(timings: Optional[FrameTimings] = None) -> Iterator[FrameTimings]:
+    """Make `timings` (or a new FrameTimings) the current frame's timings"""
+    timings = timings or FrameTimings()
+    token = _current_timings.set(timings)
+    try:
+        yield timings
+    finally:
+        _current_timings.reset(token)
+
+
+def record_stage(name: str, elapsed_ms: float) -> None:
+    """Add a duration measured elsewhere to the current frame's timings"""
+    timings = _current_timings.get()
+    if timings is not None:
+        timings.add(name, elapsed_ms)
+
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    """Time a block into the current frame's timings (no-op outside a frame)"""
+    timings = _current_timings.get()
+    with span(name):
+        if timings is None:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            timings.add(name, (time.perf_counter() - start) * 1000)
+
+
+class LatencyHistogram:
+    """Cumulative bucketed latency histogram; percentiles are bucket upper bounds"""
+
+    def __init__(self, buckets=LATENCY_BUCKETS_MS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value_ms: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value_ms)] += 1
+        self.count += 1
+        self.sum += value_ms
+        self.max = max(self.max, value_ms)
+
+    def percentile(self, pct: float) -> Optional[float]:
+        if not self.count:
+            return None
+        rank = pct / 100 * self.count
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= rank and bucket_count:
+                # El límite del bucket nunca supera el máximo observado
+                return min(self.buckets[index], self.max) if index < len(self.buckets) else self.max
+        return self.max
+
+    def to_dict(self) -> dict:
+        def rounded(value: Optional[float]) -> Optional[float]:
+            return round(value, 2) if value is not None else None
+
+        return {
+            'count': self.count,
+            'mean_ms': rounded(self.sum / self.count) if self.count else None,
+            'p50_ms': rounded(self.percentile(50)),
+            'p90_ms': rounded(self.percentile(90)),
+            'p99_ms': rounded(self.percentile(99)),
+            'max_ms': round(self.max, 2),
+        }
+
+
+class StageHistograms:
+    """Per-worker latency histograms, one per pipeline stage plus the frame total"""
+
+    def __init__(self):
+        self._histograms: Dict[str, LatencyHistogram] = {}
+        self._lock = threading.Lock()
+
+    def record(self, timings: FrameTimings) -> None:
+        total = timings.total_ms()
+        with self._lock:
+            for name, elapsed_ms in timings.stages.items():
+                self._histogram(name).observe(elapsed_ms)
+            self._histogram('total').observe(total)
+
+    def _histogram(self, name: str) -> LatencyHistogram:
+        histogram = self._histograms.get(name)
+        if histogram is None:
+            histogram = self._histograms[name] = LatencyHistogram()
+        return histogram
+
+    def snapshot(self) -> Dict[str, LatencyHistogram]:
+        """Copy of the histograms, safe to read without the lock"""
+        with self._lock:
+            copies = {}
+            for name, histogram in self._histograms.items():
+                copy = LatencyHistogram(histogram.buckets)
+                copy.counts = list(histogram.counts)
+                copy.count, copy.sum, copy.max = histogram.count, histogram.sum, histogram.max
+                copies[name] = copy
+            return copies
+
+    def to_dict(self) -> dict:
+        return {name: histogram.to_dict() for name, histogram in self.snapshot().items()}
+
+
+class TimedPort:
+    """
+    Wraps a port so every method call is timed as `stage_name`.
+    Async methods are timed until their coroutine finishes.
+    """
+
+    def __init__(self, port, stage_name: str):
+        self._port = port
+        self._stage_name = stage_name
+
+    def __getattr__(self, name: str):
+        attribute = getattr(self._port, name)
+        if not callable(attribute) or name.startswith('_'):
+            return attribute
+
+        stage_name = self._stage_name
+        if inspect.iscoroutinefunction(attribute):
+            async def timed_async(*args, **kwargs):
+                with stage(stage_name):
+                    return await attribute(*args, **kwargs)
+            return timed_async
+
+        def timed(*args, **kwargs):
+            with stage(stage_name):
+                return attribute(*args, **kwargs)
+        return timed
+
+
+_histograms_instance: Optional[StageHistograms] = None
+_histograms_lock = threading.Lock()
+
+
+def get_stage_histograms() -> StageHistograms:
+    """Get the per-process stage latency histograms (singleton pattern)"""
+    global _histograms_instance
+    if _histograms_instance is None:
+        with _histograms_lock:
+            if _histograms_instance is None:
+                _histograms_instance = StageHistograms()
+    return _histograms_instance
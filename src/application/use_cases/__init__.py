@@ -5,6 +5,8 @@ from .recognition import (
     EndSessionUseCase,
     GetSessionDiscoveriesUseCase,
 )
+from .batch import RecognizeImageBatchUseCase, BatchImage
+from .video import RecognizeVideoUseCase
 from .animals import (
     GetAnimalDetailsUseCase,
     SearchAnimalsUseCase,
@@ -18,6 +20,9 @@ __all__ = [
     'StartSessionUseCase',
     'EndSessionUseCase',
     'GetSessionDiscoveriesUseCase',
+    'RecognizeImageBatchUseCase',
+    'BatchImage',
+    'RecognizeVideoUseCase',
     'GetAnimalDetailsUseCase',
     'SearchAnimalsUseCase',
     'ListAnimalsByClassUseCase',
@@ -49,17 +49,18 @@ class SearchAnimalsUseCase:
     def __init__(self, animal_repository: AnimalRepositoryPort):
         self._animal_service = AnimalInfoService(animal_repository)
     
-    def execute(self, query: str) -> List[dict]:
+    def execute(self, query: str, limit: Optional[int] = None) -> List[dict]:
         """
         Search animals by name or description.
         
         Args:
             query: Search query
+            limit: Maximum number of results (best matches first)
         
         Returns:
             List of matching animals
         """
-        return self._animal_service.search_animals(query)
+        return self._animal_service.search_animals(query, limit)
 
 
 class ListAnimalsByClassUseCase:
@@ -71,17 +72,19 @@ class ListAnimalsByClassUseCase:
     def __init__(self, animal_repository: AnimalRepositoryPort):
         self._animal_service = AnimalInfoService(animal_repository)
     
-    def execute(self, animal_class: str) -> List[dict]:
+    def execute(self, animal_class: str, limit: int, cursor: Optional[str] = None) -> dict:
         """
-        Get animals by class.
+        Get one page of animals by class.
         
         Args:
             animal_class: The taxonomic class
+            limit: Page size
+            cursor: `next` cursor of the previous page
         
         Returns:
-            List of animals in that class
+            Animals in that class ({'results', 'next'})
         """
-        return self._animal_service.get_animals_by_class(animal_class)
+        return self._animal_service.list_animals(limit, cursor, animal_class=animal_class)
 
 
 class ListEndangeredAnimalsUseCase:
@@ -93,14 +96,18 @@ class ListEndangeredAnimalsUseCase:
     def __init__(self, animal_repository: AnimalRepositoryPort):
         self._animal_service = AnimalInfoService(animal_repository)
     
-    def execute(self) -> List[dict]:
+    def execute(self, limit: int, cursor: Optional[str] = None) -> dict:
         """
-        Get all endangered animals.
+        Get one page of endangered animals.
+        
+        Args:
+            limit: Page size
+            cursor: `next` cursor of the previous page
         
         Returns:
-            List of endangered animals
+            Endangered animals ({'results', 'next'})
         """
-        return self._animal_service.get_endangered_animals()
+        return self._animal_service.list_animals(limit, cursor, endangered=True)
 
 
 class ListAllAnimalsUseCase:
@@ -110,14 +117,17 @@ class ListAllAnimalsUseCase:
     """
     
     def __init__(self, animal_repository: AnimalRepositoryPort):
-        self._animal_repo = animal_repository
+        self._animal_service = AnimalInfoService(animal_repository)
     
-    def execute(self) -> List[dict]:
+    def execute(self, limit: int, cursor: Optional[str] = None) -> dict:
         """
-        Get all animals.
+        Get one page of animals, ordered by name.
+        
+        Args:
+            limit: Page size
+            cursor: `next` cursor of the previous page
         
         Returns:
-            List of all animals
+            Animals ({'results', 'next'})
         """
-        animals = self._animal_repo.get_all()
-        return [animal.to_dict() for animal in animals]
+        return self._animal_service.list_animals(limit, cursor)
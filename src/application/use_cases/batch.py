@@ -0,0 +1,143 @@
+"""
+Application Use Cases - Batch Recognition
+Recognizes many uploaded images in one request (camera-trap uploads).
+"""
+from concurrent.futures import Executor
+from dataclasses import dataclass
+from typing import BinaryIO, Iterable, Iterator, List, Optional, Union
+import logging
+
+from src.domain.value_objects import ImageFrame
+from src.domain.services import AnimalLabelResolver
+from src.domain.ports import AnimalRepositoryPort, AnimalRecognitionPort
+from src.domain.exceptions import InferenceOverloadedException
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class BatchImage:
+    """
+    Input DTO: one uploaded image of a batch.
+    `data` may be an open file (e.g. an UploadedFile); it is only read when
+    its chunk is decoded, so a request never holds every image in memory.
+    """
+    index: int
+    filename: str
+    data: Union[bytes, BinaryIO]
+
+    def read(self) -> bytes:
+        if hasattr(self.data, 'read'):
+            self.data.seek(0)
+            return self.data.read()
+        return self.data
+
+
+class RecognizeImageBatchUseCase:
+    """
+    Use Case: Recognize Image Batch
+    Decodes images in parallel, runs batched inference and resolves labels
+    against the catalog loaded once per request. Yields one result dict per
+    image, in input order, as each inference batch completes.
+    """
+
+    def __init__(
+        self,
+        recognition_port: AnimalRecognitionPort,
+        animal_repository: AnimalRepositoryPort,
+        decode_executor: Executor,
+        batch_size: int = 8,
+    ):
+        self._recognition_port = recognition_port
+        self._animal_repo = animal_repository
+        self._executor = decode_executor
+        self._batch_size = max(1, batch_size)
+
+    def execute(self, images: Iterable[BatchImage]) -> Iterator[dict]:
+        """
+        Recognize a batch of images.
+
+        Args:
+            images: Uploaded images
+
+        Yields:
+            Per-image result dicts (errors are reported per image)
+        """
+        images = list(images)
+        resolver = self._animal_repo.get_label_resolver()
+
+        for start in range(0, len(images), self._batch_size):
+            chunk = images[start:start + self._batch_size]
+            yield from self._process_chunk(chunk, resolver)
+
+    def _decode(self, image: BatchImage):
+        return self._recognition_port.preprocess_image(
+            ImageFrame(data=image.read(), width=0, height=0)
+        )
+
+    def _process_chunk(self, chunk: List[BatchImage], resolver: AnimalLabelResolver) -> Iterator[dict]:
+        # Decode in parallel (OpenCV releases the GIL while decoding)
+        futures = [self._executor.submit(self._decode, image) for image in chunk]
+
+        decoded = []
+        errors = {}
+        for image, future in zip(chunk, futures):
+            try:
+                decoded.append((image, future.result()))
+            except Exception as e:
+                errors[image.index] = f"Invalid image: {e}"
+
+        results_by_index = {}
+        retry_after: Optional[int] = None
+        if decoded:
+            try:
+                batch_results = self._recognition_port.recognize_batch([array for _, array in decoded])
+                for (image, _), results in zip(decoded, batch_results):
+                    results_by_index[image.index] = results
+            except InferenceOverloadedException as e:
+                retry_after = e.retry_after
+                for image, _ in decoded:
+                    errors[image.index] = 'Recognition service is busy, retry later'
+            except Exception as e:
+                logger.error(f"Batch inference failed: {e}")
+                for image, _ in decoded:
+                    errors[image.index] = f"Recognition failed: {e}"
+
+        for image in chunk:
+            if image.index in errors:
+                item = {
+                    'index': image.index,
+                    'filename': image.filename,
+                    'success': False,
+                    'error': errors[image.index],
+                }
+                if retry_after is not None:
+                    item['retry_after'] = retry_after
+                yield item
+                continue
+
+            yield self._build_result(image, results_by_index.get(image.index) or [], resolver)
+
+    def _build_result(self, image: BatchImage, results: list, resolver: AnimalLabelResolver) -> dict:
+        if not results:
+            return {
+                'index': image.index,
+                'filename': image.filename,
+                'success': False,
+                'error': 'No animals detected in image',
+            }
+
+        best = max(results, key=lambda r: r.confidence)
+        animal = resolver.resolve(best.animal_name)
+        return {
+            'index': image.index,
+            'filename': image.filename,
+            'success': True,
+            'animal': animal.to_dict() if animal else None,
+            'recognition': {
+                'animal_name': best.animal_name,
+                'confidence': float(best.confidence),
+                'bounding_box': best.bounding_box,
+            },
+            'detections': len(results),
+        }
@@ -3,13 +3,22 @@ Application Use Cases - Recognition
 Handles the animal recognition workflow.
 """
 from dataclasses import dataclass
-from typing import Optional, List
+from typing import Callable, Optional, List
 import logging
 from asgiref.sync import sync_to_async
 
-from src.domain.entities import Animal, Discovery, RecognitionResult, UserSession
+from src.domain.entities import Animal, Discovery, RecognitionResult, SessionSummary, UserSession
+from src.application.frames import FrameTicket, FrameAgeStats
+from src.application.degradation import SessionServiceLevel
+from src.application.instrumentation import (
+    FrameTimings,
+    TimedPort,
+    frame_timings,
+    get_stage_histograms,
+    span,
+)
 from src.domain.value_objects import ImageFrame
-from src.domain.services import AnimalRecognitionService
+from src.domain.services import AnimalRecognitionService, TemporalVoteAggregator
 from src.domain.ports import (
     AnimalRepositoryPort,
     DiscoveryRepositoryPort,
@@ -17,11 +26,13 @@ from src.domain.ports import (
     AnimalRecognitionPort,
     ImageStoragePort,
     NotificationPort,
+    ThumbnailPipelinePort,
 )
 from src.domain.exceptions import (
     SessionNotFoundException,
     InvalidImageException,
     ModelNotReadyException,
+    InferenceOverloadedException,
 )
 
 logger = logging.getLogger(__name__)
@@ -36,6 +47,8 @@ class RecognitionResponse:
     discovery: Optional[dict] = None
     is_new_discovery: bool = False
     error: Optional[str] = None
+    retry_after: Optional[int] = None
+    dropped_stale: bool = False
 
 
 class ProcessFrameUseCase:
@@ -52,23 +65,67 @@ class ProcessFrameUseCase:
         session_repository: SessionRepositoryPort,
         image_storage: ImageStoragePort,
         notification_port: NotificationPort,
-        confidence_threshold: float = 0.7
+        confidence_threshold: float = 0.7,
+        frame_stats: Optional[FrameAgeStats] = None,
+        service_level: Optional[SessionServiceLevel] = None,
+        vote_aggregator: Optional[TemporalVoteAggregator] = None,
+        thumbnail_pipeline: Optional[ThumbnailPipelinePort] = None,
+        on_thumbnail_stored: Optional[Callable[[Discovery], None]] = None,
+        include_timings: bool = False,
     ):
+        # Los puertos se envuelven para medir cada etapa del frame
         self._recognition_service = AnimalRecognitionService(
             recognition_port=recognition_port,
-            animal_repository=animal_repository,
-            discovery_repository=discovery_repository,
-            image_storage=image_storage,
+            animal_repository=TimedPort(animal_repository, 'catalog'),
+            discovery_repository=TimedPort(discovery_repository, 'persistence'),
+            image_storage=TimedPort(image_storage, 'storage'),
             confidence_threshold=confidence_threshold,
+            thumbnail_pipeline=thumbnail_pipeline,
+            on_thumbnail_stored=on_thumbnail_stored,
         )
         self._session_repo = session_repository
-        self._notification = notification_port
+        self._discovery_repo = discovery_repository
+        self._notification = TimedPort(notification_port, 'notify')
+        self._include_timings = include_timings
         self._recognition_port = recognition_port
+        self._frame_stats = frame_stats or FrameAgeStats()
+        self._service_level = service_level
+        self._last_detections: List[dict] = []
+        self._vote_aggregator = vote_aggregator
+        self._session: Optional[UserSession] = None
+    
+    @property
+    def frame_stats(self) -> FrameAgeStats:
+        return self._frame_stats
+    
+    @property
+    def session(self) -> Optional[UserSession]:
+        """The session loaded by the first frame, with its incremental summary"""
+        return self._session
+    
+    def _load_session(self, session_id: str) -> Optional[UserSession]:
+        """Fetch the session once, with its discoveries, and keep it across frames"""
+        session = self._session_repo.get_by_id(session_id)
+        if session:
+            # El resumen se reconstruye con los descubrimientos ya guardados
+            session.summary = SessionSummary()
+            for discovery in self._discovery_repo.get_by_session(session_id):
+                session.add_discovery(discovery)
+        return session
+    
+    def _drop_if_stale(self, ticket: Optional[FrameTicket]) -> Optional[RecognitionResponse]:
+        """Return a dropped response if the frame's deadline has passed"""
+        if ticket is None or not ticket.is_stale():
+            return None
+        self._frame_stats.record_dropped(ticket.age_ms())
+        return RecognitionResponse(success=True, dropped_stale=True)
     
     async def execute(
         self, 
         session_id: str, 
-        frame_data: str
+        frame_data: str,
+        ticket: Optional[FrameTicket] = None,
+        timings: Optional[FrameTimings] = None,
     ) -> RecognitionResponse:
         """
         Execute the frame processing use case.
@@ -76,19 +133,55 @@ class ProcessFrameUseCase:
         Args:
             session_id: The active session ID
             frame_data: Base64 encoded image data
+            ticket: Optional deadline info; stale frames are dropped
+                before decode and before inference
+            timings: Optional stage timings already started by the caller
+                (e.g. with the message parse time)
         
         Returns:
             RecognitionResponse with results
         """
+        with frame_timings(timings) as timings, span('process_frame', session_id=session_id):
+            response = await self._execute(session_id, frame_data, ticket, timings)
+        
+        # Los frames descartados no cuentan en los histogramas de latencia
+        if not response.dropped_stale:
+            get_stage_histograms().record(timings)
+        return response
+    
+    def _timings_payload(self, timings: FrameTimings) -> Optional[dict]:
+        return timings.to_dict() if self._include_timings else None
+    
+    async def _execute(
+        self,
+        session_id: str,
+        frame_data: str,
+        ticket: Optional[FrameTicket],
+        timings: FrameTimings,
+    ) -> RecognitionResponse:
         try:
+            dropped = self._drop_if_stale(ticket)
+            if dropped:
+                return dropped
+            
+            # Degraded mode: detector runs every N frames, the rest hold the last boxes
+            if self._service_level and not self._service_level.should_run_detector():
+                await self._notification.send_detections(
+                    session_id, self._last_detections, self._timings_payload(timings)
+                )
+                return RecognitionResponse(success=True)
+            
             # Validate model is ready
             if not self._recognition_port.is_ready():
                 raise ModelNotReadyException("Recognition model is not ready")
             
-            # Get session (DB access - run in thread)
-            session = await sync_to_async(self._session_repo.get_by_id, thread_sensitive=False)(session_id)
-            if not session:
-                raise SessionNotFoundException(session_id)
+            # Get session (DB access - run in thread, only on the first frame)
+            session = self._session
+            if session is None or session.id != session_id:
+                session = await sync_to_async(self._load_session, thread_sensitive=False)(session_id)
+                if not session:
+                    raise SessionNotFoundException(session_id)
+                self._session = session
             
             # Parse image frame
             try:
@@ -102,6 +195,10 @@ class ProcessFrameUseCase:
                 thread_sensitive=False
             )(frame)
             
+            dropped = self._drop_if_stale(ticket)
+            if dropped:
+                return dropped
+            
             # ====== STEP 2: Get ALL detections (for bounding box visualization) ======
             all_detections = await sync_to_async(
                 self._recognition_port.recognize, 
@@ -122,10 +219,25 @@ class ProcessFrameUseCase:
                     detections_data.append(detection_dict)
             
             # Send detections to client (for bounding box visualization)
-            await self._notification.send_detections(session_id, detections_data)
+            self._last_detections = detections_data
+            await self._notification.send_detections(
+                session_id, detections_data, self._timings_payload(timings)
+            )
+            
+            # Most degraded level: detections only, discovery persistence paused
+            if self._service_level and not self._service_level.profile.persist_discoveries:
+                if ticket is not None:
+                    self._frame_stats.record_processed(ticket.age_ms())
+                return RecognitionResponse(success=True)
             
             # ====== STEP 3: Process frame (filter by confidence threshold) ======
-            result = await sync_to_async(self._recognition_service.process_frame, thread_sensitive=False)(frame, session)
+            # Reuses STEP 2 detections: no second decode or inference
+            result = await sync_to_async(self._recognition_service.process_frame, thread_sensitive=False)(
+                frame, session, all_detections or [], self._vote_aggregator
+            )
+            
+            if ticket is not None:
+                self._frame_stats.record_processed(ticket.age_ms())
             
             if not result:
                 return RecognitionResponse(success=True)
@@ -153,12 +265,22 @@ class ProcessFrameUseCase:
             
             return response
             
+        except InferenceOverloadedException as e:
+            logger.warning(f"Inference overloaded, frame rejected for session {session_id}")
+            return RecognitionResponse(
+                success=False,
+                error=str(e),
+                retry_after=e.retry_after,
+            )
         except Exception as e:
             logger.error(f"Error processing frame: {str(e)}")
             return RecognitionResponse(
                 success=False,
                 error=str(e)
             )
+        finally:
+            # Un solo envío por frame cuando el adaptador agrupa eventos
+            await self._notification.flush(session_id)
 
 
 class StartSessionUseCase:
@@ -188,6 +310,31 @@ class StartSessionUseCase:
         return saved_session.to_dict()
 
 
+def _complete_summary(
+    summary: SessionSummary,
+    animal_repo: AnimalRepositoryPort,
+) -> SessionSummary:
+    """Fetch the animal card (once per animal) for sightings that lack it"""
+    for sighting in summary.animals.values():
+        if 'name' not in sighting.animal:
+            animal = animal_repo.get_by_id(sighting.animal_id)
+            if animal:
+                sighting.animal = animal.to_dict()
+    return summary
+
+
+def _rebuild_summary(
+    session_id: str,
+    discovery_repo: DiscoveryRepositoryPort,
+    animal_repo: AnimalRepositoryPort,
+) -> SessionSummary:
+    """Summary from the stored discoveries, for sessions without a live or persisted one"""
+    summary = SessionSummary()
+    for discovery in discovery_repo.get_by_session(session_id):
+        summary.record_discovery(discovery)
+    return _complete_summary(summary, animal_repo)
+
+
 class EndSessionUseCase:
     """
     Use Case: End Recognition Session
@@ -204,43 +351,52 @@ class EndSessionUseCase:
         self._discovery_repo = discovery_repository
         self._animal_repo = animal_repository
     
-    def execute(self, session_id: str) -> dict:
+    def execute(self, session_id: str, session: Optional[UserSession] = None) -> dict:
         """
         End a session and return summary.
         
         Args:
             session_id: The session ID to end
+            session: The live session kept by the frame pipeline, if any;
+                its incremental summary avoids reloading the discoveries
         
         Returns:
             Session summary with discoveries
         """
-        session = self._session_repo.get_by_id(session_id)
-        if not session:
-            raise SessionNotFoundException(session_id)
-        
-        # Get all discoveries
-        discoveries = self._discovery_repo.get_by_session(session_id)
+        if session is None or session.id != session_id:
+            session = self._session_repo.get_by_id(session_id)
+            if not session:
+                raise SessionNotFoundException(session_id)
+            if session.is_active or not session.summary.total_discoveries:
+                session.summary = _rebuild_summary(session_id, self._discovery_repo, self._animal_repo)
         
-        # Build summary
-        discovery_details = []
-        for disc in discoveries:
-            animal = self._animal_repo.get_by_id(disc.animal_id)
-            if animal:
-                discovery_details.append({
-                    'discovery': disc.to_dict(),
-                    'animal': animal.to_dict(),
-                })
+        summary = _complete_summary(session.summary, self._animal_repo)
         
-        # End session
-        self._session_repo.end_session(session_id)
+        # End session (el resumen se persiste una sola vez, aquí)
+        self._session_repo.end_session(session_id, summary)
         
-        logger.info(f"Ended session: {session_id} with {len(discoveries)} discoveries")
+        logger.info(f"Ended session: {session_id} with {summary.total_discoveries} discoveries")
         
+        discovered = summary.discovered()
         return {
             'session': session.to_dict(),
-            'total_discoveries': len(discoveries),
-            'unique_animals': len(set(d.animal_id for d in discoveries)),
-            'discoveries': discovery_details,
+            'total_discoveries': summary.total_discoveries,
+            'unique_animals': summary.unique_animals,
+            'discoveries': [
+                {'discovery': sighting.discovery.to_dict(), 'animal': sighting.animal}
+                for sighting in discovered
+                if 'name' in sighting.animal
+            ],
+            'animals': [
+                {
+                    'animal_id': sighting.animal_id,
+                    'best_confidence': sighting.best_confidence,
+                    'first_seen': sighting.first_seen.isoformat(),
+                    'last_seen': sighting.last_seen.isoformat(),
+                    'sightings': sighting.sightings,
+                }
+                for sighting in summary.animals.values()
+            ],
         }
 
 
@@ -254,33 +410,72 @@ class GetSessionDiscoveriesUseCase:
         self,
         discovery_repository: DiscoveryRepositoryPort,
         animal_repository: AnimalRepositoryPort,
+        session_repository: Optional[SessionRepositoryPort] = None,
     ):
         self._discovery_repo = discovery_repository
         self._animal_repo = animal_repository
+        self._session_repo = session_repository
     
-    def execute(self, session_id: str) -> List[dict]:
+    def execute(self, session_id: str, session: Optional[UserSession] = None) -> List[dict]:
         """
         Get all discoveries for a session.
         
         Args:
             session_id: The session ID
+            session: The live session kept by the frame pipeline, if any
         
         Returns:
             List of discoveries with animal info
         """
-        discoveries = self._discovery_repo.get_by_session(session_id)
+        if session is not None and session.id == session_id:
+            summary = _complete_summary(session.summary, self._animal_repo)
+        else:
+            stored = self._session_repo.get_by_id(session_id) if self._session_repo else None
+            if stored and not stored.is_active and stored.summary.total_discoveries:
+                summary = stored.summary
+            else:
+                summary = _rebuild_summary(session_id, self._discovery_repo, self._animal_repo)
         
         result = []
-        for disc in discoveries:
-            animal = self._animal_repo.get_by_id(disc.animal_id)
-            if animal:
-                result.append({
-                    'discovery': disc.to_dict(),
-                    'animal': {
-                        'id': animal.id,
-                        'name': animal.name,
-                        'image_url': animal.image_url,
-                    },
-                })
+        for sighting in summary.discovered():
+            if 'name' not in sighting.animal:
+                continue
+            result.append({
+                'discovery': sighting.discovery.to_dict(),
+                'animal': {
+                    'id': sighting.animal_id,
+                    'name': sighting.animal['name'],
+                    'image_url': sighting.animal.get('image_url'),
+                },
+            })
         
         return result
+    
+    def execute_page(self, session_id: str, limit: int, cursor: Optional[str] = None) -> dict:
+        """
+        Get one page of a session's discoveries, newest first.
+        
+        Args:
+            session_id: The session ID
+            limit: Page size
+            cursor: `next` cursor of the previous page
+        
+        Returns:
+            Discoveries with animal info ({'results', 'next'})
+        """
+        page = self._discovery_repo.get_page_by_session(session_id, limit, cursor)
+        # Los animales de la página en una sola consulta
+        animals = self._animal_repo.get_by_ids(discovery.animal_id for discovery in page.items)
+        
+        def serialize(discovery) -> dict:
+            animal = animals.get(discovery.animal_id)
+            return {
+                'discovery': discovery.to_dict(),
+                'animal': {
+                    'id': discovery.animal_id,
+                    'name': animal.name if animal else None,
+                    'image_url': animal.image_url if animal else None,
+                },
+            }
+        
+        return page.to_dict(serialize)
@@ -0,0 +1,205 @@
+"""
+Application Use Cases - Video Recognition
+Recognizes animals in an uploaded video clip and builds a per-animal timeline.
+"""
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+import logging
+import uuid
+
+from src.domain.value_objects import ImageFrame
+from src.domain.ports import (
+    AnimalRepositoryPort,
+    AnimalRecognitionPort,
+    ImageStoragePort,
+    VideoFrameSamplerPort,
+)
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class AnimalTrack:
+    """Timeline accumulated for one detected label"""
+    label: str
+    segments: List[dict] = field(default_factory=list)
+    best_confidence: float = 0.0
+    best_timestamp: float = 0.0
+    best_bounding_box: Optional[dict] = None
+    best_keyframe: Optional[bytes] = None
+
+    def observe(self, timestamp: float, confidence: float, merge_gap: float) -> None:
+        """Extend the current segment or open a new one"""
+        if self.segments and timestamp - self.segments[-1]['end'] <= merge_gap:
+            segment = self.segments[-1]
+            segment['end'] = timestamp
+            segment['max_confidence'] = max(segment['max_confidence'], confidence)
+        else:
+            self.segments.append({
+                'start': timestamp,
+                'end': timestamp,
+                'max_confidence': confidence,
+            })
+
+
+class RecognizeVideoUseCase:
+    """
+    Use Case: Recognize Video
+    Streams sampled frames through batched inference. Only the current batch
+    and one encoded keyframe per label are held in memory, so memory stays
+    constant regardless of video length. At most `max_frames` frames are
+    analysed; the result says whether the video was cut short and where.
+    """
+
+    def __init__(
+        self,
+        recognition_port: AnimalRecognitionPort,
+        animal_repository: AnimalRepositoryPort,
+        frame_sampler: VideoFrameSamplerPort,
+        image_storage: ImageStoragePort,
+        batch_size: int = 8,
+        merge_gap: float = 2.0,
+        max_frames: int = 600,
+    ):
+        self._recognition_port = recognition_port
+        self._animal_repo = animal_repository
+        self._sampler = frame_sampler
+        self._image_storage = image_storage
+        self._batch_size = max(1, batch_size)
+        self._merge_gap = merge_gap
+        self._max_frames = max(1, max_frames)
+
+    def execute(
+        self,
+        video_path: str,
+        progress_callback: Optional[Callable[[dict], None]] = None,
+        video_id: Optional[str] = None,
+    ) -> dict:
+        """
+        Recognize animals in a video file.
+
+        Args:
+            video_path: Path to the video on local disk
+            progress_callback: Called after every inference batch
+            video_id: Identifier echoed in progress events and the result
+
+        Returns:
+            Timeline with segments and the best keyframe per animal, plus
+            `truncated`/`sampled_until` when the frame limit was reached
+        """
+        video_id = video_id or uuid.uuid4().hex
+        duration = self._sampler.get_duration(video_path)
+        tracks: Dict[str, AnimalTrack] = {}
+        frames_sampled = 0
+        sampled_until = 0.0
+        truncated = False
+        batch = []
+
+        def flush(batch: list) -> None:
+            results = self._recognition_port.recognize_batch([image for _, image in batch])
+            for (timestamp, image), detections in zip(batch, results):
+                self._observe(tracks, timestamp, image, detections)
+
+            if progress_callback:
+                processed = batch[-1][0]
+                progress_callback({
+                    'video_id': video_id,
+                    'processed_seconds': round(processed, 2),
+                    'duration': round(duration, 2),
+                    'progress': round(min(1.0, processed / duration), 3) if duration else None,
+                    'frames_sampled': frames_sampled,
+                    'animals': sorted(tracks),
+                })
+
+        frames = self._sampler.sample(video_path)
+        try:
+            for timestamp, image in frames:
+                # Un frame más allá del límite: el video queda truncado
+                if frames_sampled >= self._max_frames:
+                    truncated = True
+                    break
+                frames_sampled += 1
+                sampled_until = timestamp
+                batch.append((timestamp, image))
+                if len(batch) >= self._batch_size:
+                    flush(batch)
+                    batch = []
+        finally:
+            # Libera el VideoCapture aunque se corte antes del final
+            close = getattr(frames, 'close', None)
+            if close:
+                close()
+        if batch:
+            flush(batch)
+
+        animals = self._build_timeline(tracks, video_id)
+        if truncated:
+            logger.warning(
+                f"⚠️ Video {video_id} truncado en {sampled_until:.1f}s "
+                f"(límite de {self._max_frames} frames)"
+            )
+        logger.info(f"Video {video_id}: {frames_sampled} frames, {len(animals)} animals")
+
+        return {
+            'video_id': video_id,
+            'duration': round(duration, 2),
+            'frames_sampled': frames_sampled,
+            'truncated': truncated,
+            'sampled_until': round(sampled_until, 2),
+            'animals': animals,
+        }
+
+    def _observe(self, tracks: Dict[str, AnimalTrack], timestamp: float, image, detections) -> None:
+        # Best detection per label in this frame
+        best_per_label = {}
+        for detection in detections:
+            current = best_per_label.get(detection.animal_name)
+            if current is None or detection.confidence > current.confidence:
+                best_per_label[detection.animal_name] = detection
+
+        for label, detection in best_per_label.items():
+            track = tracks.setdefault(label, AnimalTrack(label=label))
+            track.observe(timestamp, float(detection.confidence), self._merge_gap)
+
+            if detection.confidence > track.best_confidence:
+                track.best_confidence = float(detection.confidence)
+                track.best_timestamp = timestamp
+                track.best_bounding_box = detection.bounding_box
+                track.best_keyframe = self._sampler.encode_keyframe(image, detection.bounding_box)
+
+    def _build_timeline(self, tracks: Dict[str, AnimalTrack], video_id: str) -> List[dict]:
+        resolver = self._animal_repo.get_label_resolver()
+        animals = []
+
+        for track in sorted(tracks.values(), key=lambda t: t.segments[0]['start']):
+            keyframe_url = None
+            if track.best_keyframe:
+                try:
+                    keyframe_url = self._image_storage.save_thumbnail(
+                        ImageFrame(data=track.best_keyframe, width=0, height=0),
+                        f"video_{video_id}_{track.label}.jpg",
+                    )
+                except Exception as e:
+                    logger.warning(f"Could not store keyframe for {track.label}: {e}")
+
+            animal = resolver.resolve(track.label)
+            animals.append({
+                'label': track.label,
+                'animal': animal.to_dict() if animal else None,
+                'segments': [
+                    {
+                        'start': round(s['start'], 2),
+                        'end': round(s['end'], 2),
+                        'max_confidence': s['max_confidence'],
+                    }
+                    for s in track.segments
+                ],
+                'best_keyframe': {
+                    'timestamp': round(track.best_timestamp, 2),
+                    'confidence': track.best_confidence,
+                    'bounding_box': track.best_bounding_box,
+                    'url': keyframe_url,
+                },
+            })
+
+        return animals
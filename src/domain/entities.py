@@ -4,12 +4,22 @@ These are the fundamental objects in our domain.
 They are independent of any framework or infrastructure.
 """
 from dataclasses import dataclass, field
-from typing import List, Optional
-from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+from datetime import datetime, timezone
 from enum import Enum
 import uuid
 
 
+def utc_now() -> datetime:
+    """Current time as an aware UTC datetime, like the rows read back from the database"""
+    return datetime.now(timezone.utc)
+
+
+def as_utc(value: datetime) -> datetime:
+    """Treat naive datetimes as UTC so they compare with aware ones"""
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
 class ConservationStatus(Enum):
     """Estado de conservación según IUCN"""
     EXTINCT = "Extinto"
@@ -23,6 +33,14 @@ class ConservationStatus(Enum):
     NOT_EVALUATED = "No Evaluado"
 
 
+# Categorías que cuentan como amenazadas
+ENDANGERED_STATUSES = (
+    ConservationStatus.CRITICALLY_ENDANGERED,
+    ConservationStatus.ENDANGERED,
+    ConservationStatus.VULNERABLE,
+)
+
+
 class DietType(Enum):
     """Tipos de dieta animal"""
     CARNIVORE = "Carnívoro"
@@ -42,12 +60,13 @@ class AnimalClass(Enum):
     INVERTEBRATE = "Invertebrado"
 
 
-@dataclass
+@dataclass(frozen=True)
 class Animal:
     """
     Entity: Animal
     Represents an animal species in our domain.
     This is a rich domain model with behavior.
+    Immutable, so cached catalog instances can be shared safely.
     """
     id: str
     name: str
@@ -64,6 +83,7 @@ class Animal:
     geographic_distribution: Optional[str] = None
     image_url: Optional[str] = None
     sound_url: Optional[str] = None
+    aliases: Tuple[str, ...] = ()
     
     @classmethod
     def create(
@@ -92,12 +112,7 @@ class Animal:
     
     def is_endangered(self) -> bool:
         """Check if the animal is in any endangered category"""
-        endangered_statuses = [
-            ConservationStatus.CRITICALLY_ENDANGERED,
-            ConservationStatus.ENDANGERED,
-            ConservationStatus.VULNERABLE,
-        ]
-        return self.conservation_status in endangered_statuses
+        return self.conservation_status in ENDANGERED_STATUSES
     
     def get_random_fun_fact(self) -> Optional[str]:
         """Return a random fun fact about the animal"""
@@ -117,7 +132,7 @@ class Animal:
             'habitat': self.habitat,
             'diet': self.diet.value,
             'conservation_status': self.conservation_status.value,
-            'fun_facts': self.fun_facts,
+            'fun_facts': list(self.fun_facts),
             'average_lifespan': self.average_lifespan,
             'average_weight': self.average_weight,
             'average_height': self.average_height,
@@ -138,7 +153,7 @@ class RecognitionResult:
     animal_name: str
     confidence: float
     bounding_box: Optional[dict] = None  # {x, y, width, height}
-    timestamp: datetime = field(default_factory=datetime.utcnow)
+    timestamp: datetime = field(default_factory=utc_now)
     
     def is_confident(self, threshold: float = 0.7) -> bool:
         """Check if the recognition meets the confidence threshold"""
@@ -166,7 +181,7 @@ class Discovery:
     session_id: str
     animal_id: str
     thumbnail_url: str
-    discovered_at: datetime = field(default_factory=datetime.utcnow)
+    discovered_at: datetime = field(default_factory=utc_now)
     location: Optional[str] = None
     confidence: float = 0.0
     
@@ -202,6 +217,140 @@ class Discovery:
             'location': self.location,
             'confidence': self.confidence,
         }
+    
+    def cursor_key(self) -> Tuple[str, str]:
+        """Keyset sort key: fixed-width UTC timestamp and id, so strings compare like the values"""
+        discovered_at = as_utc(self.discovered_at).astimezone(timezone.utc)
+        return (discovered_at.strftime('%Y-%m-%dT%H:%M:%S.%f+00:00'), self.id)
+    
+    @classmethod
+    def from_dict(cls, data: dict) -> 'Discovery':
+        return cls(
+            id=data['id'],
+            user_id=data.get('user_id'),
+            session_id=data['session_id'],
+            animal_id=data['animal_id'],
+            thumbnail_url=data.get('thumbnail_url', ''),
+            discovered_at=as_utc(datetime.fromisoformat(data['discovered_at'])),
+            location=data.get('location'),
+            confidence=data.get('confidence', 0.0),
+        )
+
+
+@dataclass
+class AnimalSighting:
+    """
+    Entity: Animal Sighting
+    Per-animal aggregate of one session: best confidence, first and last
+    time seen, and the discovery once it is committed.
+    """
+    animal_id: str
+    animal: dict
+    best_confidence: float
+    first_seen: datetime
+    last_seen: datetime
+    sightings: int = 0
+    discovery: Optional[Discovery] = None
+    
+    def to_dict(self) -> dict:
+        return {
+            'animal_id': self.animal_id,
+            'animal': self.animal,
+            'best_confidence': self.best_confidence,
+            'first_seen': self.first_seen.isoformat(),
+            'last_seen': self.last_seen.isoformat(),
+            'sightings': self.sightings,
+            'discovery': self.discovery.to_dict() if self.discovery else None,
+        }
+    
+    @classmethod
+    def from_dict(cls, data: dict) -> 'AnimalSighting':
+        return cls(
+            animal_id=data['animal_id'],
+            animal=data.get('animal') or {'id': data['animal_id']},
+            best_confidence=data.get('best_confidence', 0.0),
+            first_seen=as_utc(datetime.fromisoformat(data['first_seen'])),
+            last_seen=as_utc(datetime.fromisoformat(data['last_seen'])),
+            sightings=data.get('sightings', 0),
+            discovery=Discovery.from_dict(data['discovery']) if data.get('discovery') else None,
+        )
+
+
+@dataclass
+class SessionSummary:
+    """
+    Entity: Session Summary
+    Kept up to date frame by frame so ending a session or listing its
+    discoveries doesn't have to reload discoveries and animals.
+    """
+    total_discoveries: int = 0
+    animals: Dict[str, AnimalSighting] = field(default_factory=dict)
+    
+    def record_sighting(self, animal: 'Animal', confidence: float, seen_at: datetime) -> None:
+        """Register a confident recognition of `animal`"""
+        sighting = self.animals.get(animal.id)
+        if sighting is None:
+            # La ficha se serializa una sola vez por animal y sesión
+            sighting = self.animals[animal.id] = AnimalSighting(
+                animal_id=animal.id,
+                animal=animal.to_dict(),
+                best_confidence=confidence,
+                first_seen=seen_at,
+                last_seen=seen_at,
+            )
+        elif 'name' not in sighting.animal:
+            # Descubrimiento cargado al reconectar, aún sin la ficha del animal
+            sighting.animal = animal.to_dict()
+        sighting.sightings += 1
+        sighting.best_confidence = max(sighting.best_confidence, confidence)
+        sighting.last_seen = max(sighting.last_seen, seen_at)
+    
+    def record_discovery(self, discovery: Discovery) -> None:
+        """Attach a committed discovery to its animal's sighting"""
+        self.total_discoveries += 1
+        sighting = self.animals.get(discovery.animal_id)
+        if sighting is None:
+            sighting = self.animals[discovery.animal_id] = AnimalSighting(
+                animal_id=discovery.animal_id,
+                animal={'id': discovery.animal_id},
+                best_confidence=discovery.confidence,
+                first_seen=discovery.discovered_at,
+                last_seen=discovery.discovered_at,
+            )
+        if sighting.discovery is None:
+            sighting.discovery = discovery
+    
+    def has_discovered(self, animal_id: str) -> bool:
+        sighting = self.animals.get(animal_id)
+        return sighting is not None and sighting.discovery is not None
+    
+    def discovered(self) -> List[AnimalSighting]:
+        """Sightings with a discovery, in discovery order"""
+        return sorted(
+            (sighting for sighting in self.animals.values() if sighting.discovery),
+            key=lambda sighting: as_utc(sighting.discovery.discovered_at),
+        )
+    
+    @property
+    def unique_animals(self) -> int:
+        return sum(1 for sighting in self.animals.values() if sighting.discovery)
+    
+    def to_dict(self) -> dict:
+        return {
+            'total_discoveries': self.total_discoveries,
+            'unique_animals': self.unique_animals,
+            'animals': [sighting.to_dict() for sighting in self.animals.values()],
+        }
+    
+    @classmethod
+    def from_dict(cls, data: Optional[dict]) -> 'SessionSummary':
+        if not data:
+            return cls()
+        summary = cls(total_discoveries=data.get('total_discoveries', 0))
+        for item in data.get('animals', []):
+            sighting = AnimalSighting.from_dict(item)
+            summary.animals[sighting.animal_id] = sighting
+        return summary
 
 
 @dataclass
@@ -212,9 +361,10 @@ class UserSession:
     """
     id: str
     user_id: Optional[str]
-    started_at: datetime = field(default_factory=datetime.utcnow)
+    started_at: datetime = field(default_factory=utc_now)
     discoveries: List[Discovery] = field(default_factory=list)
     is_active: bool = True
+    summary: SessionSummary = field(default_factory=SessionSummary)
     
     @classmethod
     def create(cls, user_id: Optional[str] = None) -> 'UserSession':
@@ -227,15 +377,15 @@ class UserSession:
     def add_discovery(self, discovery: Discovery) -> None:
         """Add a discovery to the session"""
         self.discoveries.append(discovery)
+        self.summary.record_discovery(discovery)
     
     def get_unique_animals_count(self) -> int:
         """Get count of unique animals discovered"""
-        unique_animals = set(d.animal_id for d in self.discoveries)
-        return len(unique_animals)
+        return self.summary.unique_animals
     
     def has_discovered(self, animal_id: str) -> bool:
         """Check if an animal has already been discovered in this session"""
-        return any(d.animal_id == animal_id for d in self.discoveries)
+        return self.summary.has_discovered(animal_id)
     
     def end_session(self) -> None:
         """End the session"""
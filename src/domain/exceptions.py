@@ -38,6 +38,20 @@ class StorageException(DomainException):
     pass
 
 
+class InvalidCursorException(DomainException):
+    """Raised when a pagination cursor is malformed"""
+    def __init__(self, cursor: str):
+        self.cursor = cursor
+        super().__init__(f"Invalid pagination cursor: {cursor}")
+
+
 class ModelNotReadyException(DomainException):
     """Raised when the ML model is not ready"""
     pass
+
+
+class InferenceOverloadedException(RecognitionException):
+    """Raised when no inference slot frees up in time"""
+    def __init__(self, message: str = "Inference capacity exhausted", retry_after: int = 1):
+        self.retry_after = retry_after
+        super().__init__(message)
@@ -4,11 +4,14 @@ These are the contracts that the domain expects from the outside world.
 They define what the domain needs, not how it's implemented.
 """
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 import numpy as np
 
-from .entities import Animal, Discovery, RecognitionResult, UserSession
-from .value_objects import ImageFrame
+from .entities import Animal, Discovery, RecognitionResult, SessionSummary, UserSession
+from .value_objects import ImageFrame, Page, decode_cursor
+
+if TYPE_CHECKING:
+    from .services import AnimalLabelResolver
 
 
 class AnimalRepositoryPort(ABC):
@@ -33,8 +36,8 @@ class AnimalRepositoryPort(ABC):
         pass
     
     @abstractmethod
-    def search(self, query: str) -> List[Animal]:
-        """Search animals by name or description"""
+    def search(self, query: str, limit: Optional[int] = None) -> List[Animal]:
+        """Search animals by name or description, best matches first"""
         pass
     
     @abstractmethod
@@ -46,6 +49,54 @@ class AnimalRepositoryPort(ABC):
     def get_by_class(self, animal_class: str) -> List[Animal]:
         """Get animals by their taxonomic class"""
         pass
+    
+    def get_by_ids(self, animal_ids: Iterable[str]) -> Dict[str, Animal]:
+        """
+        Get several animals at once, keyed by id (unknown ids are left out).
+        Adapters backed by a database should override this with one query.
+        """
+        animals = {}
+        for animal_id in set(animal_ids):
+            animal = self.get_by_id(animal_id)
+            if animal:
+                animals[animal_id] = animal
+        return animals
+    
+    def get_by_name_or_alias(self, name: str) -> Optional[Animal]:
+        """
+        Get an animal by its name or one of its aliases (accent/case-insensitive).
+        Adapters with an alias index should override this.
+        """
+        return self.get_by_name(name)
+    
+    def get_label_resolver(self) -> 'AnimalLabelResolver':
+        """
+        Label resolution index over the whole catalog.
+        Adapters that cache the catalog should override this to share one index.
+        """
+        from .services import AnimalLabelResolver
+        return AnimalLabelResolver(self.get_all())
+    
+    def resolve_label(self, label: str, partial: bool = False) -> Optional[Animal]:
+        """Resolve a model label (or a name/alias) to a catalog animal"""
+        return self.get_label_resolver().resolve(label, partial=partial)
+    
+    def list_page(
+        self,
+        limit: int,
+        cursor: Optional[str] = None,
+        animal_class: Optional[str] = None,
+        endangered: bool = False,
+    ) -> Page:
+        """
+        One page of animals ordered by name, starting after `cursor`.
+        Adapters backed by a database should override this with a keyset query.
+        """
+        animals = self.get_by_class(animal_class) if animal_class else self.get_all()
+        if endangered:
+            animals = [animal for animal in animals if animal.is_endangered()]
+        animals = sorted(animals, key=lambda animal: animal.name)
+        return Page.from_sorted(animals, limit, key=lambda animal: (animal.name,), cursor=cursor)
 
 
 class DiscoveryRepositoryPort(ABC):
@@ -59,11 +110,34 @@ class DiscoveryRepositoryPort(ABC):
         """Save a discovery"""
         pass
     
+    def save_many(self, discoveries: List[Discovery]) -> List[Discovery]:
+        """
+        Save several discoveries at once; returns the ones actually saved.
+        Adapters that support bulk inserts should override this.
+        """
+        return [self.save(discovery) for discovery in discoveries]
+    
+    @abstractmethod
+    def update_thumbnail_url(self, discovery_id: str, thumbnail_url: str) -> None:
+        """Replace a discovery's thumbnail URL (e.g. once the upload finishes)"""
+        pass
+    
     @abstractmethod
     def get_by_session(self, session_id: str) -> List[Discovery]:
         """Get all discoveries for a session"""
         pass
     
+    def get_page_by_session(self, session_id: str, limit: int, cursor: Optional[str] = None) -> Page:
+        """
+        One page of a session's discoveries, newest first, starting after `cursor`.
+        Adapters backed by a database should override this with a keyset query.
+        """
+        discoveries = sorted(self.get_by_session(session_id), key=Discovery.cursor_key, reverse=True)
+        if cursor:
+            before = decode_cursor(cursor, 2)
+            discoveries = [d for d in discoveries if d.cursor_key() < before]
+        return Page.from_overflow(discoveries[:limit + 1], limit, key=Discovery.cursor_key)
+    
     @abstractmethod
     def get_by_user(self, user_id: str) -> List[Discovery]:
         """Get all discoveries for a user"""
@@ -97,8 +171,8 @@ class SessionRepositoryPort(ABC):
         pass
     
     @abstractmethod
-    def end_session(self, session_id: str) -> None:
-        """End a session"""
+    def end_session(self, session_id: str, summary: Optional[SessionSummary] = None) -> None:
+        """End a session, persisting its summary when given"""
         pass
 
 
@@ -116,6 +190,13 @@ class AnimalRecognitionPort(ABC):
         """
         pass
     
+    def recognize_batch(self, images: List[np.ndarray]) -> List[List[RecognitionResult]]:
+        """
+        Recognize animals in several images at once.
+        Adapters that support batched inference should override this.
+        """
+        return [self.recognize(image) for image in images]
+    
     @abstractmethod
     def preprocess_image(self, frame: ImageFrame) -> np.ndarray:
         """Preprocess an image frame for recognition"""
@@ -132,6 +213,28 @@ class AnimalRecognitionPort(ABC):
         pass
 
 
+class VideoFrameSamplerPort(ABC):
+    """
+    Port: Video Frame Sampler
+    Defines the contract for streaming frame extraction from video files.
+    """
+    
+    @abstractmethod
+    def get_duration(self, video_path: str) -> float:
+        """Get the video duration in seconds (0 if unknown)"""
+        pass
+    
+    @abstractmethod
+    def sample(self, video_path: str) -> Iterator[Tuple[float, np.ndarray]]:
+        """Yield (timestamp_seconds, image) pairs, one frame at a time"""
+        pass
+    
+    @abstractmethod
+    def encode_keyframe(self, image: np.ndarray, bounding_box: Optional[dict] = None) -> bytes:
+        """Encode a frame (optionally cropped to a box) as a compact JPEG"""
+        pass
+
+
 class ImageStoragePort(ABC):
     """
     Port: Image Storage Service
@@ -154,6 +257,32 @@ class ImageStoragePort(ABC):
         pass
 
 
+class ThumbnailPipelinePort(ABC):
+    """
+    Port: Thumbnail Pipeline
+    Creates and stores thumbnails off the frame path.
+    """
+    
+    @abstractmethod
+    def provisional_url(self, filename: str) -> str:
+        """URL to use for a thumbnail until its upload finishes"""
+        pass
+    
+    @abstractmethod
+    def submit(
+        self,
+        frame: ImageFrame,
+        filename: str,
+        bounding_box: Optional[dict] = None,
+        on_stored: Optional[Callable[[str], None]] = None,
+    ) -> None:
+        """
+        Queue cropping, encoding and upload of a thumbnail.
+        `on_stored` is called with the final URL from the worker.
+        """
+        pass
+
+
 class NotificationPort(ABC):
     """
     Port: Notification Service
@@ -185,6 +314,21 @@ class NotificationPort(ABC):
         pass
     
     @abstractmethod
-    async def send_detections(self, session_id: str, detections: List[dict]) -> None:
-        """Send detection boxes (bounding boxes) to a client for visualization"""
+    async def send_detections(
+        self,
+        session_id: str,
+        detections: List[dict],
+        timings: Optional[dict] = None,
+    ) -> None:
+        """
+        Send detection boxes (bounding boxes) to a client for visualization.
+        `timings` carries per-stage latencies when debug timings are enabled.
+        """
+        pass
+    
+    async def flush(self, session_id: str) -> None:
+        """
+        Deliver the notifications of the current frame.
+        Adapters that batch per-frame events should override this.
+        """
         pass
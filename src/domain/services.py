@@ -2,7 +2,10 @@
 Domain Services
 Business logic that doesn't naturally fit within an entity.
 """
-from typing import List, Optional
+import unicodedata
+from collections import deque
+from dataclasses import dataclass
+from typing import Callable, Deque, Dict, List, Optional, Tuple
 from .entities import Animal, Discovery, RecognitionResult, UserSession
 from .value_objects import ImageFrame, Confidence
 # Import OpenCV preprocessor for drawing boxes on thumbnails
@@ -12,9 +15,182 @@ from .ports import (
     DiscoveryRepositoryPort,
     AnimalRecognitionPort,
     ImageStoragePort,
+    ThumbnailPipelinePort,
 )
 
 
+# Model label -> probable catalog names (ordered candidates)
+MODEL_LABEL_CANDIDATES = {
+    'bird': ['Bird', 'Ave', 'Pájaro'],
+    'cats': ['Gato', 'Cats', 'Cat'],
+    'cow': ['Vaca', 'Cow'],
+    'deer': ['Venado', 'Deer'],
+    'dog': ['Perro', 'Dog'],
+    'elephant': ['Elefante', 'Elefante Africano', 'Elephant'],
+    'giraffe': ['Jirafa', 'Giraffa', 'Giraffe'],
+    'person': ['Persona', 'Person'],
+    'pig': ['Cerdo', 'Pig'],
+    'sheep': ['Oveja', 'Sheep'],
+}
+
+
+def fold_label(text: Optional[str]) -> str:
+    """Accent- and case-folded key for names and labels ('Pájaro ' -> 'pajaro')"""
+    decomposed = unicodedata.normalize('NFKD', text or '')
+    stripped = ''.join(ch for ch in decomposed if not unicodedata.combining(ch))
+    return ' '.join(stripped.casefold().split())
+
+
+class AnimalLabelResolver:
+    """
+    Domain Service: Label Resolution
+    Resolves model labels to catalog animals from a single catalog pass.
+    
+    Names and aliases are indexed once by their folded key (names win over
+    aliases); each label's resolution is memoized, so a model class costs a
+    dict lookup after its first frame.
+    """
+    
+    # Límite de etiquetas memorizadas (las clases del modelo son pocas)
+    MAX_MEMOIZED = 4096
+    
+    def __init__(self, animals: List[Animal]):
+        self._animals: Dict[str, Animal] = {}
+        self._by_key: Dict[str, str] = {}
+        alias_keys = []
+        for animal in animals:
+            self._animals[animal.id] = animal
+            self._by_key.setdefault(fold_label(animal.name), animal.id)
+            alias_keys.extend((fold_label(alias), animal.id) for alias in animal.aliases if alias)
+        for key, animal_id in alias_keys:
+            self._by_key.setdefault(key, animal_id)
+        self._by_key.pop('', None)
+        # Orden de la búsqueda parcial: nombres y alias de cada animal, por catálogo
+        self._partial_keys: List[Tuple[str, str]] = [
+            (key, animal.id)
+            for animal in animals
+            for key in [fold_label(animal.name)] + [fold_label(a) for a in animal.aliases if a]
+            if key
+        ]
+        self._memo: Dict[Tuple[str, bool], Optional[str]] = {}
+    
+    def __len__(self) -> int:
+        return len(self._animals)
+    
+    def resolve(self, label: str, partial: bool = False) -> Optional[Animal]:
+        """
+        Try the known candidates for a label, then the label itself.
+        With `partial`, fall back to the first name or alias that contains
+        the label or is contained in it.
+        """
+        # Memorizado por la etiqueta tal cual llega: sin normalizar de nuevo
+        memo_key = (label, partial)
+        try:
+            animal_id = self._memo[memo_key]
+        except KeyError:
+            key = fold_label(label)
+            animal_id = self._lookup(key, partial) if key else None
+            if len(self._memo) < self.MAX_MEMOIZED:
+                self._memo[memo_key] = animal_id
+        return self._animals.get(animal_id) if animal_id else None
+    
+    def _lookup(self, key: str, partial: bool) -> Optional[str]:
+        for candidate in MODEL_LABEL_CANDIDATES.get(key, []):
+            animal_id = self._by_key.get(fold_label(candidate))
+            if animal_id:
+                return animal_id
+        animal_id = self._by_key.get(key)
+        if animal_id or not partial:
+            return animal_id
+        for name_key, animal_id in self._partial_keys:
+            if key in name_key or name_key in key:
+                return animal_id
+        return None
+
+
+@dataclass(frozen=True)
+class VoteDecision:
+    """Outcome of a temporal vote: the agreed label and its best frame in the window"""
+    label: str
+    votes: int
+    score: float
+    result: RecognitionResult
+    frame: ImageFrame
+
+
+class TemporalVoteAggregator:
+    """
+    Domain Service: Temporal Voting
+    Keeps the last `window` frames of one session. A label is agreed on when
+    it appears in at least `min_votes` of them and has the highest
+    confidence-weighted score; frames without a confident detection vote
+    for nothing. Only the best frame of each label in the window is kept.
+    """
+    
+    def __init__(self, window: int = 5, min_votes: int = 3):
+        self._window = max(1, window)
+        self._min_votes = max(1, min(min_votes, self._window))
+        # La ventana guarda solo (etiqueta, confianza); los frames decodificados pesan
+        self._frames: Deque[Optional[Tuple[str, float]]] = deque(maxlen=self._window)
+        # Mejor (resultado, frame) de cada etiqueta presente en la ventana
+        self._best: Dict[str, Tuple[RecognitionResult, Optional[ImageFrame]]] = {}
+    
+    @property
+    def window(self) -> int:
+        return self._window
+    
+    @property
+    def min_votes(self) -> int:
+        return self._min_votes
+    
+    def observe(self, result: Optional[RecognitionResult], frame: Optional[ImageFrame] = None) -> Optional[VoteDecision]:
+        """Add one frame's best detection (or None) and return the decision, if any"""
+        if result is None:
+            self._frames.append(None)
+        else:
+            self._frames.append((result.animal_name, result.confidence))
+            best = self._best.get(result.animal_name)
+            if best is None or result.confidence > best[0].confidence:
+                self._best[result.animal_name] = (result, frame)
+        
+        votes = {}
+        scores = {}
+        for entry in self._frames:
+            if entry is None:
+                continue
+            label, confidence = entry
+            votes[label] = votes.get(label, 0) + 1
+            scores[label] = scores.get(label, 0.0) + confidence
+        
+        # Las etiquetas que salieron de la ventana sueltan su frame
+        for label in [label for label in self._best if label not in votes]:
+            del self._best[label]
+        
+        if not scores:
+            return None
+        
+        label = max(scores, key=scores.get)
+        if votes[label] < self._min_votes:
+            return None
+        
+        result, frame = self._best[label]
+        return VoteDecision(
+            label=label,
+            votes=votes[label],
+            score=scores[label],
+            result=result,
+            frame=frame,
+        )
+    
+    def forget(self, label: str) -> None:
+        """Drop a label's votes once it has been committed"""
+        self._frames = deque(
+            (entry if entry is None or entry[0] != label else None for entry in self._frames),
+            maxlen=self._window,
+        )
+        self._best.pop(label, None)
+
+
 class AnimalRecognitionService:
     """
     Domain Service: Animal Recognition
@@ -27,30 +203,40 @@ class AnimalRecognitionService:
         animal_repository: AnimalRepositoryPort,
         discovery_repository: DiscoveryRepositoryPort,
         image_storage: ImageStoragePort,
-        confidence_threshold: float = 0.7
+        confidence_threshold: float = 0.7,
+        thumbnail_pipeline: Optional[ThumbnailPipelinePort] = None,
+        on_thumbnail_stored: Optional[Callable[[Discovery], None]] = None,
     ):
         self._recognition = recognition_port
         self._animal_repo = animal_repository
         self._discovery_repo = discovery_repository
         self._image_storage = image_storage
         self._confidence_threshold = confidence_threshold
+        self._thumbnail_pipeline = thumbnail_pipeline
+        self._on_thumbnail_stored = on_thumbnail_stored
     
     def process_frame(
         self, 
         frame: ImageFrame, 
-        session: UserSession
+        session: UserSession,
+        results: Optional[List[RecognitionResult]] = None,
+        aggregator: Optional[TemporalVoteAggregator] = None,
     ) -> Optional[tuple]:
         """
         Process a camera frame and return recognition results.
         Returns tuple of (RecognitionResult, Animal, Discovery) if successful.
+        Pass `results` when the frame was already recognized to avoid a
+        second inference. With an `aggregator`, a discovery is only committed
+        once the session's recent frames agree on the animal.
         """
-        # Preprocess the image
-        processed_image = self._recognition.preprocess_image(frame)
-        
-        # Run recognition
-        results = self._recognition.recognize(processed_image)
+        if results is None:
+            # Preprocess the image (cached on the frame) and run recognition
+            processed_image = self._recognition.preprocess_image(frame)
+            results = self._recognition.recognize(processed_image)
         
         if not results:
+            if aggregator:
+                aggregator.observe(None)
             return None
         
         # Get the best result
@@ -59,27 +245,46 @@ class AnimalRecognitionService:
         # Check confidence threshold
         confidence = Confidence(best_result.confidence)
         if not confidence.meets_threshold(self._confidence_threshold):
+            if aggregator:
+                aggregator.observe(None)
             return None
         
+        decision = aggregator.observe(best_result, frame) if aggregator else None
+        
         # Get animal information
-        animal = self._animal_repo.get_by_name(best_result.animal_name)
+        animal = self._animal_repo.resolve_label(best_result.animal_name)
         if not animal:
             return None
         
+        # Resumen incremental de la sesión (mejor confianza, primera/última vez)
+        session.summary.record_sighting(animal, best_result.confidence, best_result.timestamp)
+        
         # Check if already discovered in this session
         if session.has_discovered(animal.id):
             # Return result but no new discovery
             return (best_result, animal, None)
         
+        # Commit the best-scoring frame of the window, only once frames agree
+        committed_result, committed_frame = best_result, frame
+        if aggregator:
+            if decision is None or decision.label != best_result.animal_name:
+                return (best_result, animal, None)
+            committed_result, committed_frame = decision.result, decision.frame
+            aggregator.forget(decision.label)
+        
         # Create thumbnail and save discovery
-        thumbnail_filename = f"{session.id}_{animal.id}_{best_result.timestamp.timestamp()}.jpg"
-        thumbnail_url = self._image_storage.save_thumbnail(frame, thumbnail_filename)
+        thumbnail_filename = f"{session.id}_{animal.id}_{committed_result.timestamp.timestamp()}.jpg"
+        if self._thumbnail_pipeline:
+            # Provisional URL now; crop/encode/upload happen in the background
+            thumbnail_url = self._thumbnail_pipeline.provisional_url(thumbnail_filename)
+        else:
+            thumbnail_url = self._image_storage.save_thumbnail(committed_frame, thumbnail_filename)
         
         discovery = Discovery.create(
             session_id=session.id,
             animal_id=animal.id,
             thumbnail_url=thumbnail_url,
-            confidence=best_result.confidence,
+            confidence=committed_result.confidence,
             user_id=session.user_id,
         )
         
@@ -87,8 +292,24 @@ class AnimalRecognitionService:
         saved_discovery = self._discovery_repo.save(discovery)
         session.add_discovery(saved_discovery)
         
+        if self._thumbnail_pipeline:
+            self._thumbnail_pipeline.submit(
+                committed_frame,
+                thumbnail_filename,
+                committed_result.bounding_box,
+                on_stored=lambda url: self._thumbnail_stored(saved_discovery, url),
+            )
+        
         return (best_result, animal, saved_discovery)
     
+    def _thumbnail_stored(self, discovery: Discovery, url: str) -> None:
+        """Called from the thumbnail worker once the upload finished"""
+        if url != discovery.thumbnail_url:
+            discovery.thumbnail_url = url
+            self._discovery_repo.update_thumbnail_url(discovery.id, url)
+        if self._on_thumbnail_stored:
+            self._on_thumbnail_stored(discovery)
+    
     def get_session_discoveries(self, session_id: str) -> List[dict]:
         """Get all discoveries for a session with animal info"""
         discoveries = self._discovery_repo.get_by_session(session_id)
@@ -125,9 +346,9 @@ class AnimalInfoService:
             'random_fun_fact': animal.get_random_fun_fact(),
         }
     
-    def search_animals(self, query: str) -> List[dict]:
+    def search_animals(self, query: str, limit: Optional[int] = None) -> List[dict]:
         """Search for animals by name or description"""
-        animals = self._animal_repo.search(query)
+        animals = self._animal_repo.search(query, limit)
         return [animal.to_dict() for animal in animals]
     
     def get_animals_by_class(self, animal_class: str) -> List[dict]:
@@ -135,6 +356,17 @@ class AnimalInfoService:
         animals = self._animal_repo.get_by_class(animal_class)
         return [animal.to_dict() for animal in animals]
     
+    def list_animals(
+        self,
+        limit: int,
+        cursor: Optional[str] = None,
+        animal_class: Optional[str] = None,
+        endangered: bool = False,
+    ) -> dict:
+        """One page of animals ordered by name, with the cursor of the next one"""
+        page = self._animal_repo.list_page(limit, cursor, animal_class=animal_class, endangered=endangered)
+        return page.to_dict()
+    
     def get_endangered_animals(self) -> List[dict]:
         """Get all endangered animals"""
         all_animals = self._animal_repo.get_all()
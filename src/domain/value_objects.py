@@ -2,9 +2,73 @@
 Domain Value Objects
 Immutable objects that represent concepts in our domain.
 """
-from dataclasses import dataclass
-from typing import Optional, Tuple
+from dataclasses import dataclass, field
+from typing import Any, Callable, Optional, Sequence, Tuple
 import base64
+import bisect
+import binascii
+import json
+
+from .exceptions import InvalidCursorException
+
+
+# Marcadores JPEG Start-Of-Frame (excluye DHT=C4, JPG=C8, DAC=CC)
+_JPEG_SOF_MARKERS = frozenset(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+
+# Marcadores JPEG sin longitud: TEM, RSTn, SOI, EOI
+_JPEG_STANDALONE_MARKERS = frozenset([0x01, *range(0xD0, 0xDA)])
+
+_PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+
+
+def _probe_jpeg(view: memoryview) -> Optional[Tuple[int, int]]:
+    size = len(view)
+    offset = 2
+    while offset + 4 <= size:
+        if view[offset] != 0xFF:
+            return None
+        marker = view[offset + 1]
+        if marker == 0xFF:
+            # Byte de relleno
+            offset += 1
+            continue
+        if marker in _JPEG_STANDALONE_MARKERS:
+            offset += 2
+            continue
+
+        length = (view[offset + 2] << 8) | view[offset + 3]
+        if marker in _JPEG_SOF_MARKERS:
+            if offset + 9 > size:
+                return None
+            height = (view[offset + 5] << 8) | view[offset + 6]
+            width = (view[offset + 7] << 8) | view[offset + 8]
+            return (width, height) if width and height else None
+        if marker == 0xDA:
+            # Start of scan sin SOF previo: encabezado inválido
+            return None
+        offset += 2 + length
+    return None
+
+
+def probe_image_size(data) -> Optional[Tuple[str, int, int]]:
+    """
+    Read (format, width, height) from a JPEG or PNG header without
+    decoding pixels. Returns None for other formats or truncated headers.
+    """
+    if isinstance(data, str):
+        return None
+
+    view = memoryview(data)
+    if len(view) >= 4 and view[0] == 0xFF and view[1] == 0xD8:
+        dimensions = _probe_jpeg(view)
+        return ('jpeg', *dimensions) if dimensions else None
+
+    if len(view) >= 24 and bytes(view[:8]) == _PNG_SIGNATURE:
+        width = int.from_bytes(view[16:20], 'big')
+        height = int.from_bytes(view[20:24], 'big')
+        return ('png', width, height) if width and height else None
+
+    return None
 
 
 @dataclass(frozen=True)
@@ -12,15 +76,30 @@ class ImageFrame:
     """
     Value Object: Image Frame
     Represents a single frame from the camera.
+    
+    Width/height are read from the image header when not given. The decoded
+    pixels and the encoded thumbnail are computed at most once per frame and
+    cached on the instance (they don't take part in equality).
     """
     data: bytes
-    width: int
-    height: int
+    width: int = 0
+    height: int = 0
     channels: int = 3
     format: str = "jpeg"
+    thumbnail: Optional[bytes] = field(default=None, repr=False, compare=False)
+    _decoded: Any = field(default=None, init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        if not self.width or not self.height:
+            probed = probe_image_size(self.data)
+            if probed:
+                image_format, width, height = probed
+                object.__setattr__(self, 'format', image_format)
+                object.__setattr__(self, 'width', width)
+                object.__setattr__(self, 'height', height)
     
     @classmethod
-    def from_base64(cls, base64_string: str, width: int = 640, height: int = 480) -> 'ImageFrame':
+    def from_base64(cls, base64_string: str, width: int = 0, height: int = 0) -> 'ImageFrame':
         """Create ImageFrame from base64 encoded string"""
         # Remove data URL prefix if present
         if ',' in base64_string:
@@ -29,6 +108,31 @@ class ImageFrame:
         data = base64.b64decode(base64_string)
         return cls(data=data, width=width, height=height)
     
+    @classmethod
+    def from_buffer(cls, buffer, width: int = 0, height: int = 0) -> 'ImageFrame':
+        """
+        Create ImageFrame from an encoded image held in a bytes-like buffer
+        (bytes, bytearray or memoryview). The buffer is not copied.
+        """
+        return cls(data=buffer, width=width, height=height)
+    
+    @property
+    def decoded(self) -> Any:
+        """Cached decoded pixels, or None if the frame hasn't been decoded yet"""
+        return self._decoded
+    
+    def get_decoded(self, decoder: Callable[['ImageFrame'], Any]) -> Any:
+        """Decode once with `decoder` and reuse the result afterwards"""
+        if self._decoded is None:
+            object.__setattr__(self, '_decoded', decoder(self))
+        return self._decoded
+    
+    def get_thumbnail(self, encoder: Callable[['ImageFrame'], bytes]) -> bytes:
+        """Encode the thumbnail once with `encoder` and reuse it afterwards"""
+        if self.thumbnail is None:
+            object.__setattr__(self, 'thumbnail', encoder(self))
+        return self.thumbnail
+    
     def to_base64(self) -> str:
         """Convert to base64 string"""
         return base64.b64encode(self.data).decode('utf-8')
@@ -138,5 +242,58 @@ class GeoLocation:
         }
 
 
-# Fix the Optional import
-from typing import Optional
+def encode_cursor(key: tuple) -> str:
+    """Opaque cursor for a keyset sort key (URL-safe)"""
+    raw = json.dumps(list(key), separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).rstrip(b'=').decode('ascii')
+
+
+def decode_cursor(cursor: str, size: int) -> tuple:
+    """Sort key from a cursor made by encode_cursor; `size` is the key length"""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        key = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+    except (ValueError, UnicodeError, binascii.Error):
+        raise InvalidCursorException(cursor)
+    if not isinstance(key, list) or len(key) != size or not all(isinstance(k, str) for k in key):
+        raise InvalidCursorException(cursor)
+    return tuple(key)
+
+
+@dataclass(frozen=True)
+class Page:
+    """
+    Value Object: Keyset Page
+    One page of a listing; `next_cursor` is None on the last page.
+    """
+    items: Tuple[Any, ...]
+    next_cursor: Optional[str] = None
+    
+    @classmethod
+    def from_overflow(cls, items: Sequence, limit: int, key: Callable[[Any], tuple]) -> 'Page':
+        """Page from up to `limit + 1` rows fetched after the cursor"""
+        if len(items) > limit:
+            items = items[:limit]
+            return cls(tuple(items), encode_cursor(key(items[-1])))
+        return cls(tuple(items))
+    
+    @classmethod
+    def from_sorted(
+        cls,
+        items: Sequence,
+        limit: int,
+        key: Callable[[Any], tuple],
+        cursor: Optional[str] = None,
+        key_size: int = 1,
+    ) -> 'Page':
+        """Page of an in-memory sequence already sorted by `key`"""
+        start = 0
+        if cursor:
+            start = bisect.bisect_right(items, decode_cursor(cursor, key_size), key=key)
+        return cls.from_overflow(items[start:start + limit + 1], limit, key)
+    
+    def to_dict(self, serialize: Callable[[Any], dict] = lambda item: item.to_dict()) -> dict:
+        return {
+            'results': [serialize(item) for item in self.items],
+            'next': self.next_cursor,
+        }
@@ -5,3 +5,10 @@ class InfrastructureConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'src.infrastructure'
     verbose_name = 'Infrastructure Layer'
+    
+    def ready(self):
+        from .observability.tracing import configure_tracing_from_settings
+        from .persistence.catalog import connect_catalog_signals
+        
+        configure_tracing_from_settings()
+        connect_catalog_signals()
@@ -0,0 +1,18 @@
+# Generated migration
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('infrastructure', '0005_add_last_recognition_confidence'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='sessionmodel',
+            name='summary',
+            field=models.JSONField(blank=True, default=dict, help_text='Resumen incremental de la sesión'),
+        ),
+    ]
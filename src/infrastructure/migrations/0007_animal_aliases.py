@@ -0,0 +1,89 @@
+# Generated migration
+
+import unicodedata
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def _normalize(text):
+    # Copia congelada de src.domain.services.fold_label
+    decomposed = unicodedata.normalize('NFKD', text or '')
+    stripped = ''.join(ch for ch in decomposed if not unicodedata.combining(ch))
+    return ' '.join(stripped.casefold().split())
+
+
+def copy_aliases_to_table(apps, schema_editor):
+    AnimalModel = apps.get_model('infrastructure', 'AnimalModel')
+    AnimalAliasModel = apps.get_model('infrastructure', 'AnimalAliasModel')
+
+    animals = list(AnimalModel.objects.order_by('name').only('id', 'name', 'aliases'))
+    taken = set()
+    rows = []
+
+    def add(animal, alias, language, is_name):
+        alias = (alias or '').strip()[:100]
+        normalized = _normalize(alias)
+        # Unicidad por forma normalizada: los nombres ganan a los alias
+        if not normalized or normalized in taken:
+            return
+        taken.add(normalized)
+        rows.append(AnimalAliasModel(
+            animal_id=animal.id,
+            alias=alias,
+            normalized=normalized,
+            language=language,
+            is_name=is_name,
+        ))
+
+    for animal in animals:
+        add(animal, animal.name, 'es', True)
+    for animal in animals:
+        for alias in animal.aliases or []:
+            if isinstance(alias, str):
+                add(animal, alias, '', False)
+
+    AnimalAliasModel.objects.bulk_create(rows, batch_size=500)
+
+
+def copy_aliases_to_json(apps, schema_editor):
+    AnimalModel = apps.get_model('infrastructure', 'AnimalModel')
+    AnimalAliasModel = apps.get_model('infrastructure', 'AnimalAliasModel')
+
+    aliases = {}
+    for row in AnimalAliasModel.objects.filter(is_name=False).order_by('id'):
+        aliases.setdefault(row.animal_id, []).append(row.alias)
+    for animal_id, values in aliases.items():
+        AnimalModel.objects.filter(id=animal_id).update(aliases=values)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('infrastructure', '0006_session_summary'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AnimalAliasModel',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('alias', models.CharField(max_length=100)),
+                ('normalized', models.CharField(max_length=100, unique=True)),
+                ('language', models.CharField(blank=True, default='', max_length=8)),
+                ('is_name', models.BooleanField(default=False, help_text='Fila del nombre canónico del animal')),
+                ('animal', models.ForeignKey(
+                    on_delete=django.db.models.deletion.CASCADE,
+                    related_name='alias_entries',
+                    to='infrastructure.animalmodel',
+                )),
+            ],
+            options={
+                'verbose_name': 'Alias',
+                'verbose_name_plural': 'Alias',
+                'db_table': 'animal_aliases',
+                'ordering': ['animal', '-is_name', 'id'],
+            },
+        ),
+        migrations.RunPython(copy_aliases_to_table, copy_aliases_to_json),
+    ]
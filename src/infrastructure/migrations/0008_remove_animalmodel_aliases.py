@@ -0,0 +1,19 @@
+# Generated migration
+# Separada de 0007: en PostgreSQL no se puede alterar `animals` en la misma
+# transacción que insertó filas con FK hacia ella (pending trigger events)
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('infrastructure', '0007_animal_aliases'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='animalmodel',
+            name='aliases',
+        ),
+    ]
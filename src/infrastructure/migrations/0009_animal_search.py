@@ -0,0 +1,71 @@
+# Generated migration
+# Solo PostgreSQL: columna de búsqueda de texto completo e índices trigram.
+# En otros motores no hace nada y la búsqueda usa el ORM (icontains).
+
+import logging
+
+from django.db import migrations, transaction
+
+logger = logging.getLogger(__name__)
+
+FORWARD_SQL = [
+    "CREATE EXTENSION IF NOT EXISTS unaccent",
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    # unaccent() no es IMMUTABLE; la envoltura con diccionario fijo sí puede
+    # usarse en columnas generadas e índices
+    """
+    CREATE OR REPLACE FUNCTION pokedex_unaccent(text) RETURNS text AS $$
+        SELECT public.unaccent('public.unaccent'::regdictionary, coalesce($1, ''))
+    $$ LANGUAGE sql IMMUTABLE PARALLEL SAFE
+    """,
+    """
+    ALTER TABLE animals ADD COLUMN search_vector tsvector GENERATED ALWAYS AS (
+        setweight(to_tsvector('spanish'::regconfig, pokedex_unaccent(name)), 'A') ||
+        setweight(to_tsvector('spanish'::regconfig, pokedex_unaccent(scientific_name)), 'B') ||
+        setweight(to_tsvector('spanish'::regconfig, pokedex_unaccent(description)), 'C')
+    ) STORED
+    """,
+    "CREATE INDEX animals_search_vector_gin ON animals USING gin (search_vector)",
+    "CREATE INDEX animals_name_trgm ON animals USING gin (pokedex_unaccent(lower(name)) gin_trgm_ops)",
+    "CREATE INDEX animal_aliases_normalized_trgm ON animal_aliases USING gin (normalized gin_trgm_ops)",
+]
+
+REVERSE_SQL = [
+    "DROP INDEX IF EXISTS animal_aliases_normalized_trgm",
+    "DROP INDEX IF EXISTS animals_name_trgm",
+    "DROP INDEX IF EXISTS animals_search_vector_gin",
+    "ALTER TABLE animals DROP COLUMN IF EXISTS search_vector",
+    "DROP FUNCTION IF EXISTS pokedex_unaccent(text)",
+]
+
+
+def _run(schema_editor, statements):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    try:
+        # Punto de guardado: sin permisos para CREATE EXTENSION la migración
+        # se completa igual y la búsqueda sigue por el ORM
+        with transaction.atomic(using=schema_editor.connection.alias):
+            for statement in statements:
+                schema_editor.execute(statement)
+    except Exception as e:
+        logger.warning(f"⚠️ Búsqueda de texto completo no instalada: {e}")
+
+
+def create_search(apps, schema_editor):
+    _run(schema_editor, FORWARD_SQL)
+
+
+def drop_search(apps, schema_editor):
+    _run(schema_editor, REVERSE_SQL)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('infrastructure', '0008_remove_animalmodel_aliases'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search, drop_search),
+    ]
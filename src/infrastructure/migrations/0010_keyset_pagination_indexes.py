@@ -0,0 +1,25 @@
+# Generated migration
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('infrastructure', '0009_animal_search'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='animalmodel',
+            index=models.Index(fields=['animal_class', 'name'], name='animals_class_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='animalmodel',
+            index=models.Index(fields=['conservation_status', 'name'], name='animals_status_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='discoverymodel',
+            index=models.Index(fields=['session', 'discovered_at', 'id'], name='discoveries_session_keyset_idx'),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated migration
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('infrastructure', '0010_keyset_pagination_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='discoverymodel',
+            name='discovered_at',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+    ]
@@ -1,4 +1,24 @@
 """ML Package"""
-from .recognition import YOLOAnimalRecognition, TensorFlowAnimalRecognition, OpenCVPreprocessor
+from .recognition import (
+    YOLOAnimalRecognition,
+    TensorFlowAnimalRecognition,
+    OpenCVPreprocessor,
+    get_recognition_backend,
+)
+from .concurrency import InferenceAdmissionController, get_inference_controller
+from .load_control import LoadController, get_load_controller
+from .remote import RemoteAnimalRecognition
+from .video import OpenCVVideoSampler
 
-__all__ = ['YOLOAnimalRecognition', 'TensorFlowAnimalRecognition', 'OpenCVPreprocessor']
+__all__ = [
+    'YOLOAnimalRecognition',
+    'TensorFlowAnimalRecognition',
+    'OpenCVPreprocessor',
+    'get_recognition_backend',
+    'InferenceAdmissionController',
+    'get_inference_controller',
+    'LoadController',
+    'get_load_controller',
+    'RemoteAnimalRecognition',
+    'OpenCVVideoSampler',
+]
@@ -0,0 +1,186 @@
+"""
+ML Service - Frame Buffer Pool
+Reusable NumPy buffers for the streaming inference path.
+
+A 5 fps por sesión, cada frame asignaba un lienzo letterbox y un tensor
+float32 nuevos (~5 MB por frame a 640x640). Aquí esos buffers se toman de
+un pool por proceso, indexado por forma, y vuelven al pool después de la
+inferencia.
+"""
+import math
+import threading
+from collections import defaultdict
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+# Color de relleno del letterbox (el mismo que usa ultralytics)
+LETTERBOX_FILL = 114
+
+
+@dataclass(frozen=True)
+class LetterboxTransform:
+    """Scale and padding applied to one image; maps boxes back to its coordinates"""
+    scale: float
+    pad_x: int
+    pad_y: int
+    width: int
+    height: int
+
+    def to_image(self, x1: float, y1: float, x2: float, y2: float) -> Tuple[int, int, int, int]:
+        """Convert a box from tensor coordinates to image coordinates (clipped)"""
+        def clip(value: float, limit: int) -> int:
+            return int(min(max(value, 0), limit))
+
+        return (
+            clip((x1 - self.pad_x) / self.scale, self.width),
+            clip((y1 - self.pad_y) / self.scale, self.height),
+            clip((x2 - self.pad_x) / self.scale, self.width),
+            clip((y2 - self.pad_y) / self.scale, self.height),
+        )
+
+
+class FrameBufferPool:
+    """
+    Thread-safe pool of NumPy arrays keyed by (shape, dtype).
+    At most `max_per_shape` free buffers are kept per key; extra releases
+    are dropped so an unusual resolution can't pin memory forever.
+    """
+
+    def __init__(self, max_per_shape: int = 4):
+        self._max_per_shape = max(1, max_per_shape)
+        self._free: Dict[tuple, List[np.ndarray]] = defaultdict(list)
+        self._lock = threading.Lock()
+        self._allocated = 0
+        self._reused = 0
+
+    def acquire(self, shape: Tuple[int, ...], dtype=np.uint8) -> np.ndarray:
+        """Take a buffer of the given shape (contents are undefined)"""
+        key = (tuple(shape), np.dtype(dtype).str)
+        with self._lock:
+            free = self._free.get(key)
+            if free:
+                self._reused += 1
+                return free.pop()
+            self._allocated += 1
+        return np.empty(shape, dtype=dtype)
+
+    def release(self, buffer: np.ndarray) -> None:
+        """Return a buffer to the pool"""
+        key = (buffer.shape, buffer.dtype.str)
+        with self._lock:
+            free = self._free[key]
+            if len(free) < self._max_per_shape:
+                free.append(buffer)
+
+    @contextmanager
+    def borrow(self, shape: Tuple[int, ...], dtype=np.uint8) -> Iterator[np.ndarray]:
+        buffer = self.acquire(shape, dtype)
+        try:
+            yield buffer
+        finally:
+            self.release(buffer)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                'allocated': self._allocated,
+                'reused': self._reused,
+                'free': sum(len(free) for free in self._free.values()),
+                'shapes': len(self._free),
+            }
+
+
+def letterbox_shape(height: int, width: int, size: int = 640, stride: int = 32) -> Tuple[int, int]:
+    """Smallest stride-aligned (height, width) canvas that fits the image scaled to `size`"""
+    scale = size / max(height, width)
+    new_h = max(1, round(height * scale))
+    new_w = max(1, round(width * scale))
+    return (
+        int(math.ceil(new_h / stride) * stride),
+        int(math.ceil(new_w / stride) * stride),
+    )
+
+
+def letterbox_into(image: np.ndarray, canvas: np.ndarray, size: int = 640) -> LetterboxTransform:
+    """Resize `image` into the centre of `canvas` and fill only the borders"""
+    import cv2
+
+    height, width = image.shape[:2]
+    canvas_h, canvas_w = canvas.shape[:2]
+    scale = min(size / max(height, width), canvas_h / height, canvas_w / width)
+    new_h = min(canvas_h, max(1, round(height * scale)))
+    new_w = min(canvas_w, max(1, round(width * scale)))
+    pad_y = (canvas_h - new_h) // 2
+    pad_x = (canvas_w - new_w) // 2
+
+    roi = canvas[pad_y:pad_y + new_h, pad_x:pad_x + new_w]
+    if (new_h, new_w) == (height, width):
+        roi[...] = image
+    else:
+        cv2.resize(image, (new_w, new_h), dst=roi, interpolation=cv2.INTER_LINEAR)
+
+    canvas[:pad_y] = LETTERBOX_FILL
+    canvas[pad_y + new_h:] = LETTERBOX_FILL
+    canvas[pad_y:pad_y + new_h, :pad_x] = LETTERBOX_FILL
+    canvas[pad_y:pad_y + new_h, pad_x + new_w:] = LETTERBOX_FILL
+
+    return LetterboxTransform(scale=scale, pad_x=pad_x, pad_y=pad_y, width=width, height=height)
+
+
+def to_tensor_into(canvas: np.ndarray, out: np.ndarray) -> np.ndarray:
+    """BGR HWC uint8 -> RGB CHW float32 in [0, 1], written into `out`"""
+    out[...] = canvas[..., ::-1].transpose(2, 0, 1)
+    out *= np.float32(1.0 / 255.0)
+    return out
+
+
+@contextmanager
+def pooled_batch_tensor(
+    images: List[np.ndarray],
+    pool: 'FrameBufferPool',
+    size: int = 640,
+    stride: int = 32,
+) -> Iterator[Tuple[np.ndarray, List[LetterboxTransform]]]:
+    """
+    Letterbox a batch into one pooled (N, 3, H, W) float32 tensor.
+    Images sharing a letterbox shape use the tight canvas; mixed shapes use
+    a square `size` canvas. Buffers return to the pool on exit.
+    """
+    shapes = {letterbox_shape(*image.shape[:2], size=size, stride=stride) for image in images}
+    canvas_shape = shapes.pop() if len(shapes) == 1 else (size, size)
+
+    tensor = pool.acquire((len(images), 3, *canvas_shape), np.float32)
+    canvas = pool.acquire((*canvas_shape, 3), np.uint8)
+    try:
+        transforms = []
+        for index, image in enumerate(images):
+            transforms.append(letterbox_into(image, canvas, size))
+            to_tensor_into(canvas, tensor[index])
+        pool.release(canvas)
+        canvas = None
+        yield tensor, transforms
+    finally:
+        if canvas is not None:
+            pool.release(canvas)
+        pool.release(tensor)
+
+
+_pool_instance: Optional[FrameBufferPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_frame_buffer_pool() -> FrameBufferPool:
+    """Get the per-process frame buffer pool (singleton pattern)"""
+    global _pool_instance
+    if _pool_instance is None:
+        with _pool_lock:
+            if _pool_instance is None:
+                from django.conf import settings
+
+                _pool_instance = FrameBufferPool(
+                    max_per_shape=getattr(settings, 'INFERENCE_BUFFER_POOL_SIZE', 4),
+                )
+    return _pool_instance
@@ -0,0 +1,170 @@
+"""
+Inference Concurrency Control
+Bounds how many synchronous inferences run at once in a worker process.
+
+Cada llamada a PyTorch abre sus propios hilos intra-op; si todos los hilos
+de gunicorn/daphne entran al modelo a la vez la CPU queda sobresuscrita.
+El controlador admite como máximo `cores // threads_per_inference` llamadas
+simultáneas y el resto espera en cola hasta `queue_timeout` segundos.
+"""
+import os
+import time
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Optional
+
+from src.domain.exceptions import InferenceOverloadedException
+
+logger = logging.getLogger(__name__)
+
+
+def available_cpu_count() -> int:
+    """CPU cores usable by this process (respects container affinity)"""
+    try:
+        return len(os.sched_getaffinity(0)) or 1
+    except (AttributeError, OSError):
+        return os.cpu_count() or 1
+
+
+_threads_configured = False
+_threads_lock = threading.Lock()
+
+
+def configure_inference_threads(threads_per_inference: int) -> None:
+    """
+    Fija los hilos intra-op de PyTorch/OpenCV UNA SOLA VEZ por proceso.
+    Debe llamarse al inicializar el backend, antes de la primera inferencia.
+    """
+    global _threads_configured
+    with _threads_lock:
+        if _threads_configured:
+            return
+        _threads_configured = True
+
+        threads = max(1, int(threads_per_inference))
+        try:
+            import torch
+            torch.set_num_threads(threads)
+            try:
+                torch.set_num_interop_threads(1)
+            except RuntimeError:
+                # Only allowed before any parallel work has started
+                pass
+        except ImportError:
+            pass
+
+        try:
+            import cv2
+            cv2.setNumThreads(threads)
+        except ImportError:
+            pass
+
+        logger.info(f"🧵 Hilos por inferencia: {threads}")
+
+
+class InferenceAdmissionController:
+    """
+    Semaphore-based admission controller for CPU-bound inference.
+    Shared by the REST and WebSocket paths within a worker process.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int,
+        queue_timeout: float = 2.0,
+        retry_after: int = 1,
+    ):
+        self._capacity = max(1, int(max_concurrency))
+        self._queue_timeout = queue_timeout
+        self._retry_after = retry_after
+        self._semaphore = threading.BoundedSemaphore(self._capacity)
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._waiting = 0
+        self._latency_ms = 0.0
+
+    @property
+    def capacity(self) -> int:
+        return self._capacity
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    @property
+    def queue_depth(self) -> int:
+        return self._waiting
+
+    @property
+    def latency_ms(self) -> float:
+        """Exponentially weighted moving average of admitted work duration"""
+        return self._latency_ms
+
+    @contextmanager
+    def admit(self, timeout: Optional[float] = None):
+        """
+        Wait for an inference slot.
+        Raises InferenceOverloadedException if none frees up within the timeout.
+        """
+        wait = self._queue_timeout if timeout is None else timeout
+
+        with self._lock:
+            self._waiting += 1
+        try:
+            acquired = self._semaphore.acquire(timeout=wait)
+        finally:
+            with self._lock:
+                self._waiting -= 1
+
+        if not acquired:
+            raise InferenceOverloadedException(
+                "Inference capacity exhausted",
+                retry_after=self._retry_after,
+            )
+
+        with self._lock:
+            self._in_flight += 1
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            elapsed_ms = (time.monotonic() - started) * 1000
+            with self._lock:
+                self._in_flight -= 1
+                self._latency_ms += 0.2 * (elapsed_ms - self._latency_ms)
+            self._semaphore.release()
+
+    def stats(self) -> dict:
+        return {
+            'capacity': self._capacity,
+            'in_flight': self._in_flight,
+            'queue_depth': self._waiting,
+            'latency_ms': round(self._latency_ms, 2),
+        }
+
+
+_controller_instance = None
+_controller_lock = threading.Lock()
+
+
+def get_inference_controller() -> InferenceAdmissionController:
+    """Get the per-process inference controller (singleton pattern)"""
+    global _controller_instance
+    if _controller_instance is None:
+        with _controller_lock:
+            if _controller_instance is None:
+                from django.conf import settings
+
+                threads = getattr(settings, 'INFERENCE_THREADS_PER_CALL', 2)
+                max_concurrency = getattr(settings, 'INFERENCE_MAX_CONCURRENCY', 0)
+                if max_concurrency <= 0:
+                    max_concurrency = max(1, available_cpu_count() // max(1, threads))
+
+                _controller_instance = InferenceAdmissionController(
+                    max_concurrency=max_concurrency,
+                    queue_timeout=getattr(settings, 'INFERENCE_QUEUE_TIMEOUT', 2.0),
+                    retry_after=getattr(settings, 'INFERENCE_RETRY_AFTER', 1),
+                )
+                logger.info(f"🚦 Inferencias concurrentes máximas: {max_concurrency}")
+    return _controller_instance
@@ -0,0 +1,100 @@
+"""
+ML Service - Image Decoding
+Decodes uploaded images at the smallest resolution the model still needs.
+
+YOLO redimensiona a 640 px el lado mayor, así que decodificar una foto de
+12 MP a resolución completa desperdicia CPU y memoria. Para JPEG se leen
+primero las dimensiones del encabezado (SOF) y se decodifica con
+IMREAD_REDUCED_COLOR_2/4/8, que escala dentro del propio decodificador DCT.
+
+La imagen reducida lleva su factor (`DecodedImage.scale`) para que las cajas
+detectadas vuelvan a coordenadas de la imagen original.
+"""
+from typing import Optional, Tuple
+
+import numpy as np
+
+from src.domain.value_objects import probe_image_size
+
+# Lado mayor de la entrada del modelo
+MODEL_INPUT_SIZE = 640
+
+# Factores de reducción soportados por OpenCV, de mayor a menor
+_REDUCED_FACTORS = (8, 4, 2)
+
+
+class DecodedImage(np.ndarray):
+    """BGR pixels decoded at 1/scale of the original resolution"""
+    scale = 1
+
+
+def with_scale(image: np.ndarray, scale: int) -> np.ndarray:
+    """Tag a reduced decode with its factor (a view, no copy)"""
+    if scale == 1:
+        return image
+    image = image.view(DecodedImage)
+    image.scale = scale
+    return image
+
+
+def image_scale(image) -> int:
+    """Reduction factor of a decoded image (1 = original resolution)"""
+    return getattr(image, 'scale', 1)
+
+
+def scale_bounding_box(bounding_box: Optional[dict], scale: float) -> Optional[dict]:
+    """Box from decoded-image coordinates to original-image coordinates"""
+    if not bounding_box or scale == 1:
+        return bounding_box
+    return {key: int(round(value * scale)) for key, value in bounding_box.items()}
+
+
+def reduction_factor(width: int, height: int, target_size: int = MODEL_INPUT_SIZE) -> int:
+    """Largest reduced-decode factor that keeps the longer side >= target_size"""
+    longest = max(width, height)
+    for factor in _REDUCED_FACTORS:
+        if longest // factor >= target_size:
+            return factor
+    return 1
+
+
+def decode_image_bytes(
+    data,
+    target_size: Optional[int] = MODEL_INPUT_SIZE,
+    header: Optional[Tuple[str, int, int]] = None,
+) -> Tuple[Optional[np.ndarray], int]:
+    """
+    Decode encoded image bytes to a BGR array.
+
+    JPEG inputs larger than `target_size` are decoded at 1/2, 1/4 or 1/8
+    scale; other formats (and target_size=None) decode at full resolution.
+    `header` is the (format, width, height) already probed by the caller.
+
+    Returns:
+        (image, scale) where scale is the reduction factor applied
+        (1 = full resolution). image is None if decoding failed.
+    """
+    import cv2
+
+    buffer = np.frombuffer(data, np.uint8)
+
+    factor = 1
+    if target_size:
+        header = header or probe_image_size(data)
+        if header and header[0] == 'jpeg':
+            factor = reduction_factor(header[1], header[2], target_size=target_size)
+
+    flags = {
+        1: cv2.IMREAD_COLOR,
+        2: cv2.IMREAD_REDUCED_COLOR_2,
+        4: cv2.IMREAD_REDUCED_COLOR_4,
+        8: cv2.IMREAD_REDUCED_COLOR_8,
+    }[factor]
+
+    image = cv2.imdecode(buffer, flags)
+    if image is None and factor != 1:
+        # Algunos JPEG exóticos no admiten la decodificación reducida
+        image = cv2.imdecode(buffer, cv2.IMREAD_COLOR)
+        factor = 1
+
+    return image, factor
@@ -0,0 +1,210 @@
+"""
+Inference Wire Protocol
+Compact binary framing shared by the inference server and RemoteAnimalRecognition.
+
+Cada mensaje = cabecera fija de 12 bytes + payload:
+
+    version:u8  type:u8  reserved:u16  request_id:u32  payload_len:u32
+
+Payloads (big-endian):
+    RECOGNIZE   kind:u8 + image
+                  ENCODED  JPEG/PNG bytes as uploaded (decoded by the server)
+                  RAW      height:u16 width:u16 channels:u8 + pixels (uint8, HxWxC),
+                           only for frames the client already decoded
+    RESULTS     count:u16 + count × (class:u16 confidence:f32 x:i32 y:i32 w:i32 h:i32)
+                (w < 0 means no bounding box)
+    LABELS      UTF-8 labels separated by '\\n' (index = class id)
+    OVERLOADED  retry_after:u16
+    ERROR       UTF-8 message
+"""
+import socket
+import struct
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from src.domain.entities import RecognitionResult
+
+PROTOCOL_VERSION = 2
+
+MSG_RECOGNIZE = 1
+MSG_RESULTS = 2
+MSG_GET_LABELS = 3
+MSG_LABELS = 4
+MSG_OVERLOADED = 5
+MSG_ERROR = 6
+
+IMAGE_ENCODED = 1
+IMAGE_RAW = 2
+
+HEADER = struct.Struct('>BBHII')
+IMAGE_KIND = struct.Struct('>B')
+IMAGE_HEADER = struct.Struct('>HHB')
+RESULT_COUNT = struct.Struct('>H')
+RESULT_ITEM = struct.Struct('>Hfiiii')
+RETRY_AFTER = struct.Struct('>H')
+
+MAX_PAYLOAD = 64 * 1024 * 1024
+
+
+class ProtocolError(Exception):
+    """Raised when a peer sends a malformed message"""
+    pass
+
+
+@dataclass(frozen=True)
+class Message:
+    msg_type: int
+    request_id: int
+    payload: bytes = b''
+
+
+def pack_message(msg_type: int, request_id: int, payload: bytes = b'') -> bytes:
+    return HEADER.pack(PROTOCOL_VERSION, msg_type, 0, request_id, len(payload)) + payload
+
+
+def unpack_header(header: bytes) -> Tuple[int, int, int]:
+    """Return (msg_type, request_id, payload_len) from a raw header"""
+    version, msg_type, _, request_id, length = HEADER.unpack(header)
+    if version != PROTOCOL_VERSION:
+        raise ProtocolError(f"Unsupported protocol version: {version}")
+    if length > MAX_PAYLOAD:
+        raise ProtocolError(f"Payload too large: {length}")
+    return msg_type, request_id, length
+
+
+# ---- Payload codecs -------------------------------------------------------
+
+def encode_encoded_image(data) -> bytes:
+    """RECOGNIZE payload carrying the image as uploaded (JPEG/PNG)"""
+    return IMAGE_KIND.pack(IMAGE_ENCODED) + bytes(data)
+
+
+def encode_raw_image(image: np.ndarray) -> bytes:
+    """RECOGNIZE payload carrying already-decoded pixels"""
+    if image.dtype != np.uint8:
+        raise ProtocolError("Only uint8 images are supported")
+    height, width = image.shape[:2]
+    channels = image.shape[2] if image.ndim == 3 else 1
+    return (
+        IMAGE_KIND.pack(IMAGE_RAW)
+        + IMAGE_HEADER.pack(height, width, channels)
+        + np.ascontiguousarray(image).tobytes()
+    )
+
+
+def decode_image(payload: bytes) -> Tuple[int, object]:
+    """
+    Parse a RECOGNIZE payload.
+    Returns (IMAGE_ENCODED, bytes) or (IMAGE_RAW, np.ndarray).
+    """
+    if not payload:
+        raise ProtocolError("Empty image payload")
+    (kind,) = IMAGE_KIND.unpack_from(payload)
+    body = memoryview(payload)[IMAGE_KIND.size:]
+    if kind == IMAGE_ENCODED:
+        return kind, body.tobytes()
+    if kind != IMAGE_RAW:
+        raise ProtocolError(f"Unknown image kind: {kind}")
+
+    height, width, channels = IMAGE_HEADER.unpack_from(body)
+    pixels = body[IMAGE_HEADER.size:]
+    if len(pixels) != height * width * channels:
+        raise ProtocolError("Image payload size mismatch")
+    image = np.frombuffer(pixels, dtype=np.uint8)
+    shape = (height, width, channels) if channels > 1 else (height, width)
+    return kind, image.reshape(shape)
+
+
+def encode_results(results: List[RecognitionResult], label_index: dict) -> bytes:
+    parts = [RESULT_COUNT.pack(len(results))]
+    for result in results:
+        box = result.bounding_box or {}
+        parts.append(RESULT_ITEM.pack(
+            label_index.get(result.animal_name, 0xFFFF),
+            result.confidence,
+            int(box.get('x', 0)),
+            int(box.get('y', 0)),
+            int(box.get('width', -1)) if box else -1,
+            int(box.get('height', -1)) if box else -1,
+        ))
+    return b''.join(parts)
+
+
+def decode_results(payload: bytes, labels: List[str]) -> List[RecognitionResult]:
+    (count,) = RESULT_COUNT.unpack_from(payload)
+    results = []
+    offset = RESULT_COUNT.size
+    for _ in range(count):
+        cls_idx, confidence, x, y, w, h = RESULT_ITEM.unpack_from(payload, offset)
+        offset += RESULT_ITEM.size
+        name = labels[cls_idx] if cls_idx < len(labels) else f"Unknown_{cls_idx}"
+        results.append(RecognitionResult(
+            animal_id="",
+            animal_name=name,
+            confidence=confidence,
+            bounding_box={'x': x, 'y': y, 'width': w, 'height': h} if w >= 0 else None,
+        ))
+    return results
+
+
+def encode_labels(labels: List[str]) -> bytes:
+    return '\n'.join(labels).encode('utf-8')
+
+
+def decode_labels(payload: bytes) -> List[str]:
+    text = payload.decode('utf-8')
+    return text.split('\n') if text else []
+
+
+# ---- Blocking socket helpers (client side) --------------------------------
+
+def _recv_exact(sock: socket.socket, size: int) -> bytes:
+    buffer = bytearray(size)
+    view = memoryview(buffer)
+    received = 0
+    while received < size:
+        n = sock.recv_into(view[received:], size - received)
+        if n == 0:
+            raise ConnectionError("Inference server closed the connection")
+        received += n
+    return bytes(buffer)
+
+
+def send_message(sock: socket.socket, msg_type: int, request_id: int, payload: bytes = b'') -> None:
+    sock.sendall(pack_message(msg_type, request_id, payload))
+
+
+def recv_message(sock: socket.socket) -> Message:
+    msg_type, request_id, length = unpack_header(_recv_exact(sock, HEADER.size))
+    payload = _recv_exact(sock, length) if length else b''
+    return Message(msg_type, request_id, payload)
+
+
+# ---- asyncio stream helpers (server side) ---------------------------------
+
+async def read_message(reader) -> Optional[Message]:
+    """Read one message; returns None on clean EOF"""
+    import asyncio
+
+    try:
+        header = await reader.readexactly(HEADER.size)
+    except asyncio.IncompleteReadError:
+        return None
+    msg_type, request_id, length = unpack_header(header)
+    payload = await reader.readexactly(length) if length else b''
+    return Message(msg_type, request_id, payload)
+
+
+def parse_address(address: str) -> Tuple[str, object]:
+    """
+    Parse 'unix:///path/to.sock' or 'tcp://host:port'.
+    Returns ('unix', path) or ('tcp', (host, port)).
+    """
+    if address.startswith('unix://'):
+        return 'unix', address[len('unix://'):]
+    if address.startswith('tcp://'):
+        host, _, port = address[len('tcp://'):].rpartition(':')
+        return 'tcp', (host or '127.0.0.1', int(port))
+    raise ValueError(f"Unsupported inference server address: {address}")
@@ -0,0 +1,214 @@
+"""
+Standalone Inference Server
+Small asyncio process that owns the model and serves RemoteAnimalRecognition
+clients over a Unix socket or TCP, batching concurrent requests.
+
+Los clientes envían la imagen tal como llegó (JPEG/PNG) y el servidor la
+decodifica en su propio pool de hilos con `backend.preprocess_image`, así
+el trabajo de decodificación sale de los workers web.
+
+Run with:
+    python -m src.infrastructure.ml.inference_server --address unix:///tmp/pokedex-inference.sock
+    python -m src.infrastructure.ml.inference_server --address tcp://0.0.0.0:8765
+"""
+import os
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
+
+from src.domain.ports import AnimalRecognitionPort
+from src.domain.exceptions import InferenceOverloadedException
+from src.domain.value_objects import ImageFrame
+from . import inference_protocol as proto
+
+logger = logging.getLogger(__name__)
+
+
+class InferenceServer:
+    """
+    Batching inference server.
+    Requests from all connections share one queue; a single batcher task
+    groups up to `max_batch` images (waiting at most `max_wait_ms` for
+    stragglers) and runs them through `backend.recognize_batch`.
+    """
+
+    def __init__(
+        self,
+        backend: AnimalRecognitionPort,
+        max_batch: int = 8,
+        max_wait_ms: float = 5.0,
+        max_queue: int = 64,
+        decode_workers: int = 2,
+    ):
+        self._backend = backend
+        self._labels = backend.get_supported_animals()
+        self._label_index = {name: i for i, name in enumerate(self._labels)}
+        self._max_batch = max(1, max_batch)
+        self._max_wait = max_wait_ms / 1000
+        self._max_queue = max_queue
+        self._queue: Optional[asyncio.Queue] = None
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='inference')
+        self._decoder = ThreadPoolExecutor(max_workers=max(1, decode_workers), thread_name_prefix='decode')
+        self._batcher: Optional[asyncio.Task] = None
+        self._server = None
+
+    async def start(self, address: str):
+        """Bind the listening socket and start the batcher"""
+        self._queue = asyncio.Queue(maxsize=self._max_queue)
+        self._batcher = asyncio.create_task(self._batch_loop())
+
+        kind, target = proto.parse_address(address)
+        if kind == 'unix':
+            if os.path.exists(target):
+                os.unlink(target)
+            self._server = await asyncio.start_unix_server(self._handle_connection, path=target)
+        else:
+            host, port = target
+            self._server = await asyncio.start_server(self._handle_connection, host=host, port=port)
+
+        logger.info(f"🛰️ Servidor de inferencia escuchando en {address}")
+        return self._server
+
+    async def serve_forever(self, address: str) -> None:
+        server = await self.start(address)
+        async with server:
+            await server.serve_forever()
+
+    async def close(self) -> None:
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+        if self._batcher:
+            self._batcher.cancel()
+        self._executor.shutdown(wait=False)
+        self._decoder.shutdown(wait=False)
+
+    async def _decode(self, payload: bytes):
+        kind, image = proto.decode_image(payload)
+        if kind == proto.IMAGE_RAW:
+            return image
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._decoder, self._backend.preprocess_image, ImageFrame(data=image)
+        )
+
+    async def _handle_connection(self, reader, writer) -> None:
+        write_lock = asyncio.Lock()
+        pending = set()
+
+        async def reply(msg_type: int, request_id: int, payload: bytes = b'') -> None:
+            async with write_lock:
+                writer.write(proto.pack_message(msg_type, request_id, payload))
+                await writer.drain()
+
+        async def recognize(request_id: int, payload: bytes) -> None:
+            # Decodificar fuera del loop; las peticiones de una conexión se decodifican en paralelo
+            try:
+                image = await self._decode(payload)
+            except Exception as e:
+                await reply(proto.MSG_ERROR, request_id, f"Bad image: {e}".encode('utf-8'))
+                return
+
+            future = asyncio.get_running_loop().create_future()
+            try:
+                self._queue.put_nowait((image, future))
+            except asyncio.QueueFull:
+                await reply(proto.MSG_OVERLOADED, request_id, proto.RETRY_AFTER.pack(1))
+                return
+
+            try:
+                results = await future
+                await reply(proto.MSG_RESULTS, request_id, proto.encode_results(results, self._label_index))
+            except InferenceOverloadedException as e:
+                await reply(proto.MSG_OVERLOADED, request_id, proto.RETRY_AFTER.pack(e.retry_after))
+            except Exception as e:
+                await reply(proto.MSG_ERROR, request_id, str(e).encode('utf-8'))
+
+        try:
+            while True:
+                message = await proto.read_message(reader)
+                if message is None:
+                    break
+
+                if message.msg_type == proto.MSG_GET_LABELS:
+                    await reply(proto.MSG_LABELS, message.request_id, proto.encode_labels(self._labels))
+                elif message.msg_type == proto.MSG_RECOGNIZE:
+                    task = asyncio.create_task(recognize(message.request_id, message.payload))
+                    pending.add(task)
+                    task.add_done_callback(pending.discard)
+                else:
+                    await reply(proto.MSG_ERROR, message.request_id, b"Unknown message type")
+        except (proto.ProtocolError, ConnectionError) as e:
+            logger.warning(f"Conexión de inferencia cerrada: {e}")
+        finally:
+            for task in list(pending):
+                task.cancel()
+            writer.close()
+
+    async def _batch_loop(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self._max_wait
+
+            while len(batch) < self._max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            # Requests whose client went away are skipped
+            batch = [(image, future) for image, future in batch if not future.cancelled()]
+            if not batch:
+                continue
+
+            images: List = [image for image, _ in batch]
+            try:
+                results = await loop.run_in_executor(
+                    self._executor, self._backend.recognize_batch, images
+                )
+                for (_, future), result in zip(batch, results):
+                    if not future.done():
+                        future.set_result(result)
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+
+
+def main() -> None:
+    import argparse
+    import django
+
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+    django.setup()
+
+    from django.conf import settings
+    from .recognition import YOLOAnimalRecognition
+
+    parser = argparse.ArgumentParser(description="Pokedex standalone inference server")
+    parser.add_argument('--address', default=getattr(
+        settings, 'INFERENCE_SERVER_ADDRESS', 'unix:///tmp/pokedex-inference.sock'
+    ))
+    parser.add_argument('--max-batch', type=int, default=8)
+    parser.add_argument('--max-wait-ms', type=float, default=5.0)
+    parser.add_argument('--max-queue', type=int, default=64)
+    parser.add_argument('--decode-workers', type=int, default=2)
+    args = parser.parse_args()
+
+    server = InferenceServer(
+        backend=YOLOAnimalRecognition(confidence_threshold=0.5),
+        max_batch=args.max_batch,
+        max_wait_ms=args.max_wait_ms,
+        max_queue=args.max_queue,
+        decode_workers=args.decode_workers,
+    )
+    asyncio.run(server.serve_forever(args.address))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,112 @@
+"""
+Inference Load Controller
+Derives a target service level from the admission controller's queue depth
+and inference latency, with hysteresis, and tracks session levels for metrics.
+"""
+import time
+import logging
+import threading
+import weakref
+from typing import Optional
+
+from src.application.degradation import ServiceLevel, SessionServiceLevel
+from .concurrency import InferenceAdmissionController, get_inference_controller
+
+logger = logging.getLogger(__name__)
+
+
+class LoadController:
+    """
+    Load-aware controller shared by all sessions in a worker process.
+
+    Pressure is the worse of queue occupancy (waiting / capacity) and
+    latency ratio (EWMA latency / target). Above `high` the target level
+    rises one step; below `low` it falls one step; at most one step per
+    `step_interval` seconds.
+    """
+
+    def __init__(
+        self,
+        admission: InferenceAdmissionController,
+        target_latency_ms: float = 250.0,
+        high: float = 1.0,
+        low: float = 0.5,
+        step_interval: float = 1.0,
+    ):
+        self._admission = admission
+        self._target_latency_ms = target_latency_ms
+        self._high = high
+        self._low = low
+        self._step_interval = step_interval
+        self._level = ServiceLevel.FULL
+        self._pressure = 0.0
+        self._evaluated_at = 0.0
+        self._lock = threading.Lock()
+        self._sessions = weakref.WeakSet()
+
+    def pressure(self) -> float:
+        stats = self._admission.stats()
+        queue_ratio = stats['queue_depth'] / stats['capacity']
+        latency_ratio = stats['latency_ms'] / self._target_latency_ms
+        return max(queue_ratio, latency_ratio)
+
+    def target_level(self, now: Optional[float] = None) -> ServiceLevel:
+        """Current target level (re-evaluated at most once per step interval)"""
+        now = time.monotonic() if now is None else now
+        if now - self._evaluated_at < self._step_interval:
+            return self._level
+
+        with self._lock:
+            if now - self._evaluated_at < self._step_interval:
+                return self._level
+            self._evaluated_at = now
+            self._pressure = self.pressure()
+
+            previous = self._level
+            if self._pressure > self._high and self._level < ServiceLevel.DETECTIONS_ONLY:
+                self._level = ServiceLevel(self._level + 1)
+            elif self._pressure < self._low and self._level > ServiceLevel.FULL:
+                self._level = ServiceLevel(self._level - 1)
+
+            if self._level != previous:
+                logger.info(
+                    f"📉 Nivel de servicio objetivo: {previous.name} → {self._level.name} "
+                    f"(presión {self._pressure:.2f})"
+                )
+        return self._level
+
+    def register(self, session_level: SessionServiceLevel) -> None:
+        self._sessions.add(session_level)
+
+    def unregister(self, session_level: SessionServiceLevel) -> None:
+        self._sessions.discard(session_level)
+
+    def snapshot(self) -> dict:
+        """Target level, pressure and number of sessions at each level"""
+        by_level = {level.name: 0 for level in ServiceLevel}
+        for session_level in list(self._sessions):
+            by_level[session_level.level.name] += 1
+        return {
+            'target_level': self._level.name,
+            'pressure': round(self._pressure, 3),
+            'sessions_by_level': by_level,
+        }
+
+
+_load_controller_instance = None
+_load_controller_lock = threading.Lock()
+
+
+def get_load_controller() -> LoadController:
+    """Get the per-process load controller (singleton pattern)"""
+    global _load_controller_instance
+    if _load_controller_instance is None:
+        with _load_controller_lock:
+            if _load_controller_instance is None:
+                from django.conf import settings
+
+                _load_controller_instance = LoadController(
+                    admission=get_inference_controller(),
+                    target_latency_ms=getattr(settings, 'INFERENCE_TARGET_LATENCY_MS', 250.0),
+                )
+    return _load_controller_instance
@@ -4,7 +4,9 @@ Implements the AnimalRecognitionPort using YOLO (YOLOv8).
 Handles real-time animal detection from camera frames.
 """
 import os
+import time
 import logging
+import threading
 from typing import List, Optional
 import numpy as np
 from pathlib import Path
@@ -12,7 +14,16 @@ from pathlib import Path
 from src.domain.entities import RecognitionResult
 from src.domain.value_objects import ImageFrame
 from src.domain.ports import AnimalRecognitionPort
-from src.domain.exceptions import RecognitionException, ModelNotReadyException
+from src.domain.exceptions import (
+    RecognitionException,
+    ModelNotReadyException,
+    InferenceOverloadedException,
+)
+from src.application.instrumentation import record_stage, stage
+from src.infrastructure.observability import get_metrics
+from .concurrency import configure_inference_threads, get_inference_controller
+from .decoding import MODEL_INPUT_SIZE, decode_image_bytes, image_scale, with_scale
+from .buffer_pool import LetterboxTransform, get_frame_buffer_pool, pooled_batch_tensor
 
 logger = logging.getLogger(__name__)
 
@@ -33,6 +44,70 @@ YOLO_CLASS_MAPPING = {
 }
 
 
+def _decode_target_size() -> int:
+    """Lado mínimo a conservar al decodificar (0 = resolución completa)"""
+    from django.conf import settings
+    return getattr(settings, 'INFERENCE_DECODE_TARGET_SIZE', MODEL_INPUT_SIZE)
+
+
+def _decode_frame(frame: ImageFrame) -> np.ndarray:
+    """
+    Decodifica un ImageFrame (bytes o base64) a numpy array OpenCV (BGR).
+    Compartido por el adaptador local y el servidor de inferencia.
+    
+    Los JPEG grandes se decodifican a escala reducida (1/2, 1/4, 1/8) sin
+    bajar del tamaño de entrada del modelo; el factor viaja con la imagen
+    (DecodedImage.scale) y las cajas se devuelven en coordenadas originales.
+    """
+    try:
+        import base64
+        
+        # Decodificar base64 si viene en ese formato
+        if isinstance(frame.data, str):
+            # Es base64
+            if ',' in frame.data:
+                frame_data = frame.data.split(',')[1]
+            else:
+                frame_data = frame.data
+            
+            # Decodificar a bytes
+            img_bytes = base64.b64decode(frame_data)
+        else:
+            # Ya es bytes
+            img_bytes = frame.data
+        
+        header = (frame.format, frame.width, frame.height) if frame.width and frame.height else None
+        image, scale = decode_image_bytes(img_bytes, _decode_target_size(), header)
+        
+        if image is None:
+            raise RecognitionException("Failed to decode image")
+        
+        return with_scale(image, scale)
+        
+    except Exception as e:
+        raise RecognitionException(f"Image preprocessing failed: {str(e)}")
+
+
+def record_inference(backend: str, started: float, batch_size: int) -> None:
+    """Métricas de una llamada al modelo (latencia y tamaño de lote)"""
+    metrics = get_metrics()
+    metrics.observe('inference_seconds', time.perf_counter() - started, backend=backend)
+    metrics.observe('inference_batch_size', batch_size, backend=backend)
+
+
+def decode_frame(frame: ImageFrame) -> np.ndarray:
+    """
+    Devuelve los píxeles del frame, decodificando solo la primera vez.
+    El resultado queda en caché dentro del ImageFrame.
+    """
+    if frame.decoded is not None:
+        get_metrics().inc('decode_cache', result='hit')
+        return frame.decoded
+    get_metrics().inc('decode_cache', result='miss')
+    with stage('decode'):
+        return frame.get_decoded(_decode_frame)
+
+
 class YOLOAnimalRecognition(AnimalRecognitionPort):
     """
     YOLO (YOLOv8) implementation of AnimalRecognitionPort.
@@ -47,6 +122,13 @@ class YOLOAnimalRecognition(AnimalRecognitionPort):
         self._model_path = model_path
         self._confidence_threshold = confidence_threshold
         self._is_ready = False
+        self._controller = get_inference_controller()
+        
+        # Lienzos letterbox y tensores reutilizables (None = ruta sin pool)
+        from django.conf import settings
+        self._buffer_pool = (
+            get_frame_buffer_pool() if getattr(settings, 'INFERENCE_BUFFER_POOL', True) else None
+        )
         
         logger.info("🚀 Inicializando YOLOAnimalRecognition...")
         self._load_model()
@@ -57,8 +139,14 @@ class YOLOAnimalRecognition(AnimalRecognitionPort):
         Se ejecuta UNA SOLA VEZ al iniciar el servidor.
         """
         try:
+            from django.conf import settings
             from ultralytics import YOLO
             
+            # Hilos intra-op fijados una sola vez por proceso
+            configure_inference_threads(
+                getattr(settings, 'INFERENCE_THREADS_PER_CALL', 2)
+            )
+            
             # Ruta del modelo - por defecto en la raíz del proyecto
             if not self._model_path:
                 # Buscar best.pt en la raíz del proyecto Django
@@ -105,34 +193,7 @@ class YOLOAnimalRecognition(AnimalRecognitionPort):
         Preprocesa un frame de imagen para reconocimiento.
         Convierte ImageFrame → numpy array OpenCV.
         """
-        try:
-            import cv2
-            import base64
-            
-            # Decodificar base64 si viene en ese formato
-            if isinstance(frame.data, str):
-                # Es base64
-                if ',' in frame.data:
-                    frame_data = frame.data.split(',')[1]
-                else:
-                    frame_data = frame.data
-                
-                # Decodificar a bytes
-                img_bytes = base64.b64decode(frame_data)
-                nparr = np.frombuffer(img_bytes, np.uint8)
-                image = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
-            else:
-                # Ya es bytes
-                nparr = np.frombuffer(frame.data, np.uint8)
-                image = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
-            
-            if image is None:
-                raise RecognitionException("Failed to decode image")
-            
-            return image
-            
-        except Exception as e:
-            raise RecognitionException(f"Image preprocessing failed: {str(e)}")
+        return decode_frame(frame)
     
     def recognize(self, image: np.ndarray) -> List[RecognitionResult]:
         """
@@ -144,52 +205,114 @@ class YOLOAnimalRecognition(AnimalRecognitionPort):
         Returns:
             Lista de RecognitionResult con los animales detectados
         """
+        return self.recognize_batch([image])[0]
+    
+    def recognize_batch(self, images: List[np.ndarray]) -> List[List[RecognitionResult]]:
+        """
+        Detecta animales en varias imágenes con una sola llamada a YOLO.
+        Ocupa un único turno del controlador de admisión para todo el lote.
+        """
         if not self._is_ready or self._model is None:
             raise ModelNotReadyException("Modelo YOLO no está listo")
         
+        if not images:
+            return []
+        
         try:
-            # Ejecutar YOLO - Simple y directo
-            results = self._model(image)
-
-            if not results or results[0].boxes is None:
-                return []
-
-            recognition_results = []
-
-            # Procesar cada detección
-            for box in results[0].boxes:
-                conf = float(box.conf[0]) if box.conf is not None else 0
-                cls_idx = int(box.cls[0]) if box.cls is not None else -1
-                
-                if conf >= self._confidence_threshold:
-                    animal_name = YOLO_CLASS_MAPPING.get(cls_idx, f"Unknown_{cls_idx}")
-                    
-                    # Extraer bounding box
-                    bounding_box = None
-                    try:
-                        if hasattr(box, 'xyxy'):
-                            coords = box.xyxy[0].tolist() if hasattr(box.xyxy, '__len__') else box.xyxy.tolist()
-                            if coords:
-                                x1, y1, x2, y2 = map(int, coords[:4])
-                                bounding_box = {'x': x1, 'y': y1, 'width': x2-x1, 'height': y2-y1}
-                    except Exception:
-                        pass
-                    
-                    recognition_results.append(RecognitionResult(
-                        animal_id="",
-                        animal_name=animal_name,
-                        confidence=conf,
-                        bounding_box=bounding_box,
-                    ))
-                    
-                    logger.debug(f"🐾 Detectado: {animal_name} (conf: {conf:.1%})")
+            # Ejecutar YOLO con admisión acotada (evita sobresuscribir la CPU)
+            with self._controller.admit():
+                if self._buffer_pool is not None:
+                    return self._recognize_pooled(images)
+                # Sin pool, el letterbox de ultralytics cuenta como inferencia
+                started = time.perf_counter()
+                with stage('inference'):
+                    results = self._model([np.asarray(image) for image in images])
+                record_inference('yolo', started, len(images))
             
-            return recognition_results
+            with stage('postprocess'):
+                return [
+                    self._to_recognition_results(result, scale=image_scale(image))
+                    for result, image in zip(results, images)
+                ]
             
+        except InferenceOverloadedException:
+            raise
         except Exception as e:
             logger.error(f"❌ Error en reconocimiento YOLO: {str(e)}")
             raise RecognitionException(f"Reconocimiento fallido: {str(e)}")
     
+    def _recognize_pooled(self, images: List[np.ndarray]) -> List[List[RecognitionResult]]:
+        """
+        Letterbox y conversión a tensor sobre buffers del pool; YOLO recibe
+        el tensor ya preparado (torch.from_numpy no copia) y las cajas se
+        devuelven a coordenadas de cada imagen.
+        """
+        import torch
+        
+        start = time.perf_counter()
+        with pooled_batch_tensor(images, self._buffer_pool, MODEL_INPUT_SIZE) as (tensor, transforms):
+            record_stage('preprocess', (time.perf_counter() - start) * 1000)
+            started = time.perf_counter()
+            with stage('inference'):
+                results = self._model(torch.from_numpy(tensor))
+            record_inference('yolo', started, len(images))
+            with stage('postprocess'):
+                return [
+                    self._to_recognition_results(result, transform, image_scale(image))
+                    for result, transform, image in zip(results, transforms, images)
+                ]
+    
+    def _to_recognition_results(
+        self,
+        result,
+        transform: Optional[LetterboxTransform] = None,
+        scale: int = 1,
+    ) -> List[RecognitionResult]:
+        """
+        Convierte la salida YOLO de una imagen en RecognitionResult ordenados.
+        Las cajas se deshacen del letterbox (`transform`) y de la decodificación
+        reducida (`scale`), en coordenadas de la imagen original.
+        """
+        if result is None or result.boxes is None:
+            return []
+        
+        recognition_results = []
+        
+        # Procesar cada detección
+        for box in result.boxes:
+            conf = float(box.conf[0]) if box.conf is not None else 0
+            cls_idx = int(box.cls[0]) if box.cls is not None else -1
+            
+            if conf >= self._confidence_threshold:
+                animal_name = YOLO_CLASS_MAPPING.get(cls_idx, f"Unknown_{cls_idx}")
+                
+                # Extraer bounding box
+                bounding_box = None
+                try:
+                    if hasattr(box, 'xyxy'):
+                        coords = box.xyxy[0].tolist() if hasattr(box.xyxy, '__len__') else box.xyxy.tolist()
+                        if coords:
+                            x1, y1, x2, y2 = coords[:4]
+                            if transform is not None:
+                                x1, y1, x2, y2 = transform.to_image(x1, y1, x2, y2)
+                            x1, y1, x2, y2 = (int(v * scale) for v in (x1, y1, x2, y2))
+                            bounding_box = {'x': x1, 'y': y1, 'width': x2-x1, 'height': y2-y1}
+                except Exception:
+                    pass
+                
+                recognition_results.append(RecognitionResult(
+                    animal_id="",
+                    animal_name=animal_name,
+                    confidence=conf,
+                    bounding_box=bounding_box,
+                ))
+                
+                logger.debug(f"🐾 Detectado: {animal_name} (conf: {conf:.1%})")
+        
+        # El puerto promete resultados ordenados por confianza
+        recognition_results.sort(key=lambda r: r.confidence, reverse=True)
+        return recognition_results
+    
     def get_supported_animals(self) -> List[str]:
         """Retorna lista de animales soportados por el modelo"""
         return list(YOLO_CLASS_MAPPING.values())
@@ -242,24 +365,25 @@ class TensorFlowAnimalRecognition(AnimalRecognitionPort):
         try:
             import cv2
             
-            # Decode image from bytes
-            nparr = np.frombuffer(frame.data, np.uint8)
-            image = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
+            # Decode image from bytes (reduced scale when far above 224)
+            with stage('decode'):
+                image, _ = decode_image_bytes(frame.data, 224)
             
             if image is None:
                 raise RecognitionException("Failed to decode image")
             
-            # Resize to model input size (224x224 for most models)
-            image = cv2.resize(image, (224, 224))
-            
-            # Convert BGR to RGB
-            image = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
-            
-            # Normalize pixel values
-            image = image.astype(np.float32) / 255.0
-            
-            # Add batch dimension
-            image = np.expand_dims(image, axis=0)
+            with stage('preprocess'):
+                # Resize to model input size (224x224 for most models)
+                image = cv2.resize(image, (224, 224))
+                
+                # Convert BGR to RGB
+                image = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+                
+                # Normalize pixel values
+                image = image.astype(np.float32) / 255.0
+                
+                # Add batch dimension
+                image = np.expand_dims(image, axis=0)
             
             return image
             
@@ -274,8 +398,12 @@ class TensorFlowAnimalRecognition(AnimalRecognitionPort):
         try:
             if self._model is not None:
                 # Real model prediction
-                predictions = self._model.predict(image, verbose=0)
-                return self._process_predictions(predictions[0])
+                started = time.perf_counter()
+                with stage('inference'):
+                    predictions = self._model.predict(image, verbose=0)
+                record_inference('tensorflow', started, len(image))
+                with stage('postprocess'):
+                    return self._process_predictions(predictions[0])
             else:
                 # Mock prediction for development
                 return self._mock_prediction()
@@ -327,6 +455,35 @@ class TensorFlowAnimalRecognition(AnimalRecognitionPort):
         return self._is_ready
 
 
+_backend_instance = None
+_backend_lock = threading.Lock()
+
+
+def get_recognition_backend() -> AnimalRecognitionPort:
+    """
+    Get the per-process recognition backend (singleton pattern).
+    Shared by the REST and WebSocket paths so the model loads only once.
+    INFERENCE_BACKEND=remote delegates to the standalone inference server.
+    """
+    global _backend_instance
+    if _backend_instance is None:
+        with _backend_lock:
+            if _backend_instance is None:
+                from django.conf import settings
+                
+                if getattr(settings, 'INFERENCE_BACKEND', 'local') == 'remote':
+                    from .remote import RemoteAnimalRecognition
+                    _backend_instance = RemoteAnimalRecognition(
+                        address=settings.INFERENCE_SERVER_ADDRESS,
+                        pool_size=getattr(settings, 'INFERENCE_SERVER_POOL_SIZE', 4),
+                        request_timeout=getattr(settings, 'INFERENCE_SERVER_TIMEOUT', 5.0),
+                        send_decoded=getattr(settings, 'INFERENCE_SERVER_SEND_DECODED', False),
+                    )
+                else:
+                    _backend_instance = YOLOAnimalRecognition(confidence_threshold=0.5)
+    return _backend_instance
+
+
 class OpenCVPreprocessor:
     """
     OpenCV-based image preprocessing utilities.
@@ -0,0 +1,199 @@
+"""
+ML Service - Remote Recognition Adapter
+Implements the AnimalRecognitionPort by delegating inference to the
+standalone inference server (see inference_server.py).
+"""
+import time
+import queue
+import base64
+import socket
+import logging
+import itertools
+from contextlib import contextmanager
+from typing import List, Optional, Union
+
+import numpy as np
+
+from src.domain.entities import RecognitionResult
+from src.domain.value_objects import ImageFrame
+from src.domain.ports import AnimalRecognitionPort
+from src.domain.exceptions import (
+    RecognitionException,
+    ModelNotReadyException,
+    InferenceOverloadedException,
+)
+from . import inference_protocol as proto
+from src.application.instrumentation import stage
+from .decoding import image_scale, scale_bounding_box
+from .recognition import record_inference
+
+logger = logging.getLogger(__name__)
+
+
+class RemoteAnimalRecognition(AnimalRecognitionPort):
+    """
+    Client for the standalone inference server.
+    Frames travel as uploaded (JPEG/PNG) and are decoded by the server, so
+    `preprocess_image` returns the frame itself. Arrays that are already
+    decoded (e.g. video frames) are re-encoded as JPEG, or sent as raw
+    pixels with `send_decoded=True`.
+    Connections are pooled and every request is bounded by timeouts.
+    """
+
+    def __init__(
+        self,
+        address: str,
+        pool_size: int = 4,
+        connect_timeout: float = 1.0,
+        request_timeout: float = 5.0,
+        send_decoded: bool = False,
+    ):
+        self._address = address
+        self._send_decoded = send_decoded
+        self._kind, self._target = proto.parse_address(address)
+        self._pool = queue.LifoQueue(maxsize=pool_size)
+        self._connect_timeout = connect_timeout
+        self._request_timeout = request_timeout
+        self._request_ids = itertools.count(1)
+        self._labels: Optional[List[str]] = None
+
+    def _connect(self) -> socket.socket:
+        if self._kind == 'unix':
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        else:
+            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        sock.settimeout(self._connect_timeout)
+        try:
+            sock.connect(self._target)
+        except OSError:
+            sock.close()
+            raise
+        sock.settimeout(self._request_timeout)
+        return sock
+
+    @contextmanager
+    def _connection(self):
+        """Borrow a pooled connection; broken connections are discarded"""
+        try:
+            sock = self._pool.get_nowait()
+        except queue.Empty:
+            sock = self._connect()
+
+        healthy = False
+        try:
+            yield sock
+            healthy = True
+        finally:
+            if healthy:
+                try:
+                    self._pool.put_nowait(sock)
+                except queue.Full:
+                    sock.close()
+            else:
+                sock.close()
+
+    def _next_request_id(self) -> int:
+        return next(self._request_ids) & 0xFFFFFFFF
+
+    def _exchange(self, requests: List[tuple]) -> dict:
+        """Pipeline requests on one connection and collect replies by id"""
+        try:
+            with self._connection() as sock:
+                for msg_type, request_id, payload in requests:
+                    proto.send_message(sock, msg_type, request_id, payload)
+                replies = {}
+                while len(replies) < len(requests):
+                    message = proto.recv_message(sock)
+                    replies[message.request_id] = message
+                return replies
+        except socket.timeout:
+            raise RecognitionException(f"Inference server timed out ({self._address})")
+        except (OSError, ConnectionError, proto.ProtocolError) as e:
+            raise RecognitionException(f"Inference server unavailable: {e}")
+
+    def _get_labels(self) -> List[str]:
+        if self._labels is None:
+            request_id = self._next_request_id()
+            reply = self._exchange([(proto.MSG_GET_LABELS, request_id, b'')])[request_id]
+            self._labels = proto.decode_labels(reply.payload)
+        return self._labels
+
+    def _parse_reply(self, message: proto.Message) -> List[RecognitionResult]:
+        if message.msg_type == proto.MSG_RESULTS:
+            return proto.decode_results(message.payload, self._get_labels())
+        if message.msg_type == proto.MSG_OVERLOADED:
+            (retry_after,) = proto.RETRY_AFTER.unpack(message.payload)
+            raise InferenceOverloadedException("Inference server overloaded", retry_after=retry_after)
+        raise RecognitionException(message.payload.decode('utf-8', errors='replace'))
+
+    def preprocess_image(self, frame: ImageFrame) -> ImageFrame:
+        """Nothing to do here: the inference server decodes the frame"""
+        return frame
+
+    def recognize(self, image: Union[ImageFrame, np.ndarray]) -> List[RecognitionResult]:
+        return self.recognize_batch([image])[0]
+
+    def _payload(self, image: Union[ImageFrame, np.ndarray]) -> bytes:
+        if isinstance(image, ImageFrame):
+            data = image.data
+            if isinstance(data, str):
+                data = base64.b64decode(data.split(',', 1)[1] if ',' in data else data)
+            return proto.encode_encoded_image(data)
+        if self._send_decoded:
+            return proto.encode_raw_image(image)
+
+        import cv2
+        ok, encoded = cv2.imencode('.jpg', np.asarray(image), [cv2.IMWRITE_JPEG_QUALITY, 90])
+        if not ok:
+            raise RecognitionException("Failed to encode image for the inference server")
+        return proto.encode_encoded_image(encoded)
+
+    def recognize_batch(self, images: List[Union[ImageFrame, np.ndarray]]) -> List[List[RecognitionResult]]:
+        """Send all images at once so the server can batch them together"""
+        if not images:
+            return []
+
+        labels = self._get_labels()
+        requests = [
+            (proto.MSG_RECOGNIZE, self._next_request_id(), self._payload(image))
+            for image in images
+        ]
+        # Ida y vuelta al servidor de inferencia (incluye su cola y su lote)
+        started = time.perf_counter()
+        with stage('inference'):
+            replies = self._exchange(requests)
+        record_inference('remote', started, len(images))
+
+        if not labels:
+            raise ModelNotReadyException("Inference server reported no labels")
+        return [
+            self._scale_results(self._parse_reply(replies[request_id]), image_scale(image))
+            for (_, request_id, _), image in zip(requests, images)
+        ]
+
+    @staticmethod
+    def _scale_results(results: List[RecognitionResult], scale: int) -> List[RecognitionResult]:
+        """Boxes from a reduced decode sent by the client back to original coordinates"""
+        if scale != 1:
+            for result in results:
+                result.bounding_box = scale_bounding_box(result.bounding_box, scale)
+        return results
+
+    def close(self) -> None:
+        """Close the pooled connections"""
+        while True:
+            try:
+                self._pool.get_nowait().close()
+            except queue.Empty:
+                return
+
+    def get_supported_animals(self) -> List[str]:
+        return list(self._get_labels())
+
+    def is_ready(self) -> bool:
+        try:
+            return bool(self._get_labels())
+        except RecognitionException as e:
+            logger.warning(f"Servidor de inferencia no disponible: {e}")
+            return False
@@ -0,0 +1,118 @@
+"""
+Video Frame Sampler Adapter
+Implements the VideoFrameSamplerPort with OpenCV's VideoCapture.
+
+Los frames se leen uno a uno desde disco: `grab()` avanza sin convertir
+y `retrieve()` solo se llama para los frames muestreados, así la memoria
+es constante sin importar la duración del video.
+"""
+import logging
+from typing import Iterator, Optional, Tuple
+
+import numpy as np
+
+from src.domain.ports import VideoFrameSamplerPort
+from src.domain.exceptions import InvalidImageException
+
+logger = logging.getLogger(__name__)
+
+
+class OpenCVVideoSampler(VideoFrameSamplerPort):
+    """
+    Samples frames every `interval` seconds, or on scene changes when
+    `scene_threshold` is set (histogram distance checked every
+    `scene_check_interval` seconds, with `interval` as the maximum gap).
+    """
+
+    def __init__(
+        self,
+        interval: float = 1.0,
+        scene_threshold: Optional[float] = None,
+        scene_check_interval: float = 0.2,
+        keyframe_size: Tuple[int, int] = (320, 320),
+    ):
+        self._interval = max(0.04, interval)
+        self._scene_threshold = scene_threshold
+        self._scene_check_interval = max(0.04, scene_check_interval)
+        self._keyframe_size = keyframe_size
+
+    def _open(self, video_path: str):
+        import cv2
+
+        capture = cv2.VideoCapture(video_path)
+        if not capture.isOpened():
+            raise InvalidImageException("Unable to open video")
+        return capture
+
+    def get_duration(self, video_path: str) -> float:
+        import cv2
+
+        capture = self._open(video_path)
+        try:
+            fps = capture.get(cv2.CAP_PROP_FPS) or 0
+            frames = capture.get(cv2.CAP_PROP_FRAME_COUNT) or 0
+            return frames / fps if fps > 0 else 0.0
+        finally:
+            capture.release()
+
+    def sample(self, video_path: str) -> Iterator[Tuple[float, np.ndarray]]:
+        import cv2
+
+        capture = self._open(video_path)
+        try:
+            fps = capture.get(cv2.CAP_PROP_FPS) or 30.0
+            step = self._scene_check_interval if self._scene_threshold else self._interval
+
+            frame_index = 0
+            next_check = 0.0
+            last_sample = None
+            last_histogram = None
+
+            while capture.grab():
+                timestamp = frame_index / fps
+                frame_index += 1
+                if timestamp < next_check:
+                    continue
+                next_check = timestamp + step
+
+                ok, image = capture.retrieve()
+                if not ok or image is None:
+                    continue
+
+                if self._scene_threshold:
+                    histogram = self._histogram(image)
+                    changed = last_histogram is None or (
+                        1.0 - cv2.compareHist(last_histogram, histogram, cv2.HISTCMP_CORREL)
+                    ) >= self._scene_threshold
+                    overdue = last_sample is None or timestamp - last_sample >= self._interval
+                    if not (changed or overdue):
+                        continue
+                    last_histogram = histogram
+
+                last_sample = timestamp
+                yield timestamp, image
+        finally:
+            capture.release()
+
+    @staticmethod
+    def _histogram(image: np.ndarray) -> np.ndarray:
+        import cv2
+
+        small = cv2.resize(image, (64, 36), interpolation=cv2.INTER_AREA)
+        gray = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+        histogram = cv2.calcHist([gray], [0], None, [32], [0, 256])
+        return cv2.normalize(histogram, histogram).flatten()
+
+    def encode_keyframe(self, image: np.ndarray, bounding_box: Optional[dict] = None) -> bytes:
+        from .recognition import OpenCVPreprocessor
+
+        if bounding_box:
+            h, w = image.shape[:2]
+            x1 = max(0, int(bounding_box['x']))
+            y1 = max(0, int(bounding_box['y']))
+            x2 = min(w, x1 + int(bounding_box['width']))
+            y2 = min(h, y1 + int(bounding_box['height']))
+            if x2 > x1 and y2 > y1:
+                image = image[y1:y2, x1:x2]
+
+        return OpenCVPreprocessor.create_thumbnail(image, self._keyframe_size)
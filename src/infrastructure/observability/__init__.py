@@ -0,0 +1,12 @@
+"""Observability Package"""
+from .metrics import get_metrics, mark_process_dead, metrics_available, render_latest
+from .tracing import configure_tracing, configure_tracing_from_settings
+
+__all__ = [
+    'get_metrics',
+    'mark_process_dead',
+    'metrics_available',
+    'render_latest',
+    'configure_tracing',
+    'configure_tracing_from_settings',
+]
@@ -0,0 +1,186 @@
+"""
+Observability - Prometheus Metrics
+Counters and histograms for the /metrics endpoint.
+
+`prometheus_client` es opcional: sin él, todas las métricas son no-ops.
+Con varios workers se usa el modo multiproceso de prometheus_client
+(PROMETHEUS_MULTIPROC_DIR): cada proceso escribe sus valores en archivos
+mmap y /metrics los agrega.
+
+El camino caliente no toca prometheus_client: `inc()`/`observe()` solo
+añaden una tupla a un deque (append es atómico con el GIL, sin locks) y un
+hilo de fondo aplica los eventos a las métricas cada `flush_interval`.
+"""
+import logging
+import os
+import threading
+import time
+from collections import deque
+from typing import Dict, Optional, Tuple
+
+try:
+    import prometheus_client
+    from prometheus_client import multiprocess
+except ImportError:
+    prometheus_client = None
+    multiprocess = None
+
+logger = logging.getLogger(__name__)
+
+_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+_BATCH_BUCKETS = (1, 2, 4, 8, 16, 32, 64)
+_QUERY_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500)
+
+# name -> (type, documentation, label names, extra kwargs)
+METRIC_DEFINITIONS: Dict[str, Tuple[str, str, tuple, dict]] = {
+    'frames_received': ('counter', 'Camera frames received over the WebSocket', (), {}),
+    'frames_processed': ('counter', 'Camera frames that completed the pipeline', (), {}),
+    'frames_dropped': ('counter', 'Camera frames not processed, by reason', ('reason',), {}),
+    'pipeline_stage_seconds': (
+        'histogram', 'Frame pipeline time per stage', ('stage',), {'buckets': _LATENCY_BUCKETS},
+    ),
+    'inference_seconds': (
+        'histogram', 'Model inference latency per call', ('backend',), {'buckets': _LATENCY_BUCKETS},
+    ),
+    'inference_batch_size': (
+        'histogram', 'Images per inference call', ('backend',), {'buckets': _BATCH_BUCKETS},
+    ),
+    'websocket_sessions_active': (
+        'gauge', 'Open recognition WebSocket sessions', (), {'multiprocess_mode': 'livesum'},
+    ),
+    'discoveries_written': ('counter', 'Discoveries inserted into the database', (), {}),
+    'discoveries_dropped': ('counter', 'Discoveries never written, by reason', ('reason',), {}),
+    'catalog_reloads': ('counter', 'Animal catalog cache loads (first use, invalidation or TTL)', (), {}),
+    'decode_cache': (
+        'counter', 'Decoded-pixel cache lookups on ImageFrame, by result', ('result',), {},
+    ),
+    'openrouter_request_seconds': (
+        'histogram', 'OpenRouter call latency', (), {'buckets': _LATENCY_BUCKETS},
+    ),
+    'openrouter_failures': ('counter', 'Failed OpenRouter calls, by reason', ('reason',), {}),
+    'db_queries_per_request': (
+        'histogram', 'Database queries per HTTP request', ('view',), {'buckets': _QUERY_BUCKETS},
+    ),
+}
+
+METRIC_PREFIX = 'pokedex_'
+
+
+def metrics_available() -> bool:
+    return prometheus_client is not None
+
+
+def is_multiprocess() -> bool:
+    return bool(os.environ.get('PROMETHEUS_MULTIPROC_DIR'))
+
+
+class MetricsRecorder:
+    """
+    Lock-free front for Prometheus metrics.
+    Events are queued on a bounded deque and applied by a background thread.
+    """
+
+    def __init__(self, enabled: bool = True, flush_interval: float = 1.0, max_queued: int = 100_000):
+        self._events = deque(maxlen=max_queued)
+        self._flush_interval = max(0.05, flush_interval)
+        self._metrics: Dict[str, object] = {}
+        self._apply_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+        if enabled and prometheus_client is not None:
+            self._metrics = {
+                name: self._create(name, *definition)
+                for name, definition in METRIC_DEFINITIONS.items()
+            }
+            self._thread = threading.Thread(target=self._run, name='metrics-flush', daemon=True)
+            self._thread.start()
+
+    @staticmethod
+    def _create(name: str, kind: str, documentation: str, labels: tuple, options: dict):
+        full_name = METRIC_PREFIX + name
+        if kind == 'counter':
+            return prometheus_client.Counter(full_name, documentation, labels)
+        if kind == 'gauge':
+            return prometheus_client.Gauge(full_name, documentation, labels, **options)
+        return prometheus_client.Histogram(full_name, documentation, labels, **options)
+
+    @property
+    def enabled(self) -> bool:
+        return self._thread is not None
+
+    # ---- hot path ----
+
+    def inc(self, name: str, amount: float = 1, **labels) -> None:
+        if self._thread is not None:
+            self._events.append(('inc', name, labels, amount))
+
+    def dec(self, name: str, amount: float = 1, **labels) -> None:
+        if self._thread is not None:
+            self._events.append(('dec', name, labels, amount))
+
+    def observe(self, name: str, value: float, **labels) -> None:
+        if self._thread is not None:
+            self._events.append(('observe', name, labels, value))
+
+    # ---- background ----
+
+    def flush(self) -> int:
+        """Apply queued events to the Prometheus metrics"""
+        applied = 0
+        with self._apply_lock:
+            while True:
+                try:
+                    action, name, labels, value = self._events.popleft()
+                except IndexError:
+                    return applied
+                metric = self._metrics.get(name)
+                if metric is None:
+                    continue
+                try:
+                    if labels:
+                        metric = metric.labels(**labels)
+                    getattr(metric, action)(value)
+                    applied += 1
+                except Exception as e:
+                    logger.debug(f"Métrica {name} ignorada: {e}")
+
+    def _run(self) -> None:
+        while True:
+            time.sleep(self._flush_interval)
+            self.flush()
+
+
+def render_latest() -> Tuple[bytes, str]:
+    """Exposition text for /metrics (all worker processes in multiprocess mode)"""
+    get_metrics().flush()
+    if is_multiprocess():
+        registry = prometheus_client.CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = prometheus_client.REGISTRY
+    return prometheus_client.generate_latest(registry), prometheus_client.CONTENT_TYPE_LATEST
+
+
+def mark_process_dead(pid: int) -> None:
+    """Drop a dead worker's live gauges (call from the server's child-exit hook)"""
+    if multiprocess is not None and is_multiprocess():
+        multiprocess.mark_process_dead(pid)
+
+
+_metrics_instance: Optional[MetricsRecorder] = None
+_metrics_lock = threading.Lock()
+
+
+def get_metrics() -> MetricsRecorder:
+    """Get the per-process metrics recorder (singleton pattern)"""
+    global _metrics_instance
+    if _metrics_instance is None:
+        with _metrics_lock:
+            if _metrics_instance is None:
+                from django.conf import settings
+
+                _metrics_instance = MetricsRecorder(
+                    enabled=getattr(settings, 'METRICS_ENABLED', True),
+                    flush_interval=getattr(settings, 'METRICS_FLUSH_INTERVAL', 1.0),
+                )
+    return _metrics_instance
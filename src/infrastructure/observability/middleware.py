@@ -0,0 +1,37 @@
+"""
+Observability - Django Middleware
+Per-request database query counts.
+"""
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connection
+
+from .metrics import get_metrics
+
+
+class QueryCountMiddleware:
+    """
+    Counts the queries each request runs on the default connection
+    (connection.execute_wrapper) and records them per view name.
+    Not loaded at all when metrics are disabled.
+    """
+
+    def __init__(self, get_response):
+        if not get_metrics().enabled:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        queries = 0
+
+        def count_query(execute, sql, params, many, context):
+            nonlocal queries
+            queries += 1
+            return execute(sql, params, many, context)
+
+        with connection.execute_wrapper(count_query):
+            response = self.get_response(request)
+
+        match = request.resolver_match
+        view = (match.url_name or match.view_name) if match else 'unmatched'
+        get_metrics().observe('db_queries_per_request', queries, view=view or 'unnamed')
+        return response
@@ -0,0 +1,149 @@
+"""
+Observability - OpenTelemetry Tracing
+Spans for the frame pipeline, HTTP requests and inference.
+
+OpenTelemetry es opcional (opentelemetry-sdk). configure_tracing() instala
+un TracerProvider con muestreo por proporción y registra la fábrica de
+spans de src.application.instrumentation, así cada stage() del pipeline
+(decode, inferencia, repositorios, notify) abre un span. El contexto de
+OpenTelemetry vive en contextvars y sync_to_async lo copia a sus hilos,
+por lo que los spans de los hilos cuelgan del frame correcto.
+
+Exportadores: otlp (opentelemetry-exporter-otlp), console, file (JSON por
+línea, para revisar trazas sin colector) y memory (pruebas).
+"""
+import logging
+import threading
+from typing import Optional, Sequence
+
+try:
+    from opentelemetry import trace
+    from opentelemetry.sdk.resources import Resource
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import (
+        BatchSpanProcessor,
+        ConsoleSpanExporter,
+        SimpleSpanProcessor,
+        SpanExporter,
+        SpanExportResult,
+    )
+    from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+    from opentelemetry.sdk.trace.sampling import ParentBased, TraceIdRatioBased
+except ImportError:
+    trace = None
+    SpanExporter = object
+
+from src.application.instrumentation import set_span_factory
+
+logger = logging.getLogger(__name__)
+
+TRACER_NAME = 'pokedex'
+
+
+class JsonLinesSpanExporter(SpanExporter):
+    """Appends finished spans to a file, one JSON object per line"""
+
+    def __init__(self, path: str):
+        self._path = path
+        self._lock = threading.Lock()
+
+    def export(self, spans: Sequence) -> 'SpanExportResult':
+        lines = [span.to_json(indent=None) for span in spans]
+        try:
+            with self._lock, open(self._path, 'a', encoding='utf-8') as f:
+                f.write('\n'.join(lines) + '\n')
+        except OSError as e:
+            logger.error(f"❌ No se pudieron escribir trazas en {self._path}: {e}")
+            return SpanExportResult.FAILURE
+        return SpanExportResult.SUCCESS
+
+    def shutdown(self) -> None:
+        pass
+
+
+def _build_exporter(name: str, file_path: str):
+    if name == 'console':
+        return ConsoleSpanExporter()
+    if name == 'file':
+        return JsonLinesSpanExporter(file_path)
+    if name == 'memory':
+        return InMemorySpanExporter()
+    try:
+        from opentelemetry.exporter.otlp.proto.grpc.trace_exporter import OTLPSpanExporter
+    except ImportError:
+        logger.warning("⚠️ opentelemetry-exporter-otlp no está instalado, trazas a consola")
+        return ConsoleSpanExporter()
+    return OTLPSpanExporter()
+
+
+def _instrument_django() -> None:
+    """HTTP request spans, when opentelemetry-instrumentation-django is installed"""
+    try:
+        from opentelemetry.instrumentation.django import DjangoInstrumentor
+    except ImportError:
+        return
+    DjangoInstrumentor().instrument()
+
+
+_exporter = None
+_configure_lock = threading.Lock()
+
+
+def configure_tracing(
+    sample_ratio: float = 0.01,
+    exporter: str = 'otlp',
+    file_path: str = 'traces.jsonl',
+    service_name: str = 'pokedex',
+):
+    """
+    Install the tracer provider and the pipeline span factory (once per process).
+
+    Returns:
+        The span exporter, or None when OpenTelemetry isn't installed
+    """
+    global _exporter
+    if trace is None:
+        logger.warning("⚠️ TRACING_ENABLED pero opentelemetry-sdk no está instalado")
+        return None
+
+    with _configure_lock:
+        if _exporter is not None:
+            return _exporter
+
+        # ParentBased: los spans hijos siguen la decisión del frame raíz
+        provider = TracerProvider(
+            sampler=ParentBased(TraceIdRatioBased(min(max(sample_ratio, 0.0), 1.0))),
+            resource=Resource.create({'service.name': service_name}),
+        )
+        span_exporter = _build_exporter(exporter, file_path)
+        if exporter == 'memory':
+            provider.add_span_processor(SimpleSpanProcessor(span_exporter))
+        else:
+            provider.add_span_processor(BatchSpanProcessor(span_exporter))
+        trace.set_tracer_provider(provider)
+
+        tracer = trace.get_tracer(TRACER_NAME)
+
+        def start_span(name: str, attributes: dict):
+            return tracer.start_as_current_span(name, attributes=attributes or None)
+
+        set_span_factory(start_span)
+        _instrument_django()
+        _exporter = span_exporter
+
+        logger.info(f"🔭 Trazas activas ({exporter}, muestreo {sample_ratio:.2%})")
+        return _exporter
+
+
+def configure_tracing_from_settings() -> Optional[object]:
+    """Configure tracing if TRACING_ENABLED is set"""
+    from django.conf import settings
+
+    if not getattr(settings, 'TRACING_ENABLED', False):
+        return None
+    return configure_tracing(
+        sample_ratio=getattr(settings, 'TRACING_SAMPLE_RATIO', 0.01),
+        exporter=getattr(settings, 'TRACING_EXPORTER', 'otlp'),
+        file_path=getattr(settings, 'TRACING_FILE', 'traces.jsonl'),
+        service_name=getattr(settings, 'TRACING_SERVICE_NAME', 'pokedex'),
+    )
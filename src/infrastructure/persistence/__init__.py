@@ -1,16 +1,30 @@
 """Persistence Package"""
-from .models import AnimalModel, SessionModel, DiscoveryModel
+from .models import AnimalModel, AnimalAliasModel, SessionModel, DiscoveryModel
 from .repositories import (
     DjangoAnimalRepository,
     DjangoSessionRepository,
     DjangoDiscoveryRepository,
+    replace_animal_aliases,
 )
+from .write_behind import WriteBehindDiscoveryRepository, get_discovery_repository
+from .catalog import CachedAnimalRepository, get_animal_repository, invalidate_catalog
+from .search import OrmAnimalSearch, PostgresAnimalSearch, get_animal_search
 
 __all__ = [
     'AnimalModel',
+    'AnimalAliasModel',
     'SessionModel',
     'DiscoveryModel',
     'DjangoAnimalRepository',
     'DjangoSessionRepository',
     'DjangoDiscoveryRepository',
+    'replace_animal_aliases',
+    'WriteBehindDiscoveryRepository',
+    'get_discovery_repository',
+    'CachedAnimalRepository',
+    'get_animal_repository',
+    'invalidate_catalog',
+    'OrmAnimalSearch',
+    'PostgresAnimalSearch',
+    'get_animal_search',
 ]
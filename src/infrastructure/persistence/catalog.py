@@ -0,0 +1,292 @@
+"""
+Cached Animal Catalog
+In-process, read-mostly copy of the animal catalog.
+
+El catálogo es pequeño y casi nunca cambia, pero se consulta en cada frame
+(`get_by_name`) y en cada subida (`get_all`). CachedAnimalRepository lo
+carga una vez en un CatalogSnapshot inmutable con índices por id, nombre
+(en minúsculas) y nombre o alias normalizado (sin acentos), y lo comparte entre todas las sesiones del proceso.
+Los listados paginados se sirven de secuencias ya ordenadas por nombre
+(todas, por clase y amenazadas), con búsqueda binaria del cursor.
+El snapshot incluye el índice de resolución de etiquetas del modelo
+(AnimalLabelResolver), que comparten la API REST y el WebSocket.
+
+Invalidación:
+- post_save/post_delete de AnimalModel (al confirmar la transacción), solo
+  en el proceso que hizo el cambio
+- Redis pub/sub, para que los demás procesos (workers del mismo nodo u
+  otros nodos) descarten su copia; necesario con más de un worker
+- CATALOG_CACHE_TTL como red de seguridad si se pierde algún mensaje, y
+  como único aviso entre workers sin pub/sub (por eso es corto por defecto)
+"""
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+
+try:
+    import redis
+except ImportError:
+    redis = None
+
+from src.domain.entities import Animal
+from src.domain.ports import AnimalRepositoryPort
+from src.domain.services import AnimalLabelResolver, fold_label
+from src.domain.value_objects import Page
+from src.infrastructure.observability import get_metrics
+
+logger = logging.getLogger(__name__)
+
+CATALOG_CHANNEL = 'pokedex:catalog:invalidate'
+
+# Guardados que no cambian la ficha del animal (p. ej. la última confianza)
+_IGNORED_UPDATE_FIELDS = frozenset({'last_recognition_confidence', 'updated_at'})
+
+
+@dataclass(frozen=True)
+class CatalogSnapshot:
+    """Immutable catalog with lookup indexes, swapped atomically on reload"""
+    animals: Tuple[Animal, ...]
+    by_id: Mapping[str, Animal]
+    by_name: Mapping[str, Animal]       # nombre en minúsculas
+    by_alias: Mapping[str, Animal]      # nombre o alias normalizado (fold_label)
+    sorted_by_name: Tuple[Animal, ...]
+    by_class: Mapping[str, Tuple[Animal, ...]]  # AnimalClass.name -> ordenados por nombre
+    endangered: Tuple[Animal, ...]              # ordenados por nombre
+    resolver: AnimalLabelResolver
+    loaded_at: float
+
+    @classmethod
+    def build(cls, animals: List[Animal]) -> 'CatalogSnapshot':
+        by_id, by_name, by_alias = {}, {}, {}
+        for animal in animals:
+            by_id[animal.id] = animal
+            by_name.setdefault(animal.name.lower(), animal)
+            by_alias.setdefault(fold_label(animal.name), animal)
+        for animal in animals:
+            for alias in animal.aliases:
+                by_alias.setdefault(fold_label(alias), animal)
+        sorted_by_name = tuple(sorted(animals, key=lambda animal: animal.name))
+        by_class = {}
+        for animal in sorted_by_name:
+            by_class.setdefault(animal.animal_class.name, []).append(animal)
+        return cls(
+            animals=tuple(animals),
+            by_id=MappingProxyType(by_id),
+            by_name=MappingProxyType(by_name),
+            by_alias=MappingProxyType(by_alias),
+            sorted_by_name=sorted_by_name,
+            by_class=MappingProxyType({name: tuple(group) for name, group in by_class.items()}),
+            endangered=tuple(animal for animal in sorted_by_name if animal.is_endangered()),
+            resolver=AnimalLabelResolver(animals),
+            loaded_at=time.monotonic(),
+        )
+
+
+class CachedAnimalRepository(AnimalRepositoryPort):
+    """
+    AnimalRepositoryPort decorator that serves reads from a CatalogSnapshot.
+    Free-text search and writes go to the wrapped repository.
+    """
+
+    def __init__(self, repository: AnimalRepositoryPort, ttl: float = 300.0):
+        self._repository = repository
+        self._ttl = ttl
+        self._snapshot: Optional[CatalogSnapshot] = None
+        self._generation = 0
+        self._load_lock = threading.Lock()
+
+    # ---- snapshot ----
+
+    def snapshot(self) -> CatalogSnapshot:
+        """Current catalog, loading it on first use or after an invalidation"""
+        snapshot = self._snapshot
+        if snapshot is not None and not self._expired(snapshot):
+            return snapshot
+
+        with self._load_lock:
+            snapshot = self._snapshot
+            if snapshot is not None and not self._expired(snapshot):
+                return snapshot
+            generation = self._generation
+            snapshot = CatalogSnapshot.build(self._repository.get_all())
+            # Si llegó una invalidación durante la carga, no se guarda: la
+            # siguiente lectura vuelve a cargar con los datos nuevos
+            if generation == self._generation:
+                self._snapshot = snapshot
+            get_metrics().inc('catalog_reloads')
+            logger.info(f"📚 Catálogo en caché: {len(snapshot.animals)} animales")
+            return snapshot
+
+    def _expired(self, snapshot: CatalogSnapshot) -> bool:
+        return self._ttl > 0 and time.monotonic() - snapshot.loaded_at > self._ttl
+
+    def invalidate(self) -> None:
+        """Drop the cached catalog; the next read reloads it"""
+        self._generation += 1
+        self._snapshot = None
+
+    # ---- reads ----
+
+    def get_by_id(self, animal_id: str) -> Optional[Animal]:
+        return self.snapshot().by_id.get(animal_id)
+
+    def get_by_ids(self, animal_ids: Iterable[str]) -> Dict[str, Animal]:
+        by_id = self.snapshot().by_id
+        return {animal_id: by_id[animal_id] for animal_id in animal_ids if animal_id in by_id}
+
+    def get_by_name(self, name: str) -> Optional[Animal]:
+        return self.snapshot().by_name.get((name or '').strip().lower())
+
+    def get_by_name_or_alias(self, name: str) -> Optional[Animal]:
+        return self.snapshot().by_alias.get(fold_label(name))
+
+    def get_all(self) -> List[Animal]:
+        return list(self.snapshot().animals)
+
+    def get_by_class(self, animal_class: str) -> List[Animal]:
+        animal_class = animal_class.upper()
+        return [a for a in self.snapshot().animals if a.animal_class.name == animal_class]
+
+    def search(self, query: str, limit: Optional[int] = None) -> List[Animal]:
+        return self._repository.search(query, limit)
+
+    def list_page(
+        self,
+        limit: int,
+        cursor: Optional[str] = None,
+        animal_class: Optional[str] = None,
+        endangered: bool = False,
+    ) -> Page:
+        snapshot = self.snapshot()
+        if animal_class:
+            animals = snapshot.by_class.get(animal_class.upper(), ())
+            if endangered:
+                animals = tuple(animal for animal in animals if animal.is_endangered())
+        else:
+            animals = snapshot.endangered if endangered else snapshot.sorted_by_name
+        return Page.from_sorted(animals, limit, key=lambda animal: (animal.name,), cursor=cursor)
+
+    def get_label_resolver(self) -> AnimalLabelResolver:
+        return self.snapshot().resolver
+
+    # ---- writes ----
+
+    def save(self, animal: Animal) -> Animal:
+        saved = self._repository.save(animal)
+        self.invalidate()
+        return saved
+
+
+class CatalogInvalidationBus:
+    """
+    Redis pub/sub channel that tells every node to drop its catalog.
+    Messages from this process are ignored (it already invalidated locally).
+    """
+
+    def __init__(self, url: str, on_invalidate, channel: str = CATALOG_CHANNEL):
+        self._client = redis.Redis.from_url(url)
+        self._on_invalidate = on_invalidate
+        self._channel = channel
+        self._node_id = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self._thread = threading.Thread(target=self._run, name='catalog-invalidation', daemon=True)
+        self._thread.start()
+
+    def publish(self) -> None:
+        try:
+            self._client.publish(self._channel, json.dumps({'node': self._node_id}))
+        except Exception as e:
+            logger.warning(f"⚠️ No se pudo publicar la invalidación del catálogo: {e}")
+
+    def _run(self) -> None:
+        backoff = 1.0
+        while True:
+            try:
+                pubsub = self._client.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(self._channel)
+                # Pudo cambiar algo mientras no estábamos suscritos
+                self._on_invalidate()
+                backoff = 1.0
+                for message in pubsub.listen():
+                    if message.get('type') != 'message':
+                        continue
+                    try:
+                        sender = json.loads(message['data']).get('node')
+                    except (TypeError, ValueError):
+                        sender = None
+                    if sender != self._node_id:
+                        self._on_invalidate()
+            except Exception as e:
+                logger.warning(f"⚠️ Suscripción de invalidación del catálogo caída: {e}")
+                time.sleep(backoff)
+                backoff = min(backoff * 2, 30.0)
+
+
+_catalog_instance: Optional[CachedAnimalRepository] = None
+_catalog_bus: Optional[CatalogInvalidationBus] = None
+_catalog_lock = threading.Lock()
+
+
+def get_animal_repository() -> AnimalRepositoryPort:
+    """
+    Get the animal repository for this worker.
+    With CATALOG_CACHE_ENABLED, one cached catalog is shared by all
+    requests and sessions of the process (singleton pattern).
+    """
+    global _catalog_instance, _catalog_bus
+    from django.conf import settings
+    from .repositories import DjangoAnimalRepository
+
+    if not getattr(settings, 'CATALOG_CACHE_ENABLED', True):
+        return DjangoAnimalRepository()
+
+    if _catalog_instance is None:
+        with _catalog_lock:
+            if _catalog_instance is None:
+                catalog = CachedAnimalRepository(
+                    DjangoAnimalRepository(),
+                    ttl=getattr(settings, 'CATALOG_CACHE_TTL', 10.0),
+                )
+                if getattr(settings, 'CATALOG_CACHE_PUBSUB', False):
+                    if redis is None:
+                        logger.warning("⚠️ CATALOG_CACHE_PUBSUB activo pero redis no está instalado")
+                    else:
+                        _catalog_bus = CatalogInvalidationBus(
+                            getattr(settings, 'CATALOG_CACHE_REDIS_URL', 'redis://localhost:6379/0'),
+                            catalog.invalidate,
+                        )
+                _catalog_instance = catalog
+    return _catalog_instance
+
+
+def invalidate_catalog() -> None:
+    """Drop this process's catalog and tell the other processes to drop theirs"""
+    if _catalog_instance is not None:
+        _catalog_instance.invalidate()
+    if _catalog_bus is not None:
+        _catalog_bus.publish()
+
+
+def _on_animal_changed(sender, instance=None, update_fields=None, **kwargs) -> None:
+    if update_fields and set(update_fields) <= _IGNORED_UPDATE_FIELDS:
+        return
+    from django.db import transaction
+
+    # Tras el commit, para que la recarga vea los datos nuevos
+    transaction.on_commit(invalidate_catalog)
+
+
+def connect_catalog_signals() -> None:
+    """Invalidate the cached catalog whenever an animal or alias row changes"""
+    from django.db.models.signals import post_delete, post_save
+    from .models import AnimalAliasModel, AnimalModel
+
+    post_save.connect(_on_animal_changed, sender=AnimalModel, dispatch_uid='catalog_cache_save')
+    post_delete.connect(_on_animal_changed, sender=AnimalModel, dispatch_uid='catalog_cache_delete')
+    post_save.connect(_on_animal_changed, sender=AnimalAliasModel, dispatch_uid='catalog_alias_save')
+    post_delete.connect(_on_animal_changed, sender=AnimalAliasModel, dispatch_uid='catalog_alias_delete')
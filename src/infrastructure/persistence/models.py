@@ -3,6 +3,7 @@ Django ORM Models
 These models are infrastructure concerns and map to domain entities.
 """
 from django.db import models
+from django.utils import timezone
 from django.contrib.auth import get_user_model
 
 
@@ -51,7 +52,6 @@ class AnimalModel(models.Model):
         choices=ConservationStatus.choices
     )
     fun_facts = models.JSONField(default=list)
-    aliases = models.JSONField(default=list, blank=True)
     average_lifespan = models.CharField(max_length=50, blank=True, null=True)
     average_weight = models.CharField(max_length=50, blank=True, null=True)
     average_height = models.CharField(max_length=50, blank=True, null=True)
@@ -74,6 +74,11 @@ class AnimalModel(models.Model):
         verbose_name = 'Animal'
         verbose_name_plural = 'Animales'
         ordering = ['name']
+        indexes = [
+            # Paginación por clave (keyset) de los listados filtrados
+            models.Index(fields=['animal_class', 'name'], name='animals_class_name_idx'),
+            models.Index(fields=['conservation_status', 'name'], name='animals_status_name_idx'),
+        ]
     
     def __str__(self):
         return f"{self.name} ({self.scientific_name})"
@@ -107,6 +112,32 @@ class AnimalModel(models.Model):
         }
 
 
+class AnimalAliasModel(models.Model):
+    """
+    Alternative names of an animal (and its canonical name), looked up by
+    their accent- and case-folded form through a unique index.
+    """
+    
+    animal = models.ForeignKey(
+        AnimalModel,
+        on_delete=models.CASCADE,
+        related_name='alias_entries'
+    )
+    alias = models.CharField(max_length=100)
+    normalized = models.CharField(max_length=100, unique=True)
+    language = models.CharField(max_length=8, blank=True, default='')
+    is_name = models.BooleanField(default=False, help_text='Fila del nombre canónico del animal')
+    
+    class Meta:
+        db_table = 'animal_aliases'
+        verbose_name = 'Alias'
+        verbose_name_plural = 'Alias'
+        ordering = ['animal', '-is_name', 'id']
+    
+    def __str__(self):
+        return f"{self.alias} -> {self.animal_id}"
+
+
 class SessionModel(models.Model):
     """Database model for UserSession entity"""
     
@@ -121,6 +152,7 @@ class SessionModel(models.Model):
     started_at = models.DateTimeField(auto_now_add=True)
     ended_at = models.DateTimeField(null=True, blank=True)
     is_active = models.BooleanField(default=True)
+    summary = models.JSONField(default=dict, blank=True, help_text='Resumen incremental de la sesión')
     
     class Meta:
         db_table = 'sessions'
@@ -154,7 +186,8 @@ class DiscoveryModel(models.Model):
         related_name='discoveries'
     )
     thumbnail_url = models.URLField()
-    discovered_at = models.DateTimeField(auto_now_add=True)
+    # Hora del descubrimiento, no la del insert (el write-behind inserta después)
+    discovered_at = models.DateTimeField(default=timezone.now)
     location = models.CharField(max_length=200, blank=True, null=True)
     confidence = models.FloatField(default=0.0)
     
@@ -163,6 +196,10 @@ class DiscoveryModel(models.Model):
         verbose_name = 'Descubrimiento'
         verbose_name_plural = 'Descubrimientos'
         ordering = ['-discovered_at']
+        indexes = [
+            # Descubrimientos de una sesión, más recientes primero (keyset)
+            models.Index(fields=['session', 'discovered_at', 'id'], name='discoveries_session_keyset_idx'),
+        ]
     
     def __str__(self):
         return f"Discovery: {self.animal.name} on {self.discovered_at}"
@@ -2,7 +2,10 @@
 Repository Implementations
 These are the adapters that implement the domain ports.
 """
-from typing import List, Optional
+import logging
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+from django.db import transaction
 from django.db.models import Q
 from django.utils import timezone
 
@@ -10,21 +13,77 @@ from src.domain.entities import (
     Animal, 
     Discovery, 
     UserSession,
+    SessionSummary,
     AnimalClass,
     DietType,
     ConservationStatus,
+    ENDANGERED_STATUSES,
 )
+from src.domain.exceptions import InvalidCursorException
 from src.domain.ports import (
     AnimalRepositoryPort,
     DiscoveryRepositoryPort,
     SessionRepositoryPort,
 )
-from .models import AnimalModel, SessionModel, DiscoveryModel
+from src.domain.services import MODEL_LABEL_CANDIDATES, fold_label
+from src.domain.value_objects import Page, decode_cursor
+from src.infrastructure.observability import get_metrics
+from .models import AnimalAliasModel, AnimalModel, SessionModel, DiscoveryModel
+
+logger = logging.getLogger(__name__)
+
+
+def replace_animal_aliases(
+    animal_id: str,
+    name: str,
+    aliases: Iterable[str] = (),
+    language: str = '',
+    name_language: str = 'es',
+) -> int:
+    """
+    Rewrite the alias rows of an animal: its canonical name plus `aliases`.
+    Normalized forms already owned by another animal are skipped.
+    
+    Returns:
+        Number of rows written
+    """
+    rows, seen = [], set()
+    for alias, alias_language, is_name in [(name, name_language, True)] + [
+        (alias, language, False) for alias in aliases
+    ]:
+        alias = (alias or '').strip()[:100]
+        normalized = fold_label(alias)
+        if not normalized or normalized in seen:
+            continue
+        seen.add(normalized)
+        rows.append(AnimalAliasModel(
+            animal_id=animal_id,
+            alias=alias,
+            normalized=normalized,
+            language=alias_language,
+            is_name=is_name,
+        ))
+    
+    with transaction.atomic():
+        AnimalAliasModel.objects.filter(animal_id=animal_id).delete()
+        taken = set(
+            AnimalAliasModel.objects.filter(normalized__in=seen).values_list('normalized', flat=True)
+        )
+        rows = [row for row in rows if row.normalized not in taken]
+        AnimalAliasModel.objects.bulk_create(rows)
+        # bulk_create no emite señales: invalidar el catálogo al confirmar
+        from .catalog import invalidate_catalog
+        transaction.on_commit(invalidate_catalog)
+    return len(rows)
 
 
 class DjangoAnimalRepository(AnimalRepositoryPort):
     """Django ORM implementation of AnimalRepositoryPort"""
     
+    @staticmethod
+    def _queryset():
+        return AnimalModel.objects.prefetch_related('alias_entries')
+    
     def _to_entity(self, model: AnimalModel) -> Animal:
         """Convert ORM model to domain entity"""
         return Animal(
@@ -43,6 +102,9 @@ class DjangoAnimalRepository(AnimalRepositoryPort):
             geographic_distribution=model.geographic_distribution,
             image_url=model.image_url,
             sound_url=model.sound_url,
+            aliases=tuple(
+                entry.alias for entry in model.alias_entries.all() if not entry.is_name
+            ),
         )
     
     def _to_model(self, entity: Animal) -> AnimalModel:
@@ -67,38 +129,84 @@ class DjangoAnimalRepository(AnimalRepositoryPort):
     
     def get_by_id(self, animal_id: str) -> Optional[Animal]:
         try:
-            model = AnimalModel.objects.get(id=animal_id)
+            model = self._queryset().get(id=animal_id)
             return self._to_entity(model)
         except AnimalModel.DoesNotExist:
             return None
     
     def get_by_name(self, name: str) -> Optional[Animal]:
         try:
-            model = AnimalModel.objects.get(name__iexact=name)
+            model = self._queryset().get(name__iexact=name)
             return self._to_entity(model)
         except AnimalModel.DoesNotExist:
             return None
     
-    def get_all(self) -> List[Animal]:
-        models = AnimalModel.objects.all()
-        return [self._to_entity(m) for m in models]
+    def get_by_ids(self, animal_ids: Iterable[str]) -> Dict[str, Animal]:
+        models = self._queryset().in_bulk(set(animal_ids))
+        return {animal_id: self._to_entity(m) for animal_id, m in models.items()}
+    
+    def get_by_name_or_alias(self, name: str) -> Optional[Animal]:
+        model = self._queryset().filter(alias_entries__normalized=fold_label(name)).first()
+        return self._to_entity(model) if model else None
     
-    def search(self, query: str) -> List[Animal]:
-        models = AnimalModel.objects.filter(
-            Q(name__icontains=query) |
-            Q(scientific_name__icontains=query) |
-            Q(description__icontains=query)
+    def resolve_label(self, label: str, partial: bool = False) -> Optional[Animal]:
+        """Exact matches in one indexed query; only partial matching loads the catalog"""
+        keys = [fold_label(c) for c in MODEL_LABEL_CANDIDATES.get(fold_label(label), [])]
+        keys.append(fold_label(label))
+        owners = dict(
+            AnimalAliasModel.objects.filter(normalized__in=keys).values_list('normalized', 'animal_id')
         )
+        for key in keys:
+            if key in owners:
+                return self.get_by_id(owners[key])
+        if partial:
+            return super().resolve_label(label, partial=True)
+        return None
+    
+    def get_all(self) -> List[Animal]:
+        models = self._queryset().all()
         return [self._to_entity(m) for m in models]
     
+    def search(self, query: str, limit: Optional[int] = None) -> List[Animal]:
+        from django.conf import settings
+        from .search import get_animal_search
+        
+        limit = limit or getattr(settings, 'ANIMAL_SEARCH_MAX_RESULTS', 50)
+        ids = get_animal_search().search(query, limit)
+        models = self._queryset().in_bulk(ids)
+        return [self._to_entity(models[i]) for i in ids if i in models]
+    
     def save(self, animal: Animal) -> Animal:
         model = self._to_model(animal)
-        model.save()
+        with transaction.atomic():
+            model.save()
+            replace_animal_aliases(animal.id, animal.name, animal.aliases)
         return animal
     
     def get_by_class(self, animal_class: str) -> List[Animal]:
-        models = AnimalModel.objects.filter(animal_class=animal_class.upper())
+        models = self._queryset().filter(animal_class=animal_class.upper())
         return [self._to_entity(m) for m in models]
+    
+    def list_page(
+        self,
+        limit: int,
+        cursor: Optional[str] = None,
+        animal_class: Optional[str] = None,
+        endangered: bool = False,
+    ) -> Page:
+        """Keyset page on (name): reads limit + 1 rows whatever the page number"""
+        models = self._queryset()
+        if animal_class:
+            models = models.filter(animal_class=animal_class.upper())
+        if endangered:
+            models = models.filter(conservation_status__in=[status.name for status in ENDANGERED_STATUSES])
+        if cursor:
+            (name,) = decode_cursor(cursor, 1)
+            models = models.filter(name__gt=name)
+        rows = list(models.order_by('name')[:limit + 1])
+        return Page.from_overflow(
+            [self._to_entity(m) for m in rows], limit, key=lambda animal: (animal.name,)
+        )
 
 
 class DjangoSessionRepository(SessionRepositoryPort):
@@ -112,6 +220,7 @@ class DjangoSessionRepository(SessionRepositoryPort):
             started_at=model.started_at,
             is_active=model.is_active,
             discoveries=[],  # Loaded separately if needed
+            summary=SessionSummary.from_dict(model.summary),
         )
     
     def create(self, session: UserSession) -> UserSession:
@@ -136,11 +245,11 @@ class DjangoSessionRepository(SessionRepositoryPort):
         )
         return session
     
-    def end_session(self, session_id: str) -> None:
-        SessionModel.objects.filter(id=session_id).update(
-            is_active=False,
-            ended_at=timezone.now(),
-        )
+    def end_session(self, session_id: str, summary: Optional[SessionSummary] = None) -> None:
+        fields = {'is_active': False, 'ended_at': timezone.now()}
+        if summary is not None:
+            fields['summary'] = summary.to_dict()
+        SessionModel.objects.filter(id=session_id).update(**fields)
 
 
 class DjangoDiscoveryRepository(DiscoveryRepositoryPort):
@@ -159,23 +268,76 @@ class DjangoDiscoveryRepository(DiscoveryRepositoryPort):
             confidence=model.confidence,
         )
     
-    def save(self, discovery: Discovery) -> Discovery:
-        model = DiscoveryModel(
+    def _to_model(self, discovery: Discovery) -> DiscoveryModel:
+        """Convert domain entity to ORM model"""
+        return DiscoveryModel(
             id=discovery.id,
             session_id=discovery.session_id,
             user_id=discovery.user_id,
             animal_id=discovery.animal_id,
             thumbnail_url=discovery.thumbnail_url,
+            discovered_at=discovery.discovered_at,
             location=discovery.location,
             confidence=discovery.confidence,
         )
-        model.save()
+    
+    def save(self, discovery: Discovery) -> Discovery:
+        self._to_model(discovery).save()
+        get_metrics().inc('discoveries_written')
         return discovery
     
+    def save_many(self, discoveries: List[Discovery]) -> List[Discovery]:
+        """
+        Insert all discoveries with a single bulk_create.
+        Rows whose id already exists are skipped, logged and left out of the
+        returned list. An id inserted concurrently raises IntegrityError and
+        nothing from the batch is written.
+        """
+        if not discoveries:
+            return []
+        existing = set(
+            DiscoveryModel.objects
+            .filter(id__in=[discovery.id for discovery in discoveries])
+            .values_list('id', flat=True)
+        )
+        fresh = [discovery for discovery in discoveries if discovery.id not in existing]
+        if existing:
+            logger.warning(f"⚠️ {len(existing)} descubrimientos ya existían, no se insertan: {sorted(existing)}")
+            get_metrics().inc('discoveries_dropped', len(existing), reason='conflict')
+        if fresh:
+            # Sin ignore_conflicts: o entran todas las filas nuevas o ninguna
+            with transaction.atomic():
+                DiscoveryModel.objects.bulk_create([self._to_model(discovery) for discovery in fresh])
+            get_metrics().inc('discoveries_written', len(fresh))
+        return fresh
+    
+    def update_thumbnail_url(self, discovery_id: str, thumbnail_url: str) -> None:
+        DiscoveryModel.objects.filter(id=discovery_id).update(thumbnail_url=thumbnail_url)
+    
     def get_by_session(self, session_id: str) -> List[Discovery]:
         models = DiscoveryModel.objects.filter(session_id=session_id)
         return [self._to_entity(m) for m in models]
     
+    def get_page_by_session(self, session_id: str, limit: int, cursor: Optional[str] = None) -> Page:
+        """Newest-first keyset page on (discovered_at, id), over discoveries_session_keyset_idx"""
+        models = DiscoveryModel.objects.filter(session_id=session_id)
+        if cursor:
+            discovered_at, discovery_id = decode_cursor(cursor, 2)
+            try:
+                discovered_at = datetime.fromisoformat(discovered_at)
+            except ValueError:
+                raise InvalidCursorException(cursor)
+            models = models.filter(
+                Q(discovered_at__lt=discovered_at)
+                | Q(discovered_at=discovered_at, id__lt=discovery_id)
+            )
+        rows = list(models.order_by('-discovered_at', '-id')[:limit + 1])
+        return Page.from_overflow(
+            [self._to_entity(m) for m in rows],
+            limit,
+            key=Discovery.cursor_key,
+        )
+    
     def get_by_user(self, user_id: str) -> List[Discovery]:
         models = DiscoveryModel.objects.filter(user_id=user_id)
         return [self._to_entity(m) for m in models]
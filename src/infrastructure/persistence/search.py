@@ -0,0 +1,155 @@
+"""
+Animal Search Backends
+Ranked catalog search returning animal ids.
+
+En PostgreSQL la migración 0009 añade a `animals` una columna generada
+`search_vector` (configuración 'spanish' sin acentos: nombre A, nombre
+científico B, descripción C) con índice GIN, e índices trigram (pg_trgm)
+sobre el nombre y los alias normalizados. PostgresAnimalSearch combina el
+rango de texto completo con la similitud trigram, que tolera erratas en
+los nombres ("elefnte" -> Elefante).
+
+Con SQLite (desarrollo) o si la migración no pudo crear las extensiones,
+OrmAnimalSearch mantiene la búsqueda `icontains` de siempre, ordenada por
+dónde coincide.
+"""
+import logging
+import threading
+from typing import List, Optional
+
+from django.db import connection
+from django.db.models import Case, IntegerField, Q, Value, When
+
+from src.domain.services import fold_label
+from .models import AnimalModel
+
+logger = logging.getLogger(__name__)
+
+
+class OrmAnimalSearch:
+    """
+    Portable icontains search; name matches rank above scientific name and
+    description. Names and aliases also match without accents, through the
+    normalized column of animal_aliases.
+    """
+
+    name = 'orm'
+
+    def search(self, query: str, limit: int) -> List[str]:
+        folded = fold_label(query) or query
+        matches = (
+            AnimalModel.objects
+            .filter(
+                Q(name__icontains=query)
+                | Q(alias_entries__normalized__contains=folded)
+                | Q(scientific_name__icontains=query)
+                | Q(description__icontains=query)
+            )
+            .annotate(match_rank=Case(
+                When(name__icontains=query, then=Value(0)),
+                When(alias_entries__normalized__contains=folded, then=Value(1)),
+                When(scientific_name__icontains=query, then=Value(2)),
+                default=Value(3),
+                output_field=IntegerField(),
+            ))
+            .order_by('match_rank', 'name')
+            .values_list('id', flat=True)
+        )
+        # El join con alias puede repetir animales
+        ids = []
+        for animal_id in matches.iterator():
+            if animal_id not in ids:
+                ids.append(animal_id)
+                if len(ids) >= limit:
+                    break
+        return ids
+
+
+class PostgresAnimalSearch:
+    """Full-text (tsvector + GIN) and trigram search, ranked in one query"""
+
+    name = 'postgres'
+
+    # % es el operador de similitud de pg_trgm (escapado para el cursor)
+    SQL = """
+        WITH q AS (
+            SELECT websearch_to_tsquery('spanish', pokedex_unaccent(%(query)s)) AS tsq,
+                   pokedex_unaccent(lower(%(query)s)) AS term
+        ),
+        candidates AS (
+            SELECT a.id, a.name,
+                   ts_rank_cd(a.search_vector, q.tsq) AS text_rank,
+                   similarity(pokedex_unaccent(lower(a.name)), q.term) AS name_similarity
+            FROM animals a, q
+            WHERE a.search_vector @@ q.tsq
+               OR pokedex_unaccent(lower(a.name)) %% q.term
+            UNION ALL
+            SELECT a.id, a.name, 0.0, similarity(al.normalized, q.term)
+            FROM animal_aliases al
+            JOIN animals a ON a.id = al.animal_id
+            CROSS JOIN q
+            WHERE al.normalized %% q.term
+        )
+        SELECT id
+        FROM candidates
+        GROUP BY id, name
+        ORDER BY MAX(text_rank) + MAX(name_similarity) DESC, name
+        LIMIT %(limit)s
+    """
+
+    def __init__(self, similarity_threshold: float = 0.3):
+        self._similarity_threshold = similarity_threshold
+
+    def search(self, query: str, limit: int) -> List[str]:
+        with connection.cursor() as cursor:
+            # Umbral del operador % (por conexión; el mismo valor en cada búsqueda)
+            cursor.execute(
+                "SELECT set_config('pg_trgm.similarity_threshold', %s, false)",
+                [str(self._similarity_threshold)],
+            )
+            cursor.execute(self.SQL, {'query': query, 'limit': limit})
+            return [row[0] for row in cursor.fetchall()]
+
+    @staticmethod
+    def available() -> bool:
+        """Whether migration 0009 could set up the search column on this database"""
+        if connection.vendor != 'postgresql':
+            return False
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT 1 FROM information_schema.columns "
+                "WHERE table_name = 'animals' AND column_name = 'search_vector'"
+            )
+            return cursor.fetchone() is not None
+
+
+_search_instance = None
+_search_lock = threading.Lock()
+
+
+def get_animal_search():
+    """
+    Get the search backend for this worker (singleton pattern).
+    ANIMAL_SEARCH_BACKEND: 'auto' (PostgreSQL if available), 'postgres' or 'orm'.
+    """
+    global _search_instance
+    if _search_instance is None:
+        with _search_lock:
+            if _search_instance is None:
+                from django.conf import settings
+
+                choice = getattr(settings, 'ANIMAL_SEARCH_BACKEND', 'auto')
+                backend: Optional[object] = None
+                if choice in ('auto', 'postgres'):
+                    try:
+                        if PostgresAnimalSearch.available():
+                            backend = PostgresAnimalSearch(
+                                getattr(settings, 'ANIMAL_SEARCH_SIMILARITY', 0.3)
+                            )
+                    except Exception as e:
+                        logger.warning(f"⚠️ Búsqueda PostgreSQL no disponible: {e}")
+                    if backend is None and choice == 'postgres':
+                        logger.warning("⚠️ ANIMAL_SEARCH_BACKEND=postgres sin columna search_vector, usando ORM")
+                _search_instance = backend or OrmAnimalSearch()
+                logger.info(f"🔎 Búsqueda de animales: {_search_instance.name}")
+    return _search_instance
@@ -0,0 +1,242 @@
+"""
+Write-Behind Discovery Repository
+Buffers discoveries from every session of the worker and inserts them in
+batches, off the frame path.
+
+`save()` solo encola y retorna de inmediato, así el cliente recibe el
+descubrimiento sin esperar a la base de datos. Un hilo de fondo vacía el
+buffer con `save_many` (bulk_create) cuando se llena o cada
+`flush_interval` segundos, y una vez más al apagar el proceso.
+
+Si el lote falla se guarda fila a fila: las filas inválidas (IntegrityError,
+DataError) se registran y descartan, y solo las que fallan por otros
+motivos (p. ej. la base de datos caída) vuelven a la cola.
+"""
+import atexit
+import logging
+import threading
+import time
+from typing import List, Optional
+
+from src.domain.entities import Discovery
+from src.domain.ports import DiscoveryRepositoryPort
+from src.domain.value_objects import Page, decode_cursor, encode_cursor
+from src.infrastructure.observability import get_metrics
+
+logger = logging.getLogger(__name__)
+
+
+class WriteBehindDiscoveryRepository(DiscoveryRepositoryPort):
+    """
+    DiscoveryRepositoryPort decorator with a write-behind buffer.
+    Reads go to the wrapped repository and include discoveries that are
+    still pending, so callers always see their own writes.
+    """
+
+    def __init__(
+        self,
+        repository: DiscoveryRepositoryPort,
+        batch_size: int = 50,
+        flush_interval: float = 1.0,
+        max_pending: int = 10000,
+    ):
+        self._repository = repository
+        self._batch_size = max(1, batch_size)
+        self._flush_interval = max(0.05, flush_interval)
+        self._max_pending = max(self._batch_size, max_pending)
+
+        self._pending: List[Discovery] = []
+        self._condition = threading.Condition()
+        self._flush_lock = threading.Lock()
+        self._closed = False
+        self._flushed = 0
+        self._failed_flushes = 0
+
+        self._thread = threading.Thread(
+            target=self._run, name='discovery-write-behind', daemon=True
+        )
+        self._thread.start()
+        atexit.register(self.close)
+
+    # ---- writes ----
+
+    def save(self, discovery: Discovery) -> Discovery:
+        """Queue a discovery; it is inserted by the next flush"""
+        with self._condition:
+            if self._closed:
+                # Después del cierre se escribe directamente
+                return self._repository.save(discovery)
+            self._pending.append(discovery)
+            if len(self._pending) >= self._batch_size:
+                self._condition.notify()
+        return discovery
+
+    def save_many(self, discoveries: List[Discovery]) -> List[Discovery]:
+        for discovery in discoveries:
+            self.save(discovery)
+        return discoveries
+
+    def update_thumbnail_url(self, discovery_id: str, thumbnail_url: str) -> None:
+        """Patch a still-pending discovery in place, otherwise update the stored row"""
+        # El flush_lock espera a un lote en curso para no perder la actualización
+        with self._flush_lock:
+            with self._condition:
+                for discovery in self._pending:
+                    if discovery.id == discovery_id:
+                        discovery.thumbnail_url = thumbnail_url
+                        return
+            self._repository.update_thumbnail_url(discovery_id, thumbnail_url)
+
+    def flush(self) -> int:
+        """Insert everything pending now; returns how many were written"""
+        with self._flush_lock:
+            with self._condition:
+                batch, self._pending = self._pending, []
+            if not batch:
+                return 0
+
+            from django.db import close_old_connections
+
+            close_old_connections()
+            try:
+                saved = self._repository.save_many(batch)
+                self._flushed += len(saved)
+                return len(saved)
+            except Exception as e:
+                self._failed_flushes += 1
+                logger.error(f"❌ Error guardando {len(batch)} descubrimientos, se guardan uno a uno: {e}")
+                return self._save_individually(batch)
+
+    def _save_individually(self, batch: List[Discovery]) -> int:
+        """Fallback for a failed batch: drop invalid rows, requeue the rest"""
+        from django.db import DataError, IntegrityError
+
+        written, retry = 0, []
+        for discovery in batch:
+            try:
+                self._repository.save(discovery)
+                written += 1
+            except (IntegrityError, DataError) as e:
+                # Reintentar no lo arreglaría: se descarta solo esta fila
+                logger.error(f"❌ Descubrimiento {discovery.id} descartado: {e}")
+                get_metrics().inc('discoveries_dropped', reason='invalid')
+            except Exception as e:
+                logger.error(f"❌ Descubrimiento {discovery.id} pendiente de reintento: {e}")
+                retry.append(discovery)
+        self._flushed += written
+        if retry:
+            self._requeue(retry)
+        return written
+
+    def _requeue(self, batch: List[Discovery]) -> None:
+        with self._condition:
+            # Reintentar en el próximo flush sin crecer sin límite
+            room = max(self._max_pending - len(self._pending), 0)
+            if room < len(batch):
+                logger.error(f"⚠️ Se descartan {len(batch) - room} descubrimientos")
+                get_metrics().inc('discoveries_dropped', len(batch) - room, reason='overflow')
+            self._pending[:0] = batch[:room]
+
+    def close(self) -> None:
+        """Stop the background thread and flush what is left"""
+        with self._condition:
+            if self._closed:
+                return
+            self._closed = True
+            self._condition.notify()
+        self._thread.join(timeout=self._flush_interval + 5)
+        self.flush()
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                deadline = time.monotonic() + self._flush_interval
+                while not self._closed and len(self._pending) < self._batch_size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._condition.wait(remaining)
+                if self._closed:
+                    return
+            self.flush()
+
+    # ---- reads ----
+
+    def _pending_where(self, predicate) -> List[Discovery]:
+        with self._condition:
+            return [discovery for discovery in self._pending if predicate(discovery)]
+
+    def _merge(self, stored: List[Discovery], pending: List[Discovery]) -> List[Discovery]:
+        if not pending:
+            return stored
+        stored_ids = {discovery.id for discovery in stored}
+        return stored + [discovery for discovery in pending if discovery.id not in stored_ids]
+
+    def get_by_session(self, session_id: str) -> List[Discovery]:
+        pending = self._pending_where(lambda d: d.session_id == session_id)
+        return self._merge(self._repository.get_by_session(session_id), pending)
+
+    def get_page_by_session(self, session_id: str, limit: int, cursor: Optional[str] = None) -> Page:
+        """Stored page merged with the session's pending discoveries past the cursor"""
+        before = decode_cursor(cursor, 2) if cursor else None
+        pending = self._pending_where(
+            lambda d: d.session_id == session_id and (before is None or d.cursor_key() < before)
+        )
+        page = self._repository.get_page_by_session(session_id, limit, cursor)
+        if not pending:
+            return page
+
+        items = sorted(self._merge(list(page.items), pending), key=Discovery.cursor_key, reverse=True)
+        if len(items) > limit or page.next_cursor:
+            # Los pendientes que no caben quedan después del cursor: salen en la página siguiente
+            items = items[:limit]
+            return Page(tuple(items), encode_cursor(items[-1].cursor_key()))
+        return Page(tuple(items))
+
+    def get_by_user(self, user_id: str) -> List[Discovery]:
+        pending = self._pending_where(lambda d: d.user_id == user_id)
+        return self._merge(self._repository.get_by_user(user_id), pending)
+
+    def get_unique_animals_by_session(self, session_id: str) -> List[str]:
+        animal_ids = list(self._repository.get_unique_animals_by_session(session_id))
+        for discovery in self._pending_where(lambda d: d.session_id == session_id):
+            if discovery.animal_id not in animal_ids:
+                animal_ids.append(discovery.animal_id)
+        return animal_ids
+
+    def stats(self) -> dict:
+        with self._condition:
+            pending = len(self._pending)
+        return {
+            'pending': pending,
+            'flushed': self._flushed,
+            'failed_flushes': self._failed_flushes,
+        }
+
+
+_write_behind_instance: Optional[WriteBehindDiscoveryRepository] = None
+_write_behind_lock = threading.Lock()
+
+
+def get_discovery_repository() -> DiscoveryRepositoryPort:
+    """
+    Get the discovery repository for this worker.
+    With DISCOVERY_WRITE_BEHIND enabled, one buffered repository is shared
+    by all sessions of the process (singleton pattern).
+    """
+    global _write_behind_instance
+    from django.conf import settings
+    from .repositories import DjangoDiscoveryRepository
+
+    if not getattr(settings, 'DISCOVERY_WRITE_BEHIND', True):
+        return DjangoDiscoveryRepository()
+
+    if _write_behind_instance is None:
+        with _write_behind_lock:
+            if _write_behind_instance is None:
+                _write_behind_instance = WriteBehindDiscoveryRepository(
+                    DjangoDiscoveryRepository(),
+                    batch_size=getattr(settings, 'DISCOVERY_FLUSH_BATCH_SIZE', 50),
+                    flush_interval=getattr(settings, 'DISCOVERY_FLUSH_INTERVAL', 1.0),
+                )
+    return _write_behind_instance
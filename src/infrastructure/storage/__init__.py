@@ -1,4 +1,11 @@
 """Storage Package"""
 from .image_storage import LocalImageStorage, S3ImageStorage, get_image_storage
+from .thumbnail_pipeline import BackgroundThumbnailPipeline, get_thumbnail_pipeline
 
-__all__ = ['LocalImageStorage', 'S3ImageStorage', 'get_image_storage']
+__all__ = [
+    'LocalImageStorage',
+    'S3ImageStorage',
+    'get_image_storage',
+    'BackgroundThumbnailPipeline',
+    'get_thumbnail_pipeline',
+]
@@ -14,6 +14,27 @@ from src.domain.exceptions import StorageException
 
 logger = logging.getLogger(__name__)
 
+# Tamaño máximo de las miniaturas de descubrimientos
+THUMBNAIL_SIZE = (320, 320)
+
+
+def _encode_thumbnail(image: ImageFrame) -> bytes:
+    from src.infrastructure.ml.recognition import OpenCVPreprocessor
+    return OpenCVPreprocessor.create_thumbnail(image.decoded, THUMBNAIL_SIZE)
+
+
+def thumbnail_bytes(image: ImageFrame) -> bytes:
+    """
+    Encoded thumbnail for a frame.
+    Reuses a pre-encoded thumbnail, or encodes one (once) from the pixels the
+    recognizer already decoded; frames never decoded are stored as they are.
+    """
+    if image.thumbnail is not None:
+        return image.thumbnail
+    if image.decoded is None:
+        return image.data
+    return image.get_thumbnail(_encode_thumbnail)
+
 
 class LocalImageStorage(ImageStoragePort):
     """
@@ -31,7 +52,7 @@ class LocalImageStorage(ImageStoragePort):
             filepath = os.path.join(self._base_path, filename)
             
             with open(filepath, 'wb') as f:
-                f.write(image.data)
+                f.write(thumbnail_bytes(image))
             
             # Return relative URL
             return f"{settings.MEDIA_URL}thumbnails/{filename}"
@@ -85,12 +106,13 @@ class S3ImageStorage(ImageStoragePort):
         """Save a thumbnail to S3 and return its URL"""
         try:
             key = f"{self._base_path}/{filename}"
+            data = thumbnail_bytes(image)
             
             self._s3_client.put_object(
                 Bucket=self._bucket_name,
                 Key=key,
-                Body=image.data,
-                ContentType=f'image/{image.format}',
+                Body=bytes(data) if isinstance(data, memoryview) else data,
+                ContentType='image/jpeg' if image.thumbnail is not None else f'image/{image.format}',
             )
             
             # Return public URL
@@ -0,0 +1,145 @@
+"""
+Background Thumbnail Pipeline
+Implements the ThumbnailPipelinePort with a small worker pool.
+
+El recorte al bounding box, el redimensionado, la codificación JPEG y la
+subida se hacen fuera del camino del frame. El descubrimiento se guarda
+con una URL provisional y `on_stored` recibe la URL final al terminar.
+"""
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional, Tuple
+
+import numpy as np
+
+from src.domain.value_objects import ImageFrame
+from src.domain.ports import ImageStoragePort, ThumbnailPipelinePort
+from .image_storage import THUMBNAIL_SIZE, get_image_storage
+
+logger = logging.getLogger(__name__)
+
+
+def crop_to_box(
+    image: np.ndarray,
+    bounding_box: Optional[dict],
+    margin: float = 0.1,
+    scale: int = 1,
+) -> np.ndarray:
+    """
+    Crop to the detection box plus a margin; the full image if there's no usable box.
+    The box is in original-image coordinates; `scale` is the image's reduction factor.
+    """
+    if not bounding_box:
+        return image
+    if scale != 1:
+        from src.infrastructure.ml.decoding import scale_bounding_box
+        bounding_box = scale_bounding_box(bounding_box, 1 / scale)
+
+    h, w = image.shape[:2]
+    box_w = int(bounding_box.get('width', 0))
+    box_h = int(bounding_box.get('height', 0))
+    if box_w <= 0 or box_h <= 0:
+        return image
+
+    pad_x = int(box_w * margin)
+    pad_y = int(box_h * margin)
+    x1 = max(0, int(bounding_box['x']) - pad_x)
+    y1 = max(0, int(bounding_box['y']) - pad_y)
+    x2 = min(w, int(bounding_box['x']) + box_w + pad_x)
+    y2 = min(h, int(bounding_box['y']) + box_h + pad_y)
+    if x2 <= x1 or y2 <= y1:
+        return image
+    return image[y1:y2, x1:x2]
+
+
+class BackgroundThumbnailPipeline(ThumbnailPipelinePort):
+    """
+    Thumbnail pipeline backed by a thread pool.
+    At most `max_pending` jobs are queued; beyond that the job runs inline
+    so no discovery ends up without a thumbnail.
+    """
+
+    def __init__(
+        self,
+        image_storage: ImageStoragePort,
+        size: Tuple[int, int] = THUMBNAIL_SIZE,
+        max_workers: int = 2,
+        max_pending: int = 64,
+    ):
+        self._storage = image_storage
+        self._size = size
+        self._executor = ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix='thumbnail')
+        self._slots = threading.BoundedSemaphore(max(1, max_pending))
+
+    def provisional_url(self, filename: str) -> str:
+        return self._storage.get_thumbnail_url(filename)
+
+    def submit(
+        self,
+        frame: ImageFrame,
+        filename: str,
+        bounding_box: Optional[dict] = None,
+        on_stored: Optional[Callable[[str], None]] = None,
+    ) -> None:
+        if not self._slots.acquire(blocking=False):
+            logger.warning("⚠️ Cola de miniaturas llena, procesando en línea")
+            self._process(frame, filename, bounding_box, on_stored)
+            return
+
+        def job():
+            try:
+                self._process(frame, filename, bounding_box, on_stored)
+            finally:
+                self._slots.release()
+
+        self._executor.submit(job)
+
+    def encode(self, frame: ImageFrame, bounding_box: Optional[dict] = None) -> bytes:
+        """Crop, resize and encode a compact JPEG thumbnail"""
+        from src.infrastructure.ml.decoding import image_scale
+        from src.infrastructure.ml.recognition import OpenCVPreprocessor, decode_frame
+
+        # Reutiliza los píxeles que ya decodificó el reconocedor
+        image = decode_frame(frame)
+        return OpenCVPreprocessor.create_thumbnail(
+            crop_to_box(image, bounding_box, scale=image_scale(image)), self._size
+        )
+
+    def _process(
+        self,
+        frame: ImageFrame,
+        filename: str,
+        bounding_box: Optional[dict],
+        on_stored: Optional[Callable[[str], None]],
+    ) -> None:
+        try:
+            thumbnail = self.encode(frame, bounding_box)
+            url = self._storage.save_thumbnail(
+                ImageFrame(data=thumbnail, format='jpeg', thumbnail=thumbnail),
+                filename,
+            )
+            if on_stored:
+                on_stored(url)
+        except Exception as e:
+            logger.error(f"❌ Error generando miniatura {filename}: {e}")
+
+
+_pipeline_instance: Optional[BackgroundThumbnailPipeline] = None
+_pipeline_lock = threading.Lock()
+
+
+def get_thumbnail_pipeline() -> BackgroundThumbnailPipeline:
+    """Get the per-process thumbnail pipeline (singleton pattern)"""
+    global _pipeline_instance
+    if _pipeline_instance is None:
+        with _pipeline_lock:
+            if _pipeline_instance is None:
+                from django.conf import settings
+
+                _pipeline_instance = BackgroundThumbnailPipeline(
+                    get_image_storage(),
+                    max_workers=getattr(settings, 'THUMBNAIL_WORKERS', 2),
+                    max_pending=getattr(settings, 'THUMBNAIL_MAX_PENDING', 64),
+                )
+    return _pipeline_instance
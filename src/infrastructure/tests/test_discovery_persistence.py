@@ -0,0 +1,89 @@
+"""
+Discoveries through the write-behind buffer and the Django repositories.
+Run with: python manage.py test src.infrastructure.tests
+"""
+from datetime import timedelta
+
+from django.test import TransactionTestCase
+
+from src.application.use_cases import EndSessionUseCase
+from src.domain.entities import Discovery, UserSession, utc_now
+from src.infrastructure.persistence.models import AnimalModel, DiscoveryModel, SessionModel
+from src.infrastructure.persistence.repositories import (
+    DjangoAnimalRepository,
+    DjangoDiscoveryRepository,
+    DjangoSessionRepository,
+)
+from src.infrastructure.persistence.write_behind import WriteBehindDiscoveryRepository
+
+
+def create_animal(animal_id: str, name: str) -> AnimalModel:
+    return AnimalModel.objects.create(
+        id=animal_id,
+        name=name,
+        scientific_name=name,
+        description='',
+        animal_class=AnimalModel.AnimalClass.MAMMAL,
+        habitat='',
+        diet=AnimalModel.DietType.HERBIVORE,
+        conservation_status=AnimalModel.ConservationStatus.VULNERABLE,
+    )
+
+
+# TransactionTestCase: flush() cierra conexiones viejas, lo que rompería el atomic de TestCase
+class WriteBehindDiscoveryTests(TransactionTestCase):
+
+    def setUp(self):
+        create_animal('elephant', 'Elephant')
+        create_animal('zebra', 'Zebra')
+        self.session = DjangoSessionRepository().create(UserSession.create())
+        # Sin flush automático: el test decide qué queda pendiente
+        self.discoveries = WriteBehindDiscoveryRepository(DjangoDiscoveryRepository(), flush_interval=3600)
+        self.addCleanup(self.discoveries.close)
+
+    def discover(self, animal_id: str, seconds_ago: float = 0) -> Discovery:
+        discovery = Discovery.create(self.session.id, animal_id, '', 0.9)
+        discovery.discovered_at = utc_now() - timedelta(seconds=seconds_ago)
+        return self.discoveries.save(discovery)
+
+    def page_ids(self, limit: int) -> list:
+        ids, cursor = [], None
+        while True:
+            page = self.discoveries.get_page_by_session(self.session.id, limit, cursor)
+            ids.append([discovery.id for discovery in page.items])
+            cursor = page.next_cursor
+            if cursor is None:
+                return ids
+
+    def test_end_session_mixes_stored_and_pending_discoveries(self):
+        self.discover('elephant')
+        self.discoveries.flush()
+        self.discover('zebra')
+
+        result = EndSessionUseCase(
+            DjangoSessionRepository(), self.discoveries, DjangoAnimalRepository(),
+        ).execute(self.session.id)
+
+        self.assertEqual(
+            [item['animal']['name'] for item in result['discoveries']],
+            ['Elephant', 'Zebra'],
+        )
+        self.assertFalse(SessionModel.objects.get(id=self.session.id).is_active)
+
+    def test_flush_keeps_the_discovery_time(self):
+        discovery = self.discover('elephant', seconds_ago=60)
+        self.discoveries.flush()
+
+        stored = DiscoveryModel.objects.get(id=discovery.id)
+        self.assertEqual(stored.discovered_at, discovery.discovered_at)
+
+    def test_pages_merge_stored_and_pending_discoveries(self):
+        first = self.discover('elephant', seconds_ago=30)
+        third = self.discover('zebra', seconds_ago=10)
+        self.discoveries.flush()
+        second = self.discover('zebra', seconds_ago=20)
+
+        # Más recientes primero, como el orden del modelo
+        self.assertEqual(self.page_ids(2), [[third.id, second.id], [first.id]])
+        self.assertEqual(self.page_ids(1), [[third.id], [second.id], [first.id]])
+        self.assertEqual(self.discoveries.stats()['pending'], 1)
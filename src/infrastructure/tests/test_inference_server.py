@@ -0,0 +1,125 @@
+"""
+Round trip between RemoteAnimalRecognition and InferenceServer over localhost TCP.
+Run with: python manage.py test src.infrastructure.tests
+"""
+import asyncio
+import threading
+from typing import List
+
+import cv2
+import numpy as np
+from django.test import SimpleTestCase
+
+from src.domain.entities import RecognitionResult
+from src.domain.exceptions import RecognitionException
+from src.domain.ports import AnimalRecognitionPort
+from src.domain.value_objects import ImageFrame
+from src.infrastructure.ml.inference_server import InferenceServer
+from src.infrastructure.ml.remote import RemoteAnimalRecognition
+
+
+class SizeReportingBackend(AnimalRecognitionPort):
+    """Backend that 'detects' one elephant covering the whole image"""
+
+    def __init__(self):
+        self.decoded = 0
+
+    def preprocess_image(self, frame: ImageFrame) -> np.ndarray:
+        image = cv2.imdecode(np.frombuffer(bytes(frame.data), np.uint8), cv2.IMREAD_COLOR)
+        if image is None:
+            raise RecognitionException("Failed to decode image")
+        self.decoded += 1
+        return image
+
+    def recognize(self, image: np.ndarray) -> List[RecognitionResult]:
+        height, width = image.shape[:2]
+        return [RecognitionResult(
+            animal_id="",
+            animal_name="Elephant",
+            confidence=0.75,
+            bounding_box={'x': 0, 'y': 0, 'width': width, 'height': height},
+        )]
+
+    def get_supported_animals(self) -> List[str]:
+        return ["Bird", "Elephant"]
+
+    def is_ready(self) -> bool:
+        return True
+
+
+def jpeg_frame(width: int, height: int) -> ImageFrame:
+    ok, encoded = cv2.imencode('.jpg', np.full((height, width, 3), 127, np.uint8))
+    return ImageFrame(data=encoded.tobytes())
+
+
+class InferenceServerRoundTripTests(SimpleTestCase):
+
+    def setUp(self):
+        self.backend = SizeReportingBackend()
+        self.server = InferenceServer(self.backend, max_batch=4, max_wait_ms=1)
+        self.loop = asyncio.new_event_loop()
+        listening = threading.Event()
+
+        def run():
+            asyncio.set_event_loop(self.loop)
+            server = self.loop.run_until_complete(self.server.start('tcp://127.0.0.1:0'))
+            self.port = server.sockets[0].getsockname()[1]
+            listening.set()
+            self.loop.run_forever()
+
+        self.thread = threading.Thread(target=run, daemon=True)
+        self.thread.start()
+        self.assertTrue(listening.wait(5))
+        self.clients = []
+
+    def tearDown(self):
+        for client in self.clients:
+            client.close()
+        asyncio.run_coroutine_threadsafe(self.server.close(), self.loop).result(5)
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join(5)
+        self.loop.close()
+
+    def remote_client(self, **kwargs) -> RemoteAnimalRecognition:
+        client = RemoteAnimalRecognition(f'tcp://127.0.0.1:{self.port}', **kwargs)
+        self.clients.append(client)
+        return client
+
+    def test_frames_are_sent_encoded_and_decoded_by_the_server(self):
+        client = self.remote_client()
+        frame = jpeg_frame(40, 30)
+
+        results = client.recognize(client.preprocess_image(frame))
+
+        self.assertIsNone(frame.decoded)
+        self.assertEqual(self.backend.decoded, 1)
+        self.assertEqual(results[0].animal_name, "Elephant")
+        self.assertAlmostEqual(results[0].confidence, 0.75)
+        self.assertEqual(results[0].bounding_box, {'x': 0, 'y': 0, 'width': 40, 'height': 30})
+
+    def test_batch_replies_keep_request_order(self):
+        client = self.remote_client()
+        sizes = [(64, 48), (32, 32), (20, 80)]
+
+        results = client.recognize_batch([jpeg_frame(w, h) for w, h in sizes])
+
+        self.assertEqual(
+            [(r[0].bounding_box['width'], r[0].bounding_box['height']) for r in results],
+            sizes,
+        )
+
+    def test_decoded_arrays_are_reencoded_unless_raw_is_enabled(self):
+        image = np.zeros((24, 36, 3), np.uint8)
+
+        self.remote_client().recognize(image)
+        self.assertEqual(self.backend.decoded, 1)
+
+        results = self.remote_client(send_decoded=True).recognize(image)
+        self.assertEqual(self.backend.decoded, 1)
+        self.assertEqual(results[0].bounding_box['width'], 36)
+
+    def test_undecodable_image_is_reported(self):
+        client = self.remote_client()
+
+        with self.assertRaises(RecognitionException):
+            client.recognize(ImageFrame(data=b'not an image'))
@@ -0,0 +1,233 @@
+"""
+Upload Parsing for Image Endpoints
+Binary and multipart image uploads read straight into a single buffer,
+with the size limit enforced while the body streams in.
+"""
+from django.conf import settings
+from django.core.files.uploadedfile import UploadedFile
+from django.core.files.uploadhandler import FileUploadHandler
+from django.http.multipartparser import MultiPartParser as DjangoMultiPartParser
+from django.http.multipartparser import MultiPartParserError
+from rest_framework import status
+from rest_framework.exceptions import APIException, ParseError
+from rest_framework.parsers import BaseParser, DataAndFiles, MultiPartParser
+
+READ_CHUNK_SIZE = 64 * 1024
+
+
+class UploadTooLarge(APIException):
+    status_code = status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+    default_detail = 'Uploaded image is too large.'
+    default_code = 'upload_too_large'
+
+
+class TooManyImages(APIException):
+    status_code = status.HTTP_400_BAD_REQUEST
+    default_detail = 'Too many images.'
+    default_code = 'too_many_images'
+
+
+def max_image_bytes() -> int:
+    return getattr(settings, 'RECOGNIZE_MAX_IMAGE_BYTES', 10 * 1024 * 1024)
+
+
+def max_batch_images() -> int:
+    return getattr(settings, 'RECOGNIZE_BATCH_MAX_IMAGES', 100)
+
+
+def read_stream_into_buffer(stream, limit: int, content_length: int = None) -> bytearray:
+    """
+    Read a request body into one preallocated buffer.
+    With a Content-Length the buffer is sized once and each chunk is copied
+    into place; without one, chunks are joined at the end. Either way the
+    limit is checked before the bytes are kept.
+    """
+    if content_length is not None:
+        if content_length > limit:
+            raise UploadTooLarge()
+        buffer = bytearray(content_length)
+        view = memoryview(buffer)
+        filled = 0
+        while filled < content_length:
+            chunk = stream.read(min(READ_CHUNK_SIZE, content_length - filled))
+            if not chunk:
+                break
+            view[filled:filled + len(chunk)] = chunk
+            filled += len(chunk)
+        view.release()
+        if filled < content_length:
+            del buffer[filled:]
+        return buffer
+
+    chunks = []
+    total = 0
+    while True:
+        chunk = stream.read(READ_CHUNK_SIZE)
+        if not chunk:
+            break
+        total += len(chunk)
+        if total > limit:
+            raise UploadTooLarge()
+        chunks.append(chunk)
+    return bytearray(b''.join(chunks))
+
+
+def read_upload_buffer(upload, limit: int):
+    """
+    Get the bytes of an UploadedFile without extra copies.
+    In-memory uploads expose their BytesIO buffer directly; spooled
+    uploads are read once into a buffer of the exact size.
+    """
+    if upload.size is not None and upload.size > limit:
+        raise UploadTooLarge()
+
+    file = upload.file
+    if hasattr(file, 'getbuffer'):
+        return file.getbuffer()
+
+    file.seek(0)
+    buffer = bytearray(upload.size)
+    filled = file.readinto(buffer)
+    if filled < len(buffer):
+        del buffer[filled:]
+    return buffer
+
+
+class SizeLimitUploadHandler(FileUploadHandler):
+    """
+    Upload handler placed first in the chain; aborts the request as soon as
+    any single file exceeds the limit instead of spooling it to the end.
+    """
+
+    def __init__(self, limit: int, request=None):
+        super().__init__(request)
+        self._limit = limit
+
+    def receive_data_chunk(self, raw_data, start):
+        if start + len(raw_data) > self._limit:
+            raise UploadTooLarge()
+        return raw_data
+
+    def file_complete(self, file_size):
+        return None
+
+
+class OversizedUpload(UploadedFile):
+    """Placeholder for a file that went over the size limit; only name and size are kept"""
+
+
+class SkipOversizedUploadHandler(FileUploadHandler):
+    """
+    Upload handler for batches: once a file goes over the limit its remaining
+    chunks are dropped instead of spooled, and it is reported as an
+    OversizedUpload so the batch can reject it at its own position.
+    """
+
+    def __init__(self, limit: int, request=None):
+        super().__init__(request)
+        self._limit = limit
+        self._oversized = False
+
+    def new_file(self, *args, **kwargs):
+        super().new_file(*args, **kwargs)
+        self._oversized = False
+
+    def receive_data_chunk(self, raw_data, start):
+        # None corta la cadena: los handlers siguientes no guardan el resto
+        if self._oversized or start + len(raw_data) > self._limit:
+            self._oversized = True
+            return None
+        return raw_data
+
+    def file_complete(self, file_size):
+        if not self._oversized:
+            return None
+        return OversizedUpload(
+            name=self.file_name,
+            content_type=self.content_type,
+            size=file_size,
+            charset=self.charset,
+        )
+
+
+class FileCountUploadHandler(FileUploadHandler):
+    """
+    Upload handler placed first in the chain; aborts the request as soon as
+    it carries more than `limit` files, before the extra ones are spooled.
+    """
+
+    def __init__(self, limit: int, request=None):
+        super().__init__(request)
+        self._limit = limit
+        self._count = 0
+
+    def new_file(self, *args, **kwargs):
+        super().new_file(*args, **kwargs)
+        self._count += 1
+        if self._count > self._limit:
+            raise TooManyImages(f'Too many images (max {self._limit}).')
+
+    def receive_data_chunk(self, raw_data, start):
+        return raw_data
+
+    def file_complete(self, file_size):
+        return None
+
+
+class LimitedMultiPartParser(MultiPartParser):
+    """DRF multipart parser that enforces the image size limit while streaming"""
+
+    def limit_handlers(self, request) -> list:
+        return [SizeLimitUploadHandler(max_image_bytes(), request)]
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        request = parser_context['request']
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+        meta = request.META.copy()
+        meta['CONTENT_TYPE'] = media_type
+        upload_handlers = self.limit_handlers(request)
+        upload_handlers.extend(request.upload_handlers)
+
+        try:
+            parser = DjangoMultiPartParser(meta, stream, upload_handlers, encoding)
+            data, files = parser.parse()
+            return DataAndFiles(data, files)
+        except MultiPartParserError as exc:
+            raise ParseError('Multipart form parse error - %s' % str(exc))
+
+
+class BatchMultiPartParser(LimitedMultiPartParser):
+    """
+    Multipart parser for batch uploads: enforces RECOGNIZE_BATCH_MAX_IMAGES
+    while streaming. Oversized files are not fatal here: they stop being
+    spooled at the limit and the batch reports them per image.
+    """
+
+    def limit_handlers(self, request) -> list:
+        return [
+            FileCountUploadHandler(max_batch_images(), request),
+            SkipOversizedUploadHandler(max_image_bytes(), request),
+        ]
+
+
+class RawImageParser(BaseParser):
+    """
+    Parser for raw image bodies (Content-Type: image/jpeg, image/png, ...).
+    Returns {'image': bytearray} read straight from the request stream.
+    """
+    media_type = 'image/*'
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        request = parser_context.get('request')
+        content_length = None
+        if request is not None:
+            try:
+                content_length = int(request.META.get('CONTENT_LENGTH') or 0) or None
+            except ValueError:
+                content_length = None
+
+        if stream is None:
+            return {'image': bytearray()}
+        return {'image': read_stream_into_buffer(stream, max_image_bytes(), content_length)}
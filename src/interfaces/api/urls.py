@@ -13,6 +13,9 @@ from .views import (
     SessionDiscoveriesView,
     RecognizeImageView,
     StartDetectionView,
+    InferenceStatusView,
+    RecognizeBatchView,
+    RecognizeVideoView,
 )
 
 urlpatterns = [
@@ -21,6 +24,9 @@ urlpatterns = [
     
     # Recognition
     path('recognize/', RecognizeImageView.as_view(), name='recognize-image'),
+    path('recognize/batch/', RecognizeBatchView.as_view(), name='recognize-batch'),
+    path('recognize/video/', RecognizeVideoView.as_view(), name='recognize-video'),
+    path('inference/status/', InferenceStatusView.as_view(), name='inference-status'),
     
     # Animals
     path('animals/', AnimalListView.as_view(), name='animal-list'),
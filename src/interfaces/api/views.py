@@ -2,15 +2,30 @@
 REST API Views
 Provides REST endpoints for animal information and session management.
 """
+import time
 import random
 import subprocess
 import threading
 import os
 import requests
 import json
+from concurrent.futures import ThreadPoolExecutor
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.http import HttpResponse, StreamingHttpResponse
 from rest_framework import status
 from rest_framework.views import APIView
 from rest_framework.response import Response
+from rest_framework.parsers import JSONParser
+
+from .uploads import (
+    BatchMultiPartParser,
+    LimitedMultiPartParser,
+    RawImageParser,
+    UploadTooLarge,
+    max_image_bytes,
+    read_upload_buffer,
+)
 
 from src.application.use_cases import (
     GetAnimalDetailsUseCase,
@@ -21,25 +36,32 @@ from src.application.use_cases import (
     StartSessionUseCase,
     EndSessionUseCase,
     GetSessionDiscoveriesUseCase,
+    RecognizeImageBatchUseCase,
+    BatchImage,
+    RecognizeVideoUseCase,
 )
 from src.infrastructure.persistence import (
-    DjangoAnimalRepository,
     DjangoSessionRepository,
-    DjangoDiscoveryRepository,
+    get_animal_repository,
+    get_discovery_repository,
+)
+from src.infrastructure.observability import get_metrics, metrics_available, render_latest
+from src.domain.exceptions import (
+    AnimalNotFoundException,
+    SessionNotFoundException,
+    InferenceOverloadedException,
+    InvalidImageException,
+    InvalidCursorException,
 )
-from src.domain.exceptions import AnimalNotFoundException, SessionNotFoundException
-
 
-# Global YOLO model instance (cached to avoid reloading)
-_yolo_model_instance = None
 
 def get_yolo_model():
-    """Get or create YOLO model instance (singleton pattern)"""
-    global _yolo_model_instance
-    if _yolo_model_instance is None:
-        from src.infrastructure.ml.recognition import YOLOAnimalRecognition
-        _yolo_model_instance = YOLOAnimalRecognition()
-    return _yolo_model_instance
+    """Get the shared YOLO model instance (loaded once per process)"""
+    from src.infrastructure.ml import get_recognition_backend
+    return get_recognition_backend()
+
+# Shared pool for parallel image decoding in batch uploads
+_decode_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix='decode')
 
 # Global variable to track detection process
 detection_process = None
@@ -96,7 +118,12 @@ class StartDetectionView(APIView):
 
 
 class RecognizeImageView(APIView):
-    """API endpoint to recognize an animal from an uploaded image using best.pt YOLO model"""
+    """
+    API endpoint to recognize an animal from an uploaded image using best.pt YOLO model.
+    Accepts multipart/form-data with an 'image' file, a raw image/* body,
+    or JSON {'image': <base64 data URL>} (legacy).
+    """
+    parser_classes = [JSONParser, LimitedMultiPartParser, RawImageParser]
     
     def post(self, request):
         image_data = request.data.get('image')
@@ -106,6 +133,23 @@ class RecognizeImageView(APIView):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
+        # Build the frame before the generic error handling so size limits answer 413
+        from src.domain.value_objects import ImageFrame
+        try:
+            if isinstance(image_data, str):
+                frame = ImageFrame.from_base64(image_data)
+            elif hasattr(image_data, 'file'):
+                frame = ImageFrame.from_buffer(read_upload_buffer(image_data, max_image_bytes()))
+            else:
+                frame = ImageFrame.from_buffer(image_data)
+        except UploadTooLarge:
+            raise
+        except Exception:
+            return Response(
+                {'success': False, 'error': 'Error decoding or preprocessing image'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
         try:
             # Import ML utilities
             from src.infrastructure.ml.recognition import YOLOAnimalRecognition
@@ -119,9 +163,8 @@ class RecognizeImageView(APIView):
             # Get cached YOLO model (loads only once)
             model = get_yolo_model()
 
-            # Convert incoming base64 -> ImageFrame and let the model preprocess it
+            # Let the model decode the frame (single buffer, no intermediate copies)
             try:
-                frame = ImageFrame.from_base64(image_data)
                 decoded_image = model.preprocess_image(frame)
             except Exception as e:
                 logger.error(f"Error decoding/preprocessing image: {e}")
@@ -141,7 +184,15 @@ class RecognizeImageView(APIView):
             logger.info("🔍 Procesando imagen con YOLO...")
             
             # Get recognition results from best.pt
-            results = model.recognize(decoded_image)
+            try:
+                results = model.recognize(decoded_image)
+            except InferenceOverloadedException as e:
+                logger.warning("🚦 Inferencia saturada, solicitando reintento")
+                return Response({
+                    'success': False,
+                    'error': 'Recognition service is busy, retry later'
+                }, status=status.HTTP_503_SERVICE_UNAVAILABLE,
+                   headers={'Retry-After': str(e.retry_after)})
             
             if not results or len(results) == 0:
                 logger.warning("⚠️ No animals detected in image")
@@ -155,90 +206,14 @@ class RecognizeImageView(APIView):
             logger.info(f"✅ Detectado: {best_result.animal_name} (conf: {best_result.confidence:.1%})")
             
             # Repository to find animal in database
-            repository = DjangoAnimalRepository()
-
-            # Mapping from model label -> probable DB names (ordered candidates)
-            MODEL_TO_DB = {
-                'bird': ['Bird', 'Ave', 'Pájaro'],
-                'cats': ['Gato', 'Cats', 'Cat'],
-                'cow': ['Vaca', 'Cow'],
-                'deer': ['Venado', 'Deer'],
-                'dog': ['Perro', 'Dog'],
-                'elephant': ['Elefante', 'Elefante Africano', 'Elephant'],
-                'giraffe': ['Jirafa', 'Giraffa', 'Giraffe'],
-                'person': ['Persona', 'Person'],
-                'pig': ['Cerdo', 'Pig'],
-                'sheep': ['Oveja', 'Sheep'],
-            }
-
-            # Build ordered candidate names to search in DB
-            candidates = []
-            model_label = (best_result.animal_name or '').strip()
-            key = model_label.lower()
-            if key in MODEL_TO_DB:
-                candidates.extend(MODEL_TO_DB[key])
-            # Always try the original model label as well
-            candidates.append(model_label)
-
-            # Deduplicate preserving order (case-insensitive)
-            seen = set()
-            uniq_candidates = []
-            for c in candidates:
-                if not c:
-                    continue
-                lc = c.lower()
-                if lc in seen:
-                    continue
-                seen.add(lc)
-                uniq_candidates.append(c)
-
-            found_animal = None
-
-            # Strategy 1: Try exact match on name and aliases (case-insensitive)
-            # This is the safest approach and avoids false positives from substring matches in scientific_name
-            animals = repository.get_all()
-            for c in uniq_candidates:
-                # Try exact match on name
-                for animal in animals:
-                    if animal.name.lower() == c.lower():
-                        found_animal = animal
-                        logger.info(f"🎯 Animal encontrado por nombre exacto: {animal.name} (candidato: {c})")
-                        break
-                if found_animal:
-                    break
-                
-                # Try exact match on aliases
-                for animal in animals:
-                    aliases = getattr(animal, 'aliases', None) or []
-                    for alias in aliases:
-                        if alias and alias.lower() == c.lower():
-                            found_animal = animal
-                            logger.info(f"🎯 Animal encontrado por alias exacto: {animal.name} (alias: {alias})")
-                            break
-                    if found_animal:
-                        break
-                if found_animal:
-                    break
+            repository = get_animal_repository()
 
-            # Strategy 2 (fallback): Partial substring match on name and aliases ONLY
-            # Avoid scientific_name to prevent false positives like "cat" matching "truncatus"
-            if not found_animal:
-                logger.info(f"🔎 Buscando coincidencia parcial en nombre y aliases para: {best_result.animal_name}")
-                for animal in animals:
-                    # Check name partial matches
-                    if model_label.lower() in animal.name.lower() or animal.name.lower() in model_label.lower():
-                        found_animal = animal
-                        logger.info(f"🎯 Coincidencia parcial en nombre: {animal.name}")
-                        break
-                    # Check aliases (if present)
-                    aliases = getattr(animal, 'aliases', None) or []
-                    for alias in aliases:
-                        if alias and (model_label.lower() in alias.lower() or alias.lower() in model_label.lower()):
-                            found_animal = animal
-                            logger.info(f"🎯 Coincidencia parcial en alias: {animal.name} (alias: {alias})")
-                            break
-                    if found_animal:
-                        break
+            # Índice precalculado (candidatos del modelo, nombres y alias sin
+            # acentos ni mayúsculas); la coincidencia parcial solo se prueba
+            # si no hay exacta y evita scientific_name ("cat" ⊂ "truncatus")
+            found_animal = repository.resolve_label(best_result.animal_name, partial=True)
+            if found_animal:
+                logger.info(f"🎯 Animal encontrado: {found_animal.name} (etiqueta: {best_result.animal_name})")
 
             # If still not found, generate animal data with AI but DO NOT save to DB
             if not found_animal:
@@ -320,6 +295,7 @@ class RecognizeImageView(APIView):
                 # Build animal_dict and persist in DB
                 try:
                     from src.infrastructure.persistence.models import AnimalModel
+                    from src.infrastructure.persistence import replace_animal_aliases
                     import uuid
 
                     # Map diet/conservation to DB expected values
@@ -341,7 +317,7 @@ class RecognizeImageView(APIView):
                     db_diet = diet_reverse.get(diet_display, 'OMNIVORE')
                     db_conservation = conservation_reverse.get(conservation_display, 'LEAST_CONCERN')
 
-                    from django.db import IntegrityError
+                    from django.db import IntegrityError, transaction
 
                     created_by = request.user if request.user and request.user.is_authenticated else None
 
@@ -351,23 +327,27 @@ class RecognizeImageView(APIView):
                         logger.info(f"🟡 Animal ya existe en BD: {existing_animal.name}")
                     else:
                         try:
-                            new_animal = AnimalModel.objects.create(
-                                id=str(uuid.uuid4()),
-                                name=display_name,
-                                scientific_name=scientific_name,
-                                description=ai_data.get('description', f"{display_name} es un animal interesante."),
-                                animal_class=ai_data.get('animal_class', 'MAMMAL'),
-                                habitat=ai_data.get('habitat', 'Desconocido'),
-                                diet=db_diet,
-                                conservation_status=db_conservation,
-                                fun_facts=ai_data.get('fun_facts', []),
-                                average_lifespan=ai_data.get('average_lifespan', 'Desconocido'),
-                                average_weight=ai_data.get('average_weight', 'Desconocido'),
-                                geographic_distribution=ai_data.get('geographic_distribution', 'Desconocido'),
-                                aliases=[best_result.animal_name, display_name],
-                                image_url=uploaded_image_url,
-                                created_by=created_by,
-                            )
+                            with transaction.atomic():
+                                new_animal = AnimalModel.objects.create(
+                                    id=str(uuid.uuid4()),
+                                    name=display_name,
+                                    scientific_name=scientific_name,
+                                    description=ai_data.get('description', f"{display_name} es un animal interesante."),
+                                    animal_class=ai_data.get('animal_class', 'MAMMAL'),
+                                    habitat=ai_data.get('habitat', 'Desconocido'),
+                                    diet=db_diet,
+                                    conservation_status=db_conservation,
+                                    fun_facts=ai_data.get('fun_facts', []),
+                                    average_lifespan=ai_data.get('average_lifespan', 'Desconocido'),
+                                    average_weight=ai_data.get('average_weight', 'Desconocido'),
+                                    geographic_distribution=ai_data.get('geographic_distribution', 'Desconocido'),
+                                    image_url=uploaded_image_url,
+                                    created_by=created_by,
+                                )
+                                # El nombre y la etiqueta del modelo, en la tabla de alias
+                                replace_animal_aliases(
+                                    new_animal.id, display_name, [best_result.animal_name], language='en'
+                                )
                             found_animal = new_animal
                             logger.info(f"✨ Nuevo animal agregado a BD con datos IA: {new_animal.name}")
                         except IntegrityError:
@@ -395,6 +375,8 @@ class RecognizeImageView(APIView):
                 try:
                     animal_model = AnimalModel.objects.get(id=found_animal.id)
                     
+                    # Solo la confianza no invalida el catálogo en caché
+                    update_fields = ['last_recognition_confidence', 'updated_at']
                     if (
                         uploaded_image_url
                         and getattr(animal_model, 'image_url', None) in (None, '')
@@ -403,10 +385,11 @@ class RecognizeImageView(APIView):
                         and getattr(animal_model, 'created_by_id', None) == request.user.id
                     ):
                         animal_model.image_url = uploaded_image_url
+                        update_fields.append('image_url')
                     
                     # Actualizar confianza del último reconocimiento
                     animal_model.last_recognition_confidence = float(best_result.confidence)
-                    animal_model.save(update_fields=['last_recognition_confidence', 'updated_at', 'image_url'])
+                    animal_model.save(update_fields=update_fields)
                 except AnimalModel.DoesNotExist:
                     logger.warning(f"⚠️ Animal {found_animal.id} no encontrado en BD para actualizar")
                 
@@ -513,8 +496,13 @@ REGLAS CRÍTICAS:
             "max_tokens": 800,
         }
         
+        metrics = get_metrics()
         try:
-            r = requests.post(api_url, headers=headers, data=json.dumps(payload), timeout=20)
+            started = time.perf_counter()
+            try:
+                r = requests.post(api_url, headers=headers, data=json.dumps(payload), timeout=20)
+            finally:
+                metrics.observe('openrouter_request_seconds', time.perf_counter() - started)
             r.raise_for_status()
             body = r.json()
             
@@ -553,11 +541,22 @@ REGLAS CRÍTICAS:
                             return data
                         except json.JSONDecodeError as e:
                             logger.warning(f"⚠️ Error parseando JSON: {e}, text={text[:100]}")
+                            metrics.inc('openrouter_failures', reason='parse')
                             return self._get_fallback_data(animal_name)
             
+            metrics.inc('openrouter_failures', reason='empty')
             return self._get_fallback_data(animal_name)
         except Exception as e:
             logger.warning(f"⚠️ Error generando datos con IA: {e}")
+            if isinstance(e, requests.Timeout):
+                reason = 'timeout'
+            elif isinstance(e, requests.HTTPError):
+                reason = 'http'
+            elif isinstance(e, requests.ConnectionError):
+                reason = 'connection'
+            else:
+                reason = 'other'
+            metrics.inc('openrouter_failures', reason=reason)
             return self._get_fallback_data(animal_name)
     
     def _get_fallback_data(self, animal_name: str) -> dict:
@@ -575,13 +574,227 @@ REGLAS CRÍTICAS:
         }
 
 
+class RecognizeBatchView(APIView):
+    """
+    API endpoint to recognize many uploaded images at once.
+    Accepts multipart/form-data with repeated 'images' fields and streams
+    one NDJSON line per image as results become available.
+    """
+    parser_classes = [BatchMultiPartParser]
+    
+    def post(self, request):
+        files = request.FILES.getlist('images')
+        max_images = getattr(settings, 'RECOGNIZE_BATCH_MAX_IMAGES', 100)
+        max_bytes = getattr(settings, 'RECOGNIZE_MAX_IMAGE_BYTES', 10 * 1024 * 1024)
+        
+        if not files:
+            return Response(
+                {'success': False, 'error': 'No images provided'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if len(files) > max_images:
+            return Response(
+                {'success': False, 'error': f'Too many images (max {max_images})'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        images = []
+        rejected = {}
+        for index, upload in enumerate(files):
+            if upload.size > max_bytes:
+                # OversizedUpload: el parser dejó de guardarlo al pasar el límite
+                rejected[index] = {
+                    'index': index,
+                    'filename': upload.name,
+                    'success': False,
+                    'error': f'Image too large (max {max_bytes} bytes)',
+                }
+                continue
+            # El archivo se lee cuando se decodifica su lote
+            images.append(BatchImage(index=index, filename=upload.name, data=upload))
+        
+        use_case = RecognizeImageBatchUseCase(
+            recognition_port=get_yolo_model(),
+            animal_repository=get_animal_repository(),
+            decode_executor=_decode_executor,
+            batch_size=getattr(settings, 'RECOGNIZE_BATCH_SIZE', 8),
+        )
+        
+        results = use_case.execute(images)
+        # Cada imagen se decodifica e infiere fuera del event loop (Daphne/ASGI);
+        # un generador síncrono se consumiría entero antes de enviar nada
+        next_result = sync_to_async(next)
+        
+        async def stream():
+            # Los rechazados salen en su posición, entre los resultados en orden de entrada
+            pending = sorted(rejected)
+            while True:
+                item = await next_result(results, None)
+                while pending and (item is None or pending[0] < item['index']):
+                    yield json.dumps(rejected[pending.pop(0)]) + '\n'
+                if item is None:
+                    break
+                yield json.dumps(item) + '\n'
+        
+        return StreamingHttpResponse(stream(), content_type='application/x-ndjson')
+
+
+class RecognizeVideoView(APIView):
+    """
+    API endpoint to recognize animals in an uploaded video clip.
+    Accepts multipart/form-data with a 'video' file and optional
+    'session_id' (progress is pushed to that WebSocket session),
+    'interval' (seconds between samples) and 'mode' ('time' or 'scene').
+    """
+    
+    def post(self, request):
+        import tempfile
+        import uuid
+        import logging
+        from asgiref.sync import async_to_sync
+        from channels.layers import get_channel_layer
+        from src.infrastructure.ml import OpenCVVideoSampler
+        from src.infrastructure.storage import get_image_storage
+        
+        logger = logging.getLogger(__name__)
+        
+        upload = request.FILES.get('video')
+        if not upload:
+            return Response(
+                {'success': False, 'error': 'No video provided'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        max_bytes = getattr(settings, 'RECOGNIZE_VIDEO_MAX_BYTES', 200 * 1024 * 1024)
+        if upload.size > max_bytes:
+            return Response(
+                {'success': False, 'error': f'Video too large (max {max_bytes} bytes)'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        try:
+            interval = min(max(float(request.data.get('interval', 1.0)), 0.1), 60.0)
+        except (TypeError, ValueError):
+            interval = 1.0
+        scene_threshold = 0.3 if request.data.get('mode') == 'scene' else None
+        
+        session_id = request.data.get('session_id')
+        video_id = uuid.uuid4().hex
+        channel_layer = get_channel_layer() if session_id else None
+        
+        def on_progress(event: dict) -> None:
+            try:
+                async_to_sync(channel_layer.group_send)(
+                    f"session_{session_id}",
+                    {'type': 'video.progress', 'data': event},
+                )
+            except Exception as e:
+                logger.warning(f"No se pudo enviar progreso de video: {e}")
+        
+        # Large uploads are already spooled to disk by Django; small ones are
+        # written out in chunks so OpenCV can stream from a file path
+        temp_path = None
+        if hasattr(upload, 'temporary_file_path'):
+            video_path = upload.temporary_file_path()
+        else:
+            suffix = os.path.splitext(upload.name)[1] or '.mp4'
+            with tempfile.NamedTemporaryFile(suffix=suffix, delete=False) as temp:
+                for chunk in upload.chunks():
+                    temp.write(chunk)
+                temp_path = video_path = temp.name
+        
+        use_case = RecognizeVideoUseCase(
+            recognition_port=get_yolo_model(),
+            animal_repository=get_animal_repository(),
+            frame_sampler=OpenCVVideoSampler(interval=interval, scene_threshold=scene_threshold),
+            image_storage=get_image_storage(),
+            batch_size=getattr(settings, 'RECOGNIZE_BATCH_SIZE', 8),
+            merge_gap=max(2.0, interval * 2),
+            max_frames=getattr(settings, 'RECOGNIZE_VIDEO_MAX_FRAMES', 600),
+        )
+        
+        try:
+            result = use_case.execute(
+                video_path,
+                progress_callback=on_progress if channel_layer else None,
+                video_id=video_id,
+            )
+            return Response({'success': True, **result})
+        except InvalidImageException as e:
+            return Response(
+                {'success': False, 'error': str(e)},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        except InferenceOverloadedException as e:
+            return Response({
+                'success': False,
+                'error': 'Recognition service is busy, retry later'
+            }, status=status.HTTP_503_SERVICE_UNAVAILABLE,
+               headers={'Retry-After': str(e.retry_after)})
+        finally:
+            if temp_path and os.path.exists(temp_path):
+                os.remove(temp_path)
+
+
+class MetricsView(APIView):
+    """Prometheus scrape endpoint (all worker processes in multiprocess mode)"""
+    
+    def get(self, request):
+        if not metrics_available():
+            return HttpResponse(
+                'prometheus_client is not installed\n',
+                status=status.HTTP_503_SERVICE_UNAVAILABLE,
+                content_type='text/plain',
+            )
+        body, content_type = render_latest()
+        return HttpResponse(body, content_type=content_type)
+
+
+class InferenceStatusView(APIView):
+    """API endpoint exposing inference admission and degradation levels"""
+    
+    def get(self, request):
+        from src.infrastructure.ml import get_inference_controller, get_load_controller
+        
+        load_controller = get_load_controller()
+        load_controller.target_level()
+        return Response({
+            'admission': get_inference_controller().stats(),
+            'load': load_controller.snapshot(),
+        })
+
+
+def paginated(request, fetch):
+    """
+    Run `fetch(limit, cursor)` with ?limit (API_PAGE_SIZE by default, clamped
+    to API_MAX_PAGE_SIZE) and ?cursor, answering 400 on bad values.
+    """
+    page_size = getattr(settings, 'API_PAGE_SIZE', 50)
+    max_page_size = getattr(settings, 'API_MAX_PAGE_SIZE', 200)
+    try:
+        limit = int(request.query_params.get('limit', page_size))
+    except ValueError:
+        return Response(
+            {'error': 'Query parameter "limit" must be an integer'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    
+    try:
+        page = fetch(min(max(limit, 1), max_page_size), request.query_params.get('cursor') or None)
+    except InvalidCursorException as e:
+        return Response(
+            {'error': str(e)},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    return Response(page)
+
+
 class AnimalListView(APIView):
-    """API endpoint to list all animals"""
+    """API endpoint to list all animals (keyset pages ordered by name)"""
     
     def get(self, request):
-        use_case = ListAllAnimalsUseCase(DjangoAnimalRepository())
-        animals = use_case.execute()
-        return Response(animals)
+        use_case = ListAllAnimalsUseCase(get_animal_repository())
+        return paginated(request, use_case.execute)
 
 
 class AnimalDetailView(APIView):
@@ -589,7 +802,7 @@ class AnimalDetailView(APIView):
     
     def get(self, request, animal_id):
         try:
-            use_case = GetAnimalDetailsUseCase(DjangoAnimalRepository())
+            use_case = GetAnimalDetailsUseCase(get_animal_repository())
             animal = use_case.execute(animal_id)
             return Response(animal)
         except AnimalNotFoundException as e:
@@ -610,27 +823,34 @@ class AnimalSearchView(APIView):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        use_case = SearchAnimalsUseCase(DjangoAnimalRepository())
-        animals = use_case.execute(query)
+        max_results = getattr(settings, 'ANIMAL_SEARCH_MAX_RESULTS', 50)
+        try:
+            limit = int(request.query_params.get('limit', max_results))
+        except ValueError:
+            return Response(
+                {'error': 'Query parameter "limit" must be an integer'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        use_case = SearchAnimalsUseCase(get_animal_repository())
+        animals = use_case.execute(query, limit=min(max(limit, 1), max_results))
         return Response(animals)
 
 
 class AnimalsByClassView(APIView):
-    """API endpoint to list animals by class"""
+    """API endpoint to list animals by class (keyset pages ordered by name)"""
     
     def get(self, request, animal_class):
-        use_case = ListAnimalsByClassUseCase(DjangoAnimalRepository())
-        animals = use_case.execute(animal_class)
-        return Response(animals)
+        use_case = ListAnimalsByClassUseCase(get_animal_repository())
+        return paginated(request, lambda limit, cursor: use_case.execute(animal_class, limit, cursor))
 
 
 class EndangeredAnimalsView(APIView):
-    """API endpoint to list endangered animals"""
+    """API endpoint to list endangered animals (keyset pages ordered by name)"""
     
     def get(self, request):
-        use_case = ListEndangeredAnimalsUseCase(DjangoAnimalRepository())
-        animals = use_case.execute()
-        return Response(animals)
+        use_case = ListEndangeredAnimalsUseCase(get_animal_repository())
+        return paginated(request, use_case.execute)
 
 
 class SessionStartView(APIView):
@@ -650,8 +870,8 @@ class SessionEndView(APIView):
         try:
             use_case = EndSessionUseCase(
                 DjangoSessionRepository(),
-                DjangoDiscoveryRepository(),
-                DjangoAnimalRepository(),
+                get_discovery_repository(),
+                get_animal_repository(),
             )
             summary = use_case.execute(session_id)
             return Response(summary)
@@ -663,12 +883,12 @@ class SessionEndView(APIView):
 
 
 class SessionDiscoveriesView(APIView):
-    """API endpoint to get session discoveries"""
+    """API endpoint to get session discoveries (keyset pages, newest first)"""
     
     def get(self, request, session_id):
         use_case = GetSessionDiscoveriesUseCase(
-            DjangoDiscoveryRepository(),
-            DjangoAnimalRepository(),
+            get_discovery_repository(),
+            get_animal_repository(),
+            DjangoSessionRepository(),
         )
-        discoveries = use_case.execute(session_id)
-        return Response(discoveries)
+        return paginated(request, lambda limit, cursor: use_case.execute_page(session_id, limit, cursor))
@@ -0,0 +1,98 @@
+"""
+WebSocket Wire Codecs
+Message encodings for the recognition WebSocket.
+
+JSON es el formato por defecto. MessagePack y CBOR son opcionales: solo se
+ofrecen si `msgpack` / `cbor2` están instalados, y se negocian al conectar
+con un subprotocolo (`pokedex.msgpack`) o con `?encoding=msgpack`.
+"""
+import json
+from typing import List, Optional, Tuple, Union
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import cbor2
+except ImportError:
+    cbor2 = None
+
+
+class JsonCodec:
+    """JSON text frames (default)"""
+    name = 'json'
+    binary = False
+
+    def encode(self, data: dict) -> str:
+        return json.dumps(data)
+
+    def decode(self, payload: Union[str, bytes]) -> dict:
+        return json.loads(payload)
+
+
+class MsgPackCodec:
+    """MessagePack binary frames"""
+    name = 'msgpack'
+    binary = True
+
+    def encode(self, data: dict) -> bytes:
+        return msgpack.packb(data, use_bin_type=True)
+
+    def decode(self, payload: bytes) -> dict:
+        return msgpack.unpackb(payload, raw=False)
+
+
+class CborCodec:
+    """CBOR binary frames"""
+    name = 'cbor'
+    binary = True
+
+    def encode(self, data: dict) -> bytes:
+        return cbor2.dumps(data)
+
+    def decode(self, payload: bytes) -> dict:
+        return cbor2.loads(payload)
+
+
+# Los subprotocolos se llaman pokedex.<codec>
+SUBPROTOCOL_PREFIX = 'pokedex.'
+
+DEFAULT_CODEC = JsonCodec()
+
+
+def available_codecs() -> dict:
+    """Codecs usable in this process, by name"""
+    codecs = {'json': JsonCodec}
+    if msgpack is not None:
+        codecs['msgpack'] = MsgPackCodec
+    if cbor2 is not None:
+        codecs['cbor'] = CborCodec
+    return codecs
+
+
+def negotiate_codec(
+    subprotocols: List[str],
+    encoding: Optional[str] = None,
+) -> Tuple[object, Optional[str]]:
+    """
+    Pick the codec for a connection.
+
+    Subprotocols are tried in the client's order of preference; otherwise
+    the `encoding` query parameter is used. Unknown or unavailable
+    encodings fall back to JSON.
+
+    Returns:
+        (codec, subprotocol to accept or None)
+    """
+    codecs = available_codecs()
+    for subprotocol in subprotocols or []:
+        if subprotocol.startswith(SUBPROTOCOL_PREFIX):
+            name = subprotocol[len(SUBPROTOCOL_PREFIX):]
+            if name in codecs:
+                return codecs[name](), subprotocol
+
+    if encoding in codecs:
+        return codecs[encoding](), None
+    return DEFAULT_CODEC, None
@@ -3,12 +3,26 @@ WebSocket Consumer for Animal Recognition
 Handles real-time camera frame processing.
 """
 import json
+import time
 import logging
+from typing import Optional
+from urllib.parse import parse_qs
+from django.conf import settings
 from channels.generic.websocket import AsyncWebsocketConsumer
-from asgiref.sync import sync_to_async
+from asgiref.sync import async_to_sync, sync_to_async
 
 from src.domain.entities import RecognitionResult, Animal, Discovery
 from src.domain.ports import NotificationPort
+from src.domain.services import TemporalVoteAggregator
+from src.application.frames import FrameTicket
+from src.application.degradation import SessionServiceLevel
+from src.application.instrumentation import (
+    FrameTimings,
+    frame_timings,
+    get_stage_histograms,
+    span,
+    stage,
+)
 from src.application.use_cases import (
     ProcessFrameUseCase,
     StartSessionUseCase,
@@ -16,21 +30,40 @@ from src.application.use_cases import (
     GetSessionDiscoveriesUseCase,
 )
 from src.infrastructure.persistence import (
-    DjangoAnimalRepository,
     DjangoSessionRepository,
-    DjangoDiscoveryRepository,
+    get_animal_repository,
+    get_discovery_repository,
 )
-from src.infrastructure.ml import TensorFlowAnimalRecognition, YOLOAnimalRecognition
-from src.infrastructure.storage import get_image_storage
+from src.infrastructure.ml import get_recognition_backend, get_load_controller
+from src.infrastructure.storage import get_image_storage, get_thumbnail_pipeline
+from src.infrastructure.observability import get_metrics
+from .codecs import DEFAULT_CODEC, negotiate_codec
+from .delta import DetectionDeltaEncoder
 
 logger = logging.getLogger(__name__)
 
 
 class WebSocketNotificationAdapter(NotificationPort):
-    """Adapter to send notifications via WebSocket"""
+    """
+    Adapter to send notifications via WebSocket.
+    With `coalesce`, the events of one frame are buffered and sent by
+    flush() as a single {'type': 'frame', 'events': [...]} message, and an
+    animal's full payload is only sent the first time in the session.
+    """
     
-    def __init__(self, consumer: 'AnimalRecognitionConsumer'):
+    def __init__(self, consumer: 'AnimalRecognitionConsumer', coalesce: bool = False):
         self._consumer = consumer
+        self._coalesce = coalesce
+        self._events: list = []
+        self._sent_animals: set = set()
+    
+    async def _emit(self, message: Optional[dict]) -> None:
+        if message is None:
+            return
+        if self._coalesce:
+            self._events.append(message)
+        else:
+            await self._consumer.send_json(message)
     
     async def send_recognition_result(
         self,
@@ -38,32 +71,42 @@ class WebSocketNotificationAdapter(NotificationPort):
         result: RecognitionResult,
         animal: Animal
     ) -> None:
-        await self._consumer.send_json({
-            'type': 'recognition',
-            'data': {
-                'recognition': result.to_dict(),
-                'animal': animal.to_dict(),
-            }
-        })
+        data = {'recognition': result.to_dict()}
+        if self._coalesce and animal.id in self._sent_animals:
+            # El cliente ya tiene la ficha completa: basta con el id
+            data['animal_id'] = animal.id
+        else:
+            data['animal'] = animal.to_dict()
+            self._sent_animals.add(animal.id)
+        await self._emit({'type': 'recognition', 'data': data})
     
     async def send_discovery_update(
         self,
         session_id: str,
         discovery: Discovery
     ) -> None:
-        await self._consumer.send_json({
+        await self._emit({
             'type': 'discovery',
             'data': discovery.to_dict(),
         })
     
     async def send_error(self, session_id: str, error: str) -> None:
-        await self._consumer.send_json({
+        await self._emit({
             'type': 'error',
             'data': {'message': error},
         })
     
-    async def send_detections(self, session_id: str, detections: list) -> None:
-        await self._consumer.send_detections(detections)
+    async def send_detections(self, session_id: str, detections: list, timings: Optional[dict] = None) -> None:
+        message = self._consumer.detection_message(detections)
+        if message is not None and timings:
+            message['data']['timings'] = timings
+        await self._emit(message)
+    
+    async def flush(self, session_id: str) -> None:
+        if not self._events:
+            return
+        events, self._events = self._events, []
+        await self._consumer.send_json({'type': 'frame', 'events': events})
 
 
 class AnimalRecognitionConsumer(AsyncWebsocketConsumer):
@@ -81,21 +124,46 @@ class AnimalRecognitionConsumer(AsyncWebsocketConsumer):
         self.notification_adapter = None
         
         # Initialize repositories
-        self.animal_repo = DjangoAnimalRepository()
+        self.animal_repo = get_animal_repository()
         self.session_repo = DjangoSessionRepository()
-        self.discovery_repo = DjangoDiscoveryRepository()
+        self.discovery_repo = get_discovery_repository()
         
         # Recognition service se carga en connect()
         self.recognition_service = None
         self.image_storage = get_image_storage()
+        
+        # Per-session frame pipeline (built once in connect)
+        self.process_frame = None
+        self.frame_deadline_ms = getattr(settings, 'FRAME_DEADLINE_MS', 500)
+        self.service_level = SessionServiceLevel()
+        
+        # Set in connect when the client asks for ?detections=delta
+        self.detection_encoder = None
+        
+        # Wire encoding negotiated in connect (JSON by default)
+        self.codec = DEFAULT_CODEC
     
     async def connect(self):
         """Handle WebSocket connection"""
         try:
-            await self.accept()
+            # Negociación de formatos por subprotocolo y query string
+            options = parse_qs(self.scope.get('query_string', b'').decode())
+            self.codec, subprotocol = negotiate_codec(
+                self.scope.get('subprotocols', []),
+                options.get('encoding', [None])[0],
+            )
+            await self.accept(subprotocol=subprotocol)
+            
+            # Initialize notification adapter (?envelope=frame: one message per frame)
+            self.notification_adapter = WebSocketNotificationAdapter(
+                self, coalesce=options.get('envelope', [''])[0] == 'frame',
+            )
             
-            # Initialize notification adapter
-            self.notification_adapter = WebSocketNotificationAdapter(self)
+            if options.get('detections', [''])[0] == 'delta':
+                self.detection_encoder = DetectionDeltaEncoder(
+                    move_tolerance=getattr(settings, 'WS_DETECTION_MOVE_TOLERANCE', 8),
+                    keyframe_interval=getattr(settings, 'WS_DETECTION_KEYFRAME_INTERVAL', 30),
+                )
             
             # Lazy load recognition service on first connection
             if self.recognition_service is None:
@@ -109,6 +177,32 @@ class AnimalRecognitionConsumer(AsyncWebsocketConsumer):
             session_data = await sync_to_async(start_session.execute)()
             self.session_id = session_data['id']
             
+            # Session group: lets HTTP views (e.g. video uploads) push progress here
+            if self.channel_layer is not None:
+                await self.channel_layer.group_add(self.session_group, self.channel_name)
+            
+            self.process_frame = ProcessFrameUseCase(
+                recognition_port=self.recognition_service,
+                animal_repository=self.animal_repo,
+                discovery_repository=self.discovery_repo,
+                session_repository=self.session_repo,
+                image_storage=self.image_storage,
+                notification_port=self.notification_adapter,
+                service_level=self.service_level,
+                vote_aggregator=TemporalVoteAggregator(
+                    window=getattr(settings, 'RECOGNITION_VOTE_WINDOW', 5),
+                    min_votes=getattr(settings, 'RECOGNITION_VOTE_MIN_VOTES', 3),
+                ),
+                thumbnail_pipeline=(
+                    get_thumbnail_pipeline()
+                    if getattr(settings, 'THUMBNAIL_BACKGROUND', True) else None
+                ),
+                on_thumbnail_stored=self._thumbnail_stored,
+                include_timings=getattr(settings, 'PIPELINE_DEBUG_TIMINGS', False),
+            )
+            get_load_controller().register(self.service_level)
+            get_metrics().inc('websocket_sessions_active')
+            
             logger.info(f"✅ WebSocket connected. Session: {self.session_id}")
             
             # Send session info to client
@@ -116,20 +210,28 @@ class AnimalRecognitionConsumer(AsyncWebsocketConsumer):
                 'type': 'session_started',
                 'data': session_data,
             })
+            await self.send_service_level()
         except Exception as e:
             logger.error(f"❌ Error en connect: {str(e)}")
             await self.close()
     
     def _load_recognition_service(self):
-        """Carga el servicio de reconocimiento (llamado en sync_to_async)"""
-        logger.info("🚀 Inicializando YOLOAnimalRecognition...")
-        return YOLOAnimalRecognition(
-            confidence_threshold=0.5  # 50% confianza mínima
-        )
+        """Obtiene el backend compartido del proceso (llamado en sync_to_async)"""
+        return get_recognition_backend()
     
     async def disconnect(self, close_code):
         """Handle WebSocket disconnection"""
+        get_load_controller().unregister(self.service_level)
+        if self.process_frame:
+            get_metrics().dec('websocket_sessions_active')
+        
+        if self.session_id and self.channel_layer is not None:
+            await self.channel_layer.group_discard(self.session_group, self.channel_name)
+        
         if self.session_id:
+            if self.process_frame:
+                logger.info(f"Frame stats {self.session_id}: {self.process_frame.frame_stats.to_dict()}")
+            
             # End session
             end_session = EndSessionUseCase(
                 self.session_repo,
@@ -137,21 +239,60 @@ class AnimalRecognitionConsumer(AsyncWebsocketConsumer):
                 self.animal_repo,
             )
             try:
-                summary = await sync_to_async(end_session.execute)(self.session_id)
+                summary = await sync_to_async(end_session.execute)(
+                    self.session_id, self.process_frame.session if self.process_frame else None
+                )
                 logger.info(f"Session ended: {self.session_id} - {summary['total_discoveries']} discoveries")
             except Exception as e:
                 logger.error(f"Error ending session: {str(e)}")
     
-    async def receive(self, text_data):
-        """Handle incoming WebSocket messages"""
+    async def receive(self, text_data=None, bytes_data=None):
+        """Handle incoming WebSocket messages (JSON text or negotiated binary frames)"""
+        received_at = time.monotonic()
+        # Span raíz del mensaje: parse, etapas y notify cuelgan de él
+        with span('websocket.frame', session_id=self.session_id or ''), frame_timings() as timings:
+            binary = bytes_data is not None and self.codec.binary
+            try:
+                with stage('parse'):
+                    if binary:
+                        data = self.codec.decode(bytes_data)
+                    else:
+                        data = json.loads(text_data if text_data is not None else bytes_data)
+            except ValueError as e:
+                # JSONDecodeError y los errores de msgpack/cbor2 derivan de ValueError
+                logger.warning(f"Mensaje no decodificable: {e}")
+                await self.send_json({
+                    'type': 'error',
+                    'data': {'message': f'Invalid {self.codec.name}' if binary else 'Invalid JSON'}
+                })
+                return
+            
+            await self.dispatch_message(data, received_at, timings)
+    
+    async def dispatch_message(self, data: dict, received_at: float, timings: FrameTimings):
+        """Route a decoded client message by its type"""
         try:
-            data = json.loads(text_data)
             message_type = data.get('type')
             
             if message_type == 'frame':
-                await self.handle_frame(data.get('data'))
+                await self.handle_frame(
+                    data.get('data'),
+                    received_at=received_at,
+                    captured_at=data.get('captured_at'),
+                    timings=timings,
+                )
             elif message_type == 'get_discoveries':
                 await self.handle_get_discoveries()
+            elif message_type == 'get_stats':
+                stats = self.process_frame.frame_stats.to_dict() if self.process_frame else {}
+                stats['service_level'] = self.service_level.to_dict()
+                stats['stages'] = get_stage_histograms().to_dict()
+                await self.send_json({
+                    'type': 'frame_stats',
+                    'data': stats,
+                })
+            elif message_type == 'configure':
+                self.handle_configure(data.get('data') or {})
             elif message_type == 'ping':
                 await self.send_json({'type': 'pong'})
             else:
@@ -161,11 +302,6 @@ class AnimalRecognitionConsumer(AsyncWebsocketConsumer):
                     logger.debug(f"📨 Frame recibido (tamaño: {len(data.get('data', ''))} bytes)")
                     await self.handle_frame(data.get('data'))
                 
-        except json.JSONDecodeError:
-            await self.send_json({
-                'type': 'error',
-                'data': {'message': 'Invalid JSON'}
-            })
         except Exception as e:
             logger.error(f"Error processing message: {str(e)}")
             await self.send_json({
@@ -173,25 +309,61 @@ class AnimalRecognitionConsumer(AsyncWebsocketConsumer):
                 'data': {'message': str(e)}
             })
     
-    async def handle_frame(self, frame_data: str):
+    def handle_configure(self, options: dict) -> None:
+        """Apply per-session options sent by the client"""
+        deadline = options.get('frame_deadline_ms')
+        if isinstance(deadline, (int, float)):
+            self.frame_deadline_ms = min(max(float(deadline), 50.0), 5000.0)
+    
+    async def handle_frame(
+        self,
+        frame_data: str,
+        received_at: float = None,
+        captured_at=None,
+        timings: Optional[FrameTimings] = None,
+    ):
         """Process a camera frame"""
-        if not frame_data:
+        if not frame_data or not self.process_frame:
             return
         
-        # Create use case
-        process_frame = ProcessFrameUseCase(
-            recognition_port=self.recognition_service,
-            animal_repository=self.animal_repo,
-            discovery_repository=self.discovery_repo,
-            session_repository=self.session_repo,
-            image_storage=self.image_storage,
-            notification_port=self.notification_adapter,
+        metrics = get_metrics()
+        metrics.inc('frames_received')
+        
+        # Follow the load-derived service level one step at a time
+        if self.service_level.update(get_load_controller().target_level()):
+            await self.send_service_level()
+        
+        ticket = FrameTicket.create(
+            data=frame_data,
+            deadline_ms=self.frame_deadline_ms,
+            received_at=received_at,
+            captured_at_ms=captured_at if isinstance(captured_at, (int, float)) else None,
         )
         
         # Process frame
-        response = await process_frame.execute(self.session_id, frame_data)
+        response = await self.process_frame.execute(
+            self.session_id, frame_data, ticket=ticket, timings=timings,
+        )
         
-        if not response.success:
+        if response.dropped_stale:
+            metrics.inc('frames_dropped', reason='stale')
+        elif response.retry_after is not None:
+            metrics.inc('frames_dropped', reason='busy')
+        elif not response.success:
+            metrics.inc('frames_dropped', reason='error')
+        else:
+            metrics.inc('frames_processed')
+            if timings is not None:
+                for stage_name, elapsed_ms in timings.stages.items():
+                    metrics.observe('pipeline_stage_seconds', elapsed_ms / 1000, stage=stage_name)
+        
+        if response.retry_after is not None:
+            # Inference saturated: ask the client to back off instead of erroring
+            await self.send_json({
+                'type': 'busy',
+                'data': {'retry_after': response.retry_after}
+            })
+        elif not response.success:
             await self.send_json({
                 'type': 'error',
                 'data': {'message': response.error}
@@ -202,24 +374,80 @@ class AnimalRecognitionConsumer(AsyncWebsocketConsumer):
         get_discoveries = GetSessionDiscoveriesUseCase(
             self.discovery_repo,
             self.animal_repo,
+            self.session_repo,
         )
         
-        discoveries = await sync_to_async(get_discoveries.execute)(self.session_id)
+        # Con la sesión viva es una lectura del resumen incremental
+        discoveries = await sync_to_async(get_discoveries.execute)(
+            self.session_id, self.process_frame.session if self.process_frame else None
+        )
         
         await self.send_json({
             'type': 'discoveries',
             'data': discoveries,
         })
     
-    async def send_json(self, data: dict):
-        """Send JSON data to client"""
-        await self.send(text_data=json.dumps(data))
+    @property
+    def session_group(self) -> str:
+        return f"session_{self.session_id}"
     
-    async def send_detections(self, detections: list) -> None:
-        """Send detection boxes to client (for bounding box visualization)"""
+    def _thumbnail_stored(self, discovery: Discovery) -> None:
+        """Called from the thumbnail worker thread: route the update through the group"""
+        if self.channel_layer is None:
+            return
+        try:
+            async_to_sync(self.channel_layer.group_send)(
+                self.session_group,
+                {
+                    'type': 'discovery.thumbnail',
+                    'data': {'id': discovery.id, 'thumbnail_url': discovery.thumbnail_url},
+                },
+            )
+        except Exception as e:
+            logger.warning(f"No se pudo notificar la miniatura: {e}")
+    
+    async def discovery_thumbnail(self, event: dict) -> None:
+        """Relay the final thumbnail URL of a discovery"""
+        await self.send_json({
+            'type': 'discovery_thumbnail',
+            'data': event['data'],
+        })
+    
+    async def video_progress(self, event: dict) -> None:
+        """Relay video recognition progress sent to the session group"""
         await self.send_json({
+            'type': 'video_progress',
+            'data': event['data'],
+        })
+    
+    async def send_service_level(self) -> None:
+        """Tell the client the capture size and cadence for the current level"""
+        await self.send_json({
+            'type': 'service_level',
+            'data': self.service_level.to_dict(),
+        })
+    
+    async def send_json(self, data: dict):
+        """Send a message to client in the negotiated encoding"""
+        if self.codec.binary:
+            await self.send(bytes_data=self.codec.encode(data))
+        else:
+            await self.send(text_data=self.codec.encode(data))
+    
+    def detection_message(self, detections: list) -> Optional[dict]:
+        """Build the detections message for this client, or None if there is nothing to send"""
+        if self.detection_encoder is not None:
+            # Modo delta: solo cambios, y nada si las cajas no se movieron
+            return self.detection_encoder.encode(detections)
+        return {
             'type': 'detections',
             'data': {
                 'detections': detections
             }
-        })
+        }
+    
+    async def send_detections(self, detections: list) -> None:
+        """Send detection boxes to client (for bounding box visualization)"""
+        message = self.detection_message(detections)
+        if message is not None:
+            await self.send_json(message)
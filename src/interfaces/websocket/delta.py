@@ -0,0 +1,142 @@
+"""
+Detection Delta Encoding
+Change-only detection messages for the recognition WebSocket.
+
+En modo delta el servidor recuerda el último conjunto de cajas enviado a
+cada sesión y solo envía las altas, bajas y movimientos (con id de track).
+Cada `keyframe_interval` mensajes se envía el conjunto completo para que
+un cliente desincronizado se recupere.
+"""
+import itertools
+from typing import Dict, List, Optional
+
+# Campos de caja comparados con la tolerancia de movimiento
+_BOX_FIELDS = ('x', 'y', 'width', 'height')
+
+
+def _iou(a: dict, b: dict) -> float:
+    """Intersection over union of two {x, y, width, height} boxes"""
+    try:
+        ax2, ay2 = a['x'] + a['width'], a['y'] + a['height']
+        bx2, by2 = b['x'] + b['width'], b['y'] + b['height']
+        inter_w = min(ax2, bx2) - max(a['x'], b['x'])
+        inter_h = min(ay2, by2) - max(a['y'], b['y'])
+    except KeyError:
+        return 0.0
+    if inter_w <= 0 or inter_h <= 0:
+        return 0.0
+    inter = inter_w * inter_h
+    union = a['width'] * a['height'] + b['width'] * b['height'] - inter
+    return inter / union if union > 0 else 0.0
+
+
+class DetectionDeltaEncoder:
+    """
+    Tracks the detections last sent to one client and builds the next message.
+    Detections are matched to tracks by class and box overlap.
+    """
+
+    def __init__(
+        self,
+        move_tolerance: int = 8,
+        confidence_tolerance: float = 0.05,
+        keyframe_interval: int = 30,
+        match_iou: float = 0.3,
+    ):
+        self._move_tolerance = move_tolerance
+        self._confidence_tolerance = confidence_tolerance
+        self._keyframe_interval = max(1, keyframe_interval)
+        self._match_iou = match_iou
+        self._tracks: Dict[int, dict] = {}
+        self._track_ids = itertools.count(1)
+        self._seq = 0
+        self._since_keyframe = None
+
+    def reset(self) -> None:
+        """Forget the client state; the next message is a keyframe"""
+        self._tracks = {}
+        self._since_keyframe = None
+
+    def encode(self, detections: List[dict]) -> Optional[dict]:
+        """
+        Build the message for this frame's detections.
+
+        Returns:
+            A 'detections_keyframe' or 'detections_delta' message, or None
+            when nothing changed beyond the tolerances.
+        """
+        assigned = self._match(detections)
+
+        added, moved = [], []
+        fresh: Dict[int, dict] = {}
+        current: Dict[int, dict] = {}
+        for detection, track_id in zip(detections, assigned):
+            if track_id is None:
+                track_id = next(self._track_ids)
+                entry = {'id': track_id, **detection}
+                added.append(entry)
+            elif self._has_moved(self._tracks[track_id], detection):
+                entry = {'id': track_id, **detection}
+                moved.append(entry)
+            else:
+                # Sin cambios: se conserva lo último que vio el cliente
+                entry = self._tracks[track_id]
+            fresh[track_id] = {'id': track_id, **detection}
+            current[track_id] = entry
+        removed = [track_id for track_id in self._tracks if track_id not in current]
+
+        keyframe_due = self._since_keyframe is None or self._since_keyframe + 1 >= self._keyframe_interval
+        if keyframe_due:
+            self._tracks = fresh
+            self._since_keyframe = 0
+            self._seq += 1
+            return {
+                'type': 'detections_keyframe',
+                'data': {
+                    'seq': self._seq,
+                    'detections': list(fresh.values()),
+                },
+            }
+
+        self._tracks = current
+
+        self._since_keyframe += 1
+        if not (added or moved or removed):
+            return None
+
+        self._seq += 1
+        data = {'seq': self._seq}
+        if added:
+            data['added'] = added
+        if moved:
+            data['moved'] = moved
+        if removed:
+            data['removed'] = removed
+        return {'type': 'detections_delta', 'data': data}
+
+    def _match(self, detections: List[dict]) -> List[Optional[int]]:
+        """Greedy match by class and highest IoU; each track is used once"""
+        candidates = []
+        for index, detection in enumerate(detections):
+            for track_id, track in self._tracks.items():
+                if track.get('class') != detection.get('class'):
+                    continue
+                overlap = _iou(track, detection)
+                if overlap >= self._match_iou:
+                    candidates.append((overlap, index, track_id))
+        candidates.sort(reverse=True)
+
+        assigned: List[Optional[int]] = [None] * len(detections)
+        used = set()
+        for _, index, track_id in candidates:
+            if assigned[index] is None and track_id not in used:
+                assigned[index] = track_id
+                used.add(track_id)
+        return assigned
+
+    def _has_moved(self, previous: dict, detection: dict) -> bool:
+        for name in _BOX_FIELDS:
+            if abs(detection.get(name, 0) - previous.get(name, 0)) > self._move_tolerance:
+                return True
+        confidence_change = abs(detection.get('confidence', 0) - previous.get('confidence', 0))
+        return confidence_change > self._confidence_tolerance